@@ -0,0 +1,235 @@
+'''
+This file defines the ConcurrencyBenchmark class and its command line, which compare
+the synchronous TransportManagementServiceImpl with AsyncTransportManagementService
+under many concurrent clients.
+
+Each client issues its share of a fixed, seeded request mix one after another: mostly
+seat-availability checks with some bookings (booking_ratio). In sync mode every client
+is a thread calling the service directly, the one-thread-per-request model; in async
+mode every client is a coroutine awaiting the façade, which runs the calls on its
+bounded executor. Both modes get the same number of database connections (workers), so
+the comparison is about the cost of client threads, not of database parallelism.
+
+Every mode and concurrency level replays the same request mix from the same starting
+point: the bookings a run made are deleted and the seat counts rebuilt before the next
+run, so no run finds its bookings already made (or its seats already sold) by an
+earlier one. For every run the report gives throughput, latency percentiles as seen by
+the clients, errors, successful bookings and the number of threads it ran on
+(measured with threading.active_count(), including the calling thread).
+
+Usage (from the repository root):
+    python -m benchmark.ConcurrencyBenchmark --db sqlite:///concurrency.db --concurrency 10 --concurrency 1000
+'''
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from dao.AsyncTransportManagementService import AsyncTransportManagementService
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from util.DBConnUtil import DBConnUtil
+from .ServiceBenchmark import git_commit, percentile
+from .SyntheticDataGenerator import SyntheticDataGenerator
+
+DEFAULT_CONCURRENCY = (10, 100, 1000)
+DEFAULT_REQUESTS = 5000
+DEFAULT_WORKERS = 16
+BOOKING_RATIO = 0.2
+
+
+class ConcurrencyBenchmark:
+    def __init__(self, connection_string, scale=1000, seed=42, requests=DEFAULT_REQUESTS,
+                 workers=DEFAULT_WORKERS, booking_ratio=BOOKING_RATIO):
+        self.connection_string = connection_string
+        self.scale = scale
+        self.seed = seed
+        self.requests = requests
+        self.workers = workers
+        self.booking_ratio = booking_ratio
+        self.rng = random.Random(seed)
+        self.dataset = None
+
+    def setup(self):
+        DBConnUtil.create_tables(self.connection_string)
+        # Both modes use this pool; the façade's executor (workers threads) bounds the async side the same way
+        DBConnUtil.get_pool(self.connection_string, max_size=self.workers)
+        self.dataset = SyntheticDataGenerator(self.connection_string, self.seed).generate(self.scale)
+
+    def _request_mix(self):
+        """("book", trip_id, passenger_id) or ("seats", trip_id) per request, on trips still open for booking."""
+        ids, rng = self.dataset["ids"], self.rng
+        trips = ids["trips"][len(ids["vehicles"]):] or ids["trips"]
+        mix = []
+        for _ in range(self.requests):
+            trip_id = trips[rng.randrange(len(trips))]
+            if rng.random() < self.booking_ratio:
+                mix.append(("book", trip_id, ids["passengers"][rng.randrange(len(ids["passengers"]))]))
+            else:
+                mix.append(("seats", trip_id))
+        return mix
+
+    @staticmethod
+    def _shares(mix, clients):
+        return [mix[client::clients] for client in range(clients)]
+
+    def _last_booking_id(self):
+        with DBConnUtil.get_pool(self.connection_string).connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(BookingID), 0) FROM Bookings")
+            return cursor.fetchone()[0]
+
+    def _reset_bookings(self, last_booking_id):
+        """Delete the bookings made after last_booking_id and recount every trip's seats."""
+        pool = DBConnUtil.get_pool(self.connection_string)
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM Bookings WHERE BookingID > %s", (last_booking_id,))
+            conn.commit()
+        TransportManagementServiceImpl(self.connection_string, interactive=False).rebuild_seat_inventory()
+
+    @staticmethod
+    def _summary(latencies, errors, booked, elapsed, threads):
+        latencies.sort()
+        calls = len(latencies)
+        return {
+            "requests": calls,
+            "errors": errors,
+            "booked": booked,
+            "threads": threads,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(calls / elapsed, 2) if elapsed > 0 else None,
+            "mean_ms": round(sum(latencies) / calls, 4) if calls else None,
+            "p50_ms": round(percentile(latencies, 0.50), 4) if calls else None,
+            "p99_ms": round(percentile(latencies, 0.99), 4) if calls else None,
+            "max_ms": round(latencies[-1], 4) if calls else None,
+        }
+
+    def run_sync(self, concurrency, mix):
+        service = TransportManagementServiceImpl(self.connection_string, interactive=False)
+        booking_date = datetime.now()
+        latencies, totals = [], {"errors": 0, "booked": 0}
+        lock = threading.Lock()
+        shares = self._shares(mix, concurrency)
+        ready = threading.Barrier(len(shares) + 1)
+
+        def client(share):
+            local, failed, booked = [], 0, 0
+            ready.wait()
+            for request in share:
+                started = time.perf_counter()
+                try:
+                    if request[0] == "book":
+                        booked += bool(service.book_trip(request[1], request[2], booking_date))
+                    else:
+                        service.seats_available(request[1])
+                except Exception:
+                    failed += 1
+                local.append((time.perf_counter() - started) * 1000)
+            with lock:
+                latencies.extend(local)
+                totals["errors"] += failed
+                totals["booked"] += booked
+
+        baseline = threading.active_count()
+        threads = [threading.Thread(target=client, args=(share,)) for share in shares]
+        for thread in threads:
+            thread.start()
+        # Every client is parked on the barrier, so this counts all of them
+        used = threading.active_count() - baseline + 1
+        started = time.perf_counter()
+        ready.wait()
+        for thread in threads:
+            thread.join()
+        return self._summary(latencies, totals["errors"], totals["booked"], time.perf_counter() - started, used)
+
+    def run_async(self, concurrency, mix):
+        latencies, errors, booked = [], 0, 0
+        baseline = threading.active_count()
+
+        async def main():
+            nonlocal errors, booked
+            booking_date = datetime.now()
+            async with AsyncTransportManagementService(self.connection_string, self.workers) as service:
+                async def client(share):
+                    nonlocal errors, booked
+                    for request in share:
+                        started = time.perf_counter()
+                        try:
+                            if request[0] == "book":
+                                # Await first: "booked += await ..." would read booked
+                                # before suspending and lose other clients' increments
+                                success = await service.book_trip(request[1], request[2], booking_date)
+                                booked += bool(success)
+                            else:
+                                await service.seats_available(request[1])
+                        except Exception:
+                            errors += 1
+                        latencies.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                await asyncio.gather(*(client(share) for share in self._shares(mix, concurrency)))
+                elapsed = time.perf_counter() - started
+                # The executor's threads are still alive until the façade closes
+                return elapsed, threading.active_count() - baseline + 1
+
+        elapsed, used = asyncio.run(main())
+        return self._summary(latencies, errors, booked, elapsed, used)
+
+    def run(self, concurrency_levels=DEFAULT_CONCURRENCY) -> dict:
+        """Run both modes at every concurrency level on the same request mix and return the report."""
+        if self.dataset is None:
+            self.setup()
+        mix = self._request_mix()
+        results = {"sync": {}, "async": {}}
+        last_booking_id = self._last_booking_id()
+        # The service reports progress with print(); thousands of threads writing it would
+        # measure the terminal, not the service
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            for concurrency in concurrency_levels:
+                for mode, run_mode in (("sync", self.run_sync), ("async", self.run_async)):
+                    results[mode][str(concurrency)] = run_mode(concurrency, mix)
+                    self._reset_bookings(last_booking_id)
+        return {
+            "commit": git_commit(),
+            "backend": DBConnUtil.get_backend(self.connection_string).name,
+            "scale": self.scale,
+            "seed": self.seed,
+            "requests": self.requests,
+            "workers": self.workers,
+            "booking_ratio": self.booking_ratio,
+            "results": results,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the sync and async services under concurrent clients.")
+    parser.add_argument("--db", default="sqlite:///concurrency.db", help="connection string of the database to fill")
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="requests per mode and level")
+    parser.add_argument("--concurrency", type=int, action="append", help="concurrent clients (repeatable)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="database connections in either mode")
+    parser.add_argument("--booking-ratio", type=float, default=BOOKING_RATIO)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    benchmark = ConcurrencyBenchmark(args.db, args.scale, args.seed, args.requests, args.workers, args.booking_ratio)
+    report = benchmark.run(args.concurrency or DEFAULT_CONCURRENCY)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    DBConnUtil.close_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
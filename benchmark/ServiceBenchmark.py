@@ -0,0 +1,235 @@
+'''
+This file defines the ServiceBenchmark class and its command line, which time every
+TransportManagementServiceImpl operation against a database filled by
+SyntheticDataGenerator and report the results as JSON.
+
+For each operation the arguments are prepared first, then the calls are timed one by
+one. The service runs with interactive=False, so the operations that would ask for
+confirmation (update_vehicle, delete_vehicle, deallocate_driver) are timed without a
+prompt. cancel_trip and delete_vehicle run last, and delete_vehicle removes spare vehicles
+added for it while the arguments are prepared. The report gives latency percentiles (p50/p90/p99/max), mean latency, throughput
+and the number of SQL statements issued per call (counted by util.QueryInstrumentation),
+plus the git commit the numbers were taken on, so runs from different commits can be
+diffed.
+
+Usage (from the repository root):
+    python -m benchmark.ServiceBenchmark --db sqlite:///benchmark.db --scale 10000 --output bench.json
+
+Use a fresh database per run: the generator appends to whatever is already there.
+'''
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from entity.Vehicle import Vehicle
+from util.DBConnUtil import DBConnUtil
+from util.QueryInstrumentation import QueryInstrumentation
+from .SyntheticDataGenerator import SyntheticDataGenerator, TRIP_SPACING
+
+DEFAULT_ITERATIONS = 200
+# The updaters touch every vehicle/driver, so they run fewer times
+STATUS_UPDATE_ITERATIONS = 5
+BATCH_SIZE = 5
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class ServiceBenchmark:
+    def __init__(self, connection_string, scale=1000, seed=42, iterations=DEFAULT_ITERATIONS):
+        self.connection_string = connection_string
+        self.scale = scale
+        self.seed = seed
+        self.iterations = iterations
+        self.rng = random.Random(seed)
+        self.dataset = None
+        self.service = None
+        self.instrumentation = QueryInstrumentation()
+
+    def setup(self):
+        DBConnUtil.create_tables(self.connection_string)
+        self.dataset = SyntheticDataGenerator(self.connection_string, self.seed).generate(self.scale)
+        self.service = TransportManagementServiceImpl(self.connection_string, instrumentation=self.instrumentation,
+                                                      interactive=False)
+
+    def _bookable_trips(self):
+        """Trips from the second week on: bookings are still open for them."""
+        ids = self.dataset["ids"]
+        return ids["trips"][len(ids["vehicles"]):] or ids["trips"]
+
+    def _cases(self):
+        """(name, [argument tuples], callable) for every benchmarked operation."""
+        ids, now, n = self.dataset["ids"], self.dataset["now"], self.iterations
+        rng, service = self.rng, self.service
+        pick = lambda id_range, count: [id_range[rng.randrange(len(id_range))] for _ in range(count)]
+        bookable = self._bookable_trips()
+        # Far beyond every generated trip, one week apart per call, so nothing clashes
+        horizon = now + TRIP_SPACING * (len(ids["trips"]) // max(len(ids["vehicles"]), 1) + 2)
+        fmt = "%Y-%m-%d %H:%M:%S"
+
+        schedule_args = []
+        for index, vehicle_id in enumerate(pick(ids["vehicles"], n)):
+            departure = horizon + TRIP_SPACING * index
+            schedule_args.append((vehicle_id, ids["routes"][0], departure.strftime(fmt),
+                                  (departure + timedelta(hours=6)).strftime(fmt)))
+        booking_args = [(trip_id, passenger_id, now) for trip_id, passenger_id
+                        in zip(pick(bookable, n), pick(ids["passengers"], n))]
+        # The generator gives drivers to even weeks' trips only: allocate to the others,
+        # deallocate from those
+        weeks = [(offset // max(len(ids["vehicles"]), 1), trip_id) for offset, trip_id in enumerate(ids["trips"])]
+        unassigned = [trip_id for week, trip_id in weeks if week % 2 == 1]
+        assigned = [trip_id for week, trip_id in weeks if week % 2 == 0]
+        allocate_args = list(zip(pick(unassigned, n), pick(ids["drivers"], n))) if unassigned else []
+        batch_args = [(trip_id, rng.sample(ids["passengers"], min(BATCH_SIZE, len(ids["passengers"]))), now)
+                      for trip_id in pick(bookable, n)]
+        new_vehicles = [(Vehicle(None, f"Bench {index}", 40, "Bus", "Available"),) for index in range(n)]
+        update_args = [(Vehicle(vehicle_id, f"Updated {index}", None, None),)
+                       for index, vehicle_id in enumerate(pick(ids["vehicles"], n))]
+        with contextlib.redirect_stdout(io.StringIO()):
+            spares = service.add_vehicles_bulk([{"model": f"Spare {index}", "capacity": 40, "type": "Bus",
+                                                 "status": "Available"} for index in range(n)])
+        window_args = []
+        for _ in range(n):
+            departure = now + timedelta(hours=rng.randint(0, 24 * 60))
+            window_args.append((departure, departure + timedelta(hours=8)))
+        search_args = []
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT StartDestination, EndDestination FROM Routes")
+            pairs = cursor.fetchall()
+        for _ in range(n):
+            start, end = pairs[rng.randrange(len(pairs))]
+            search_args.append((start, end, now, now + timedelta(days=30), 1))
+
+        return [
+            ("add_vehicle", new_vehicles, service.add_vehicle),
+            ("update_vehicle", update_args, service.update_vehicle),
+            ("schedule_trip", schedule_args, service.schedule_trip),
+            ("book_trip", booking_args, service.book_trip),
+            ("book_trip_batch", batch_args, service.book_trip_batch),
+            ("cancel_booking", [(booking_id,) for booking_id in pick(ids["bookings"], n)], service.cancel_booking),
+            ("allocate_driver", allocate_args, service.allocate_driver),
+            ("deallocate_driver", [(trip_id,) for trip_id in rng.sample(assigned, min(n, len(assigned)))],
+             service.deallocate_driver),
+            ("get_bookings_by_passenger", [(pid,) for pid in pick(ids["passengers"], n)],
+             service.get_bookings_by_passenger),
+            ("get_bookings_by_trip", [(tid,) for tid in pick(ids["trips"], n)], service.get_bookings_by_trip),
+            ("get_bookings_page_by_passenger", [(pid,) for pid in pick(ids["passengers"], n)],
+             service.get_bookings_page_by_passenger),
+            ("get_bookings_page_by_trip", [(tid,) for tid in pick(ids["trips"], n)],
+             service.get_bookings_page_by_trip),
+            # Streamed listings do their work while iterated, so the timed call drains them
+            ("iter_bookings_by_passenger", [(pid,) for pid in pick(ids["passengers"], n)],
+             lambda pid: sum(1 for _ in service.iter_bookings_by_passenger(pid))),
+            ("iter_bookings_by_trip", [(tid,) for tid in pick(ids["trips"], n)],
+             lambda tid: sum(1 for _ in service.iter_bookings_by_trip(tid))),
+            ("get_available_drivers", [()] * min(n, STATUS_UPDATE_ITERATIONS), service.get_available_drivers),
+            ("get_drivers_available_for", window_args, service.get_drivers_available_for),
+            ("find_trips", search_args, service.find_trips),
+            ("auto_update_vehicle_statuses", [()] * min(n, STATUS_UPDATE_ITERATIONS),
+             service.auto_update_vehicle_statuses),
+            ("auto_update_driver_statuses", [()] * min(n, STATUS_UPDATE_ITERATIONS),
+             service.auto_update_driver_statuses),
+            ("cancel_trip", [(trip_id,) for trip_id in rng.sample(bookable, min(n, len(bookable)))],
+             service.cancel_trip),
+            ("delete_vehicle", [(vehicle_id,) for vehicle_id in spares["vehicle_ids"].values()],
+             service.delete_vehicle),
+        ]
+
+    def _measure(self, name, arguments, operation):
+        latencies, errors = [], 0
+        self.instrumentation.reset()
+        sink = io.StringIO()
+        started = time.perf_counter()
+        for args in arguments:
+            call_started = time.perf_counter()
+            try:
+                # The service reports progress with print(); keep it out of the output
+                with contextlib.redirect_stdout(sink):
+                    operation(*args)
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - call_started) * 1000)
+            sink.seek(0)
+            sink.truncate()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        calls = len(latencies)
+        return {
+            "calls": calls,
+            "errors": errors,
+            "mean_ms": round(sum(latencies) / calls, 4) if calls else None,
+            "p50_ms": round(percentile(latencies, 0.50), 4) if calls else None,
+            "p90_ms": round(percentile(latencies, 0.90), 4) if calls else None,
+            "p99_ms": round(percentile(latencies, 0.99), 4) if calls else None,
+            "max_ms": round(latencies[-1], 4) if calls else None,
+            "throughput_per_s": round(calls / elapsed, 2) if elapsed > 0 else None,
+            "queries_per_call": self.instrumentation.stats().get(name, {}).get("statements_per_call"),
+        }
+
+    def run(self, operations=None) -> dict:
+        """Generate the data set, time every operation (or just those named) and return the report."""
+        if self.dataset is None:
+            self.setup()
+        results = {}
+        for name, arguments, operation in self._cases():
+            if operations and name not in operations:
+                continue
+            results[name] = self._measure(name, arguments, operation)
+        return {
+            "commit": git_commit(),
+            "backend": self.service.backend.name,
+            "scale": self.scale,
+            "seed": self.seed,
+            "iterations": self.iterations,
+            "generated": {"rows": self.dataset["counts"], "elapsed_s": self.dataset["elapsed_s"]},
+            "operations": results,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the transport management service.")
+    parser.add_argument("--db", default="sqlite:///benchmark.db", help="connection string of the database to fill")
+    parser.add_argument("--scale", type=int, default=1000, help="trips, bookings and passengers (fleet is a quarter)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="calls per operation")
+    parser.add_argument("--operation", action="append", dest="operations", help="only run this operation (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = ServiceBenchmark(args.db, args.scale, args.seed, args.iterations).run(args.operations)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    DBConnUtil.close_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
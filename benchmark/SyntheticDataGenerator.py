@@ -0,0 +1,131 @@
+'''
+This file defines the SyntheticDataGenerator class, which fills a database with a
+reproducible synthetic fleet for benchmarking: vehicles, drivers, routes, passengers,
+scheduled trips and bookings.
+
+The same seed and scale always produce the same rows, so numbers from two commits are
+comparable. Rows are written with executemany in chunks straight through the pool,
+bypassing the service's per-row checks, but the data still respects its rules: a
+vehicle's (and its driver's) trips are a week apart, so no trip clashes with another
+or with its 3-day rest buffer, and no trip is booked beyond its capacity.
+
+Timeline: the first trip of every vehicle departs around the generation time, so the
+status updaters have vehicles and drivers on trip or resting to process; every later
+trip is in the future and open for booking.
+'''
+
+import random
+import time
+from datetime import datetime, timedelta
+from util.DBConnUtil import DBConnUtil
+
+INSERT_CHUNK = 10000
+TRIP_SPACING = timedelta(days=7)
+CAPACITIES = (10, 20, 30, 40, 50, 60)
+VEHICLE_TYPES = ("Bus", "Van", "Truck")
+CITIES = ("Chennai", "Bangalore", "Mumbai", "Delhi", "Hyderabad", "Pune", "Kolkata", "Madurai",
+          "Coimbatore", "Mysore", "Vellore", "Salem", "Trichy", "Kochi", "Goa", "Jaipur")
+
+
+class SyntheticDataGenerator:
+    def __init__(self, connection_string, seed=42, now=None):
+        self.connection_string = connection_string
+        self.pool = DBConnUtil.get_pool(connection_string)
+        self.seed = seed
+        self.now = (now or datetime.now()).replace(microsecond=0)
+
+    @staticmethod
+    def default_counts(scale):
+        """
+        Row counts for a scale: scale trips, bookings and passengers, run by a fleet of
+        scale / 4 vehicles and drivers, so each vehicle has about four weekly trips.
+        """
+        fleet = max(10, scale // 4)
+        return {"vehicles": fleet, "drivers": fleet, "passengers": scale, "trips": scale,
+                "bookings": scale, "routes": max(20, scale // 100)}
+
+    def _insert(self, cursor, table, columns, rows):
+        """Insert rows in chunks and return the IDs they were given, in insertion order."""
+        placeholders = ", ".join(["%s"] * len(columns))
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        id_column = f"{table[:-1]}ID"
+        cursor.execute(f"SELECT COALESCE(MAX({id_column}), 0) FROM {table}")
+        previous_max = cursor.fetchone()[0]
+        for start in range(0, len(rows), INSERT_CHUNK):
+            cursor.executemany(query, rows[start:start + INSERT_CHUNK])
+        # Read the IDs back: auto-increment gaps (MySQL's innodb_autoinc_lock_mode,
+        # rolled-back inserts) mean they need not be contiguous
+        cursor.execute(f"SELECT {id_column} FROM {table} WHERE {id_column} > %s ORDER BY {id_column}",
+                       (previous_max,))
+        return [row[0] for row in cursor.fetchall()]
+
+    def generate(self, scale=1000, counts=None) -> dict:
+        """
+        Write one synthetic data set and return {"counts", "ids": {table: [ID, ...]},
+        "now", "elapsed_s"}. counts overrides entries of default_counts(scale).
+        """
+        started = time.perf_counter()
+        counts = {**self.default_counts(scale), **(counts or {})}
+        rng = random.Random(self.seed)
+
+        vehicles = [(f"Model-{n % 97}", rng.choice(CAPACITIES), rng.choice(VEHICLE_TYPES), "Available")
+                    for n in range(counts["vehicles"])]
+        drivers = [(f"Driver {n}", rng.randint(21, 60), rng.choice(("Male", "Female")), f"LIC{n:08d}",
+                    f"9{n:09d}", f"{n} Main Road", "Available") for n in range(counts["drivers"])]
+        routes = []
+        for _ in range(counts["routes"]):
+            start, end = rng.sample(CITIES, 2)
+            routes.append((start, end, rng.randint(20, 2000)))
+        passengers = [(f"Passenger{n}", rng.choice(("Male", "Female")), rng.randint(5, 90),
+                       f"passenger{self.seed}.{n}@example.com", f"8{n:09d}") for n in range(counts["passengers"])]
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            ids = {
+                "vehicles": self._insert(cursor, "Vehicles", ("Model", "Capacity", "Type", "Status"), vehicles),
+                "drivers": self._insert(cursor, "Drivers", ("Name", "Age", "Gender", "LicenseNumber",
+                                                            "ContactNumber", "Address", "Status"), drivers),
+                "routes": self._insert(cursor, "Routes", ("StartDestination", "EndDestination", "Distance"), routes),
+                "passengers": self._insert(cursor, "Passengers", ("FirstName", "Gender", "Age", "Email",
+                                                                  "PhoneNumber"), passengers),
+            }
+
+            # Trip n runs on vehicle n % V in week n // V; vehicle k's driver (if it has one)
+            # drives its even weeks, so neither ever has overlapping trips
+            vehicle_count = len(ids["vehicles"])
+            trips, capacities = [], []
+            for n in range(counts["trips"]):
+                vehicle_index, week = n % vehicle_count, n // vehicle_count
+                departure = self.now - timedelta(hours=12) + week * TRIP_SPACING + timedelta(minutes=rng.randint(0, 600))
+                arrival = departure + timedelta(hours=rng.randint(2, 30))
+                capacity = vehicles[vehicle_index][1]
+                driver_id = (ids["drivers"][vehicle_index]
+                             if vehicle_index < len(ids["drivers"]) and week % 2 == 0 else None)
+                trips.append((ids["vehicles"][vehicle_index], ids["routes"][rng.randrange(len(ids["routes"]))],
+                              departure, arrival, "Scheduled", "Passenger", capacity, driver_id))
+                capacities.append(capacity)
+            ids["trips"] = self._insert(cursor, "Trips", ("VehicleID", "RouteID", "DepartureDate", "ArrivalDate",
+                                                          "Status", "TripType", "MaxPassengers", "DriverID"), trips)
+
+            # Bookings go to random trips with seats left, one per (trip, passenger)
+            seats_booked = [0] * len(trips)
+            taken, bookings = set(), []
+            attempts = 0
+            while len(bookings) < counts["bookings"] and attempts < counts["bookings"] * 10 and trips and passengers:
+                attempts += 1
+                trip_index = rng.randrange(len(trips))
+                passenger_id = ids["passengers"][rng.randrange(len(ids["passengers"]))]
+                if seats_booked[trip_index] >= capacities[trip_index] or (trip_index, passenger_id) in taken:
+                    continue
+                taken.add((trip_index, passenger_id))
+                seats_booked[trip_index] += 1
+                bookings.append((ids["trips"][trip_index], passenger_id, self.now - timedelta(days=7), "BOOKED"))
+            ids["bookings"] = self._insert(cursor, "Bookings", ("TripID", "PassengerID", "BookingDate", "Status"),
+                                           bookings)
+            updates = [(booked, ids["trips"][index]) for index, booked in enumerate(seats_booked) if booked]
+            for start in range(0, len(updates), INSERT_CHUNK):
+                cursor.executemany("UPDATE Trips SET SeatsBooked = %s WHERE TripID = %s", updates[start:start + INSERT_CHUNK])
+            conn.commit()
+
+        return {"counts": {table: len(table_ids) for table, table_ids in ids.items()}, "ids": ids,
+                "now": self.now, "elapsed_s": round(time.perf_counter() - started, 3)}
@@ -0,0 +1,164 @@
+'''
+This file defines the AsyncTransportManagementService class, an asyncio façade over
+TransportManagementServiceImpl for event-loop based gateways.
+
+Every method of ITransportManagementService is mirrored as an async def. The blocking
+service calls run on a bounded ThreadPoolExecutor. The wrapped service keeps its own
+(shared, possibly instrumented) connection pool, which the façade grows by one
+connection per executor thread while it is open, so its workers do not starve the
+synchronous callers of the same pool. Thousands of coroutines can await at once; at
+most max_workers calls touch the database at any moment and the rest queue in the
+executor.
+
+The wrapped service must be non-interactive (see TransportManagementServiceImpl.interactive):
+an executor thread must never block on input().
+
+iter_bookings_by_passenger / iter_bookings_by_trip are async generators that fetch one
+keyset page per executor call instead of holding a streaming cursor across awaits.
+'''
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List
+from entity.Vehicle import Vehicle
+from entity.Booking import Booking
+from entity.Driver import Driver
+from .TransportManagementServiceImpl import TransportManagementServiceImpl, FETCH_CHUNK, MAX_PAGE_SIZE
+
+DEFAULT_MAX_WORKERS = 16
+
+
+class AsyncTransportManagementService:
+    def __init__(self, connection_string=None, max_workers=DEFAULT_MAX_WORKERS, service=None):
+        """
+        connection_string: backend URL or property file (see DBConnUtil); ignored when service is given.
+        max_workers: executor threads, and connections added to the service's pool until close().
+        service: a non-interactive TransportManagementServiceImpl to wrap instead of creating one.
+        """
+        if service is None:
+            service = TransportManagementServiceImpl(connection_string, interactive=False)
+        elif service.interactive:
+            raise ValueError("AsyncTransportManagementService needs a service created with interactive=False.")
+        self.pool = service.pool
+        self.pool.resize(max_workers)
+        self._pool_grown = True
+        self.service = service
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tm-async")
+
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(method, *args, **kwargs))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        if self._pool_grown:
+            self._pool_grown = False
+            self.pool.resize(-self.max_workers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    # ---- vehicles ---------------------------------------------------------
+
+    async def add_vehicle(self, vehicle: Vehicle) -> bool:
+        return await self._run(self.service.add_vehicle, vehicle)
+
+    async def add_vehicles_bulk(self, vehicles) -> dict:
+        return await self._run(self.service.add_vehicles_bulk, vehicles)
+
+    async def update_vehicle(self, vehicle: Vehicle) -> bool:
+        return await self._run(self.service.update_vehicle, vehicle)
+
+    async def delete_vehicle(self, vehicle_id: int) -> bool:
+        return await self._run(self.service.delete_vehicle, vehicle_id)
+
+    # ---- trips ------------------------------------------------------------
+
+    async def schedule_trip(self, vehicle_id: int, route_id: int, departure_date: str, arrival_date: str) -> bool:
+        return await self._run(self.service.schedule_trip, vehicle_id, route_id, departure_date, arrival_date)
+
+    async def schedule_trips_bulk(self, trips) -> dict:
+        return await self._run(self.service.schedule_trips_bulk, trips)
+
+    async def cancel_trip(self, trip_id: int) -> bool:
+        return await self._run(self.service.cancel_trip, trip_id)
+
+    async def add_trip_stops(self, trip_id: int, stops) -> bool:
+        return await self._run(self.service.add_trip_stops, trip_id, stops)
+
+    async def get_trip_legs(self, trip_id: int) -> List[dict]:
+        return await self._run(self.service.get_trip_legs, trip_id)
+
+    async def seats_available(self, trip_id: int, from_stop=None, to_stop=None) -> int:
+        return await self._run(self.service.seats_available, trip_id, from_stop, to_stop)
+
+    async def find_trips(self, start: str, end: str, depart_from=None, depart_to=None,
+                         min_free_seats: int = 1, limit: int = 50) -> List[dict]:
+        return await self._run(self.service.find_trips, start, end, depart_from, depart_to, min_free_seats, limit)
+
+    async def autocomplete_destinations(self, prefix: str, limit: int = 10) -> List[str]:
+        return await self._run(self.service.autocomplete_destinations, prefix, limit)
+
+    # ---- bookings ---------------------------------------------------------
+
+    async def book_trip(self, trip_id: int, passenger_id: int, booking_date=None,
+                        from_stop=None, to_stop=None) -> bool:
+        return await self._run(self.service.book_trip, trip_id, passenger_id, booking_date, from_stop, to_stop)
+
+    async def book_trip_batch(self, trip_id: int, passenger_ids: List[int], booking_date=None,
+                              from_stop=None, to_stop=None) -> Dict[int, str]:
+        return await self._run(self.service.book_trip_batch, trip_id, passenger_ids, booking_date,
+                               from_stop, to_stop)
+
+    async def cancel_booking(self, booking_id: int) -> bool:
+        return await self._run(self.service.cancel_booking, booking_id)
+
+    async def get_bookings_by_passenger(self, passenger_id: int) -> List[Booking]:
+        return await self._run(self.service.get_bookings_by_passenger, passenger_id)
+
+    async def get_bookings_by_trip(self, trip_id: int) -> List[Booking]:
+        return await self._run(self.service.get_bookings_by_trip, trip_id)
+
+    async def get_bookings_page_by_passenger(self, passenger_id: int, after_booking_id: int = 0,
+                                             limit: int = 100) -> List[Booking]:
+        return await self._run(self.service.get_bookings_page_by_passenger, passenger_id, after_booking_id, limit)
+
+    async def get_bookings_page_by_trip(self, trip_id: int, after_booking_id: int = 0,
+                                        limit: int = 100) -> List[Booking]:
+        return await self._run(self.service.get_bookings_page_by_trip, trip_id, after_booking_id, limit)
+
+    async def _iter_pages(self, fetch_page, key, chunk_size):
+        chunk_size = max(1, min(chunk_size, MAX_PAGE_SIZE))  # a clamped page would look like the last one
+        after = 0
+        while True:
+            page = await self._run(fetch_page, key, after, chunk_size)
+            for booking in page:
+                yield booking
+            if len(page) < chunk_size:
+                return
+            after = page[-1].booking_id
+
+    def iter_bookings_by_passenger(self, passenger_id: int, chunk_size: int = FETCH_CHUNK) -> AsyncIterator[Booking]:
+        return self._iter_pages(self.service.get_bookings_page_by_passenger, passenger_id, chunk_size)
+
+    def iter_bookings_by_trip(self, trip_id: int, chunk_size: int = FETCH_CHUNK) -> AsyncIterator[Booking]:
+        return self._iter_pages(self.service.get_bookings_page_by_trip, trip_id, chunk_size)
+
+    # ---- drivers ----------------------------------------------------------
+
+    async def allocate_driver(self, trip_id: int, driver_id: int) -> bool:
+        return await self._run(self.service.allocate_driver, trip_id, driver_id)
+
+    async def deallocate_driver(self, trip_id: int) -> bool:
+        return await self._run(self.service.deallocate_driver, trip_id)
+
+    async def get_available_drivers(self) -> List[Driver]:
+        return await self._run(self.service.get_available_drivers)
+
+    async def get_drivers_available_for(self, departure, arrival) -> List[Driver]:
+        return await self._run(self.service.get_drivers_available_for, departure, arrival)
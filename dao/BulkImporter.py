@@ -0,0 +1,181 @@
+'''
+This file defines the BulkImporter class, which loads vehicles, routes, drivers or
+passengers from a CSV or JSONL file without prompting.
+
+The file is read lazily, one record at a time. Each record is validated with the same
+EntityValidator rules the interactive service methods use, valid rows are inserted
+chunk_size at a time with one executemany and one commit per chunk, and rejected rows
+are written to a CSV error report (line number, reason, original record) instead of
+stopping the import. If a chunk is refused by the database (for example a duplicate
+passenger email) it is retried row by row so only the offending rows are rejected.
+
+Column headers / JSON keys may use either the entity attribute names (first_name) or
+the database column names (FirstName); ID columns are ignored.
+'''
+
+import csv
+import json
+import os
+import time
+from entity.Vehicle import Vehicle
+from entity.Route import Route
+from entity.Driver import Driver
+from entity.Passenger import Passenger
+from util.EntityValidator import EntityValidator
+
+IMPORT_SPECS = {
+    "vehicles": {
+        "entity": Vehicle, "table": "Vehicles", "validate": EntityValidator.validate_vehicle,
+        "convert": {"Capacity": float}, "defaults": {}
+    },
+    "routes": {
+        "entity": Route, "table": "Routes", "validate": EntityValidator.validate_route,
+        "convert": {"Distance": float}, "defaults": {}
+    },
+    "drivers": {
+        "entity": Driver, "table": "Drivers", "validate": EntityValidator.validate_driver,
+        "convert": {"Age": int}, "defaults": {"Status": "Available"}
+    },
+    "passengers": {
+        "entity": Passenger, "table": "Passengers", "validate": EntityValidator.validate_passenger,
+        "convert": {"Age": int}, "defaults": {}
+    },
+}
+
+
+def _normalize_key(key):
+    return str(key).replace("_", "").replace(" ", "").lower()
+
+
+class BulkImporter:
+    def __init__(self, service, chunk_size=1000):
+        self.service = service
+        self.chunk_size = chunk_size
+
+    # ---- reading ----------------------------------------------------------
+
+    @staticmethod
+    def read_records(path, file_format):
+        """Yield (line_number, record, error or None) without loading the whole file."""
+        with open(path, newline="", encoding="utf-8") as handle:
+            if file_format == "csv":
+                reader = csv.DictReader(handle)
+                for record in reader:
+                    yield reader.line_num, record, None
+            else:
+                for line_number, line in enumerate(handle, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        yield line_number, {"raw": line.rstrip("\n")}, f"Invalid JSON: {e}"
+                        continue
+                    if not isinstance(record, dict):
+                        yield line_number, {"raw": record}, "Each line must be a JSON object."
+                        continue
+                    yield line_number, record, None
+
+    @staticmethod
+    def _to_values(spec, record):
+        """Validate a record and return its insert values (COLUMNS without the ID)."""
+        normalized = {_normalize_key(key): value for key, value in record.items()}
+        values = []
+        for column in spec["entity"].COLUMNS[1:]:
+            value = normalized.get(column.lower())
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == "":
+                value = spec["defaults"].get(column)
+            values.append(value)
+        entity = spec["entity"](None, *values)
+        spec["validate"](entity)
+        columns = spec["entity"].COLUMNS[1:]
+        return tuple(spec["convert"][column](value) if value is not None and column in spec["convert"] else value
+                     for column, value in zip(columns, values))
+
+    # ---- writing ----------------------------------------------------------
+
+    def _insert_chunk(self, spec, chunk, reject):
+        """Insert [(line_number, record, values)]; returns the number of rows inserted."""
+        columns = spec["entity"].COLUMNS[1:]
+        query = (f"INSERT INTO {spec['table']} ({', '.join(columns)}) "
+                 f"VALUES ({', '.join(['%s'] * len(columns))})")
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany(query, [values for _, _, values in chunk])
+                conn.commit()
+                return len(chunk)
+            except self.service.backend.error_types:
+                conn.rollback()
+
+            # Retry one by one so only the rows the database refuses are rejected
+            inserted = 0
+            for line_number, record, values in chunk:
+                try:
+                    cursor.execute(query, values)
+                    inserted += 1
+                except self.service.backend.error_types as e:
+                    reject(line_number, record, f"Rejected by database: {e}")
+            conn.commit()
+            return inserted
+
+    def import_file(self, kind, path, file_format=None, error_report_path=None) -> dict:
+        """
+        Import every record of path into the table for kind ("vehicles", "routes",
+        "drivers" or "passengers"). file_format is "csv" or "jsonl" (default: from the
+        extension). Returns a summary with counts, timing and the error report path,
+        which is only written when at least one row is rejected.
+        """
+        spec = IMPORT_SPECS.get(kind)
+        if spec is None:
+            raise ValueError(f"Unknown import kind '{kind}'. Expected one of: {', '.join(IMPORT_SPECS)}")
+        file_format = (file_format or os.path.splitext(path)[1].lstrip(".") or "csv").lower()
+        if file_format == "json":
+            file_format = "jsonl"
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported import format '{file_format}'. Use csv or jsonl.")
+        error_report_path = error_report_path or f"{path}.errors.csv"
+
+        started = time.perf_counter()
+        summary = {"kind": kind, "rows_read": 0, "inserted": 0, "rejected": 0,
+                   "chunks": 0, "elapsed_ms": None, "error_report": None}
+        report = {"handle": None, "writer": None}
+
+        def reject(line_number, record, reason):
+            if report["writer"] is None:
+                report["handle"] = open(error_report_path, "w", newline="", encoding="utf-8")
+                report["writer"] = csv.writer(report["handle"])
+                report["writer"].writerow(["line", "error", "record"])
+                summary["error_report"] = error_report_path
+            report["writer"].writerow([line_number, reason, json.dumps(record, default=str)])
+            summary["rejected"] += 1
+
+        try:
+            chunk = []
+            for line_number, record, error in self.read_records(path, file_format):
+                summary["rows_read"] += 1
+                if error:
+                    reject(line_number, record, error)
+                    continue
+                try:
+                    chunk.append((line_number, record, self._to_values(spec, record)))
+                except Exception as e:
+                    reject(line_number, record, str(e))
+
+                if len(chunk) >= self.chunk_size:
+                    summary["inserted"] += self._insert_chunk(spec, chunk, reject)
+                    summary["chunks"] += 1
+                    chunk = []
+            if chunk:
+                summary["inserted"] += self._insert_chunk(spec, chunk, reject)
+                summary["chunks"] += 1
+        finally:
+            if report["handle"] is not None:
+                report["handle"].close()
+
+        if kind == "routes" and summary["inserted"]:
+            self.service.invalidate_routes()
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return summary
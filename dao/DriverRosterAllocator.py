@@ -0,0 +1,157 @@
+'''
+This file defines the DriverRosterAllocator class, which staffs every unassigned
+scheduled trip departing in a time window from the drivers pool in one pass.
+
+It is greedy interval partitioning: trips are taken in departure order and each goes
+to the driver who has been free the longest, found with a min-heap keyed on the end of
+the rest buffer of the driver's last trip in this roster. Every trip in the roster is
+followed by the full 3-day rest buffer, including when the driver already has a later
+trip (checked with a bisect per driver). That is slightly stricter than allocate_driver,
+which only looks at the rest after existing trips, so every assignment made here would
+also be accepted there. All assignments are written in one transaction; trips no
+driver can take are reported as unstaffed.
+'''
+
+import heapq
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from .StatusTransitionScheduler import DRIVER
+
+REST_BUFFER = timedelta(days=3)
+
+
+class DriverRosterAllocator:
+    def __init__(self, service, rest_buffer=REST_BUFFER):
+        self.service = service
+        self.rest_buffer = rest_buffer
+
+    @staticmethod
+    def _parse(value):
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S") if isinstance(value, str) else value
+
+    def _load(self, start, end, driver_ids):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT TripID, DepartureDate, ArrivalDate
+                FROM Trips
+                WHERE Status = 'Scheduled' AND DriverID IS NULL
+                  AND DepartureDate >= %s AND DepartureDate < %s
+                ORDER BY DepartureDate, TripID
+            """, (start, end))
+            trips = cursor.fetchall()
+            if not trips:
+                return trips, [], {}
+
+            if driver_ids is None:
+                cursor.execute("SELECT DriverID FROM Drivers ORDER BY DriverID")
+                drivers = [row[0] for row in cursor.fetchall()]
+            else:
+                drivers = list(dict.fromkeys(driver_ids))
+
+            # Only trips that can clash with the window matter
+            last_arrival = max(arrival for _, _, arrival in trips)
+            cursor.execute("""
+                SELECT DriverID, DepartureDate, ArrivalDate
+                FROM Trips
+                WHERE Status = 'Scheduled' AND DriverID IS NOT NULL
+                  AND ArrivalDate >= %s AND DepartureDate <= %s
+            """, (start - self.rest_buffer, last_arrival + self.rest_buffer))
+            existing = {}
+            for driver_id, departure, arrival in cursor.fetchall():
+                existing.setdefault(driver_id, []).append((departure, arrival))
+        return trips, drivers, existing
+
+    def _existing_checker(self, existing):
+        """Per driver: sorted departures and a running max of rest-buffer ends."""
+        checks = {}
+        for driver_id, booked in existing.items():
+            booked.sort()
+            starts, buffer_ends, latest = [], [], None
+            for departure, arrival in booked:
+                end = arrival + self.rest_buffer
+                latest = end if latest is None else max(latest, end)
+                starts.append(departure)
+                buffer_ends.append(latest)
+            checks[driver_id] = (starts, buffer_ends)
+
+        def conflicts(driver_id, departure, arrival):
+            check = checks.get(driver_id)
+            if check is None:
+                return False
+            # Existing trips departing before this one's rest ends, whose own rest reaches it
+            position = bisect_right(check[0], arrival + self.rest_buffer)
+            return bool(position) and check[1][position - 1] >= departure
+        return conflicts
+
+    def plan(self, start, end, driver_ids=None):
+        """Compute assignments without writing them: ({trip_id: driver_id}, unstaffed, trips)."""
+        trips, drivers, existing = self._load(start, end, driver_ids)
+        conflicts = self._existing_checker(existing)
+
+        # (free_from, tie-breaker, driver_id): free_from is when the driver's rest ends
+        heap = [(datetime.min, order, driver_id) for order, driver_id in enumerate(drivers)]
+        heapq.heapify(heap)
+        assignments, unstaffed = {}, []
+        for trip_id, departure, arrival in trips:
+            skipped, chosen = [], None
+            while heap and heap[0][0] < departure:
+                entry = heapq.heappop(heap)
+                if conflicts(entry[2], departure, arrival):
+                    skipped.append(entry)
+                    continue
+                chosen = entry
+                break
+            for entry in skipped:
+                heapq.heappush(heap, entry)
+            if chosen is None:
+                unstaffed.append({"trip_id": trip_id, "departure_date": str(departure),
+                                  "arrival_date": str(arrival),
+                                  "reason": "No driver is free for this trip and its rest buffer."})
+                continue
+            assignments[trip_id] = chosen[2]
+            heapq.heappush(heap, (arrival + self.rest_buffer, chosen[1], chosen[2]))
+        return assignments, unstaffed, trips
+
+    def allocate(self, start, end, driver_ids=None, dry_run=False) -> dict:
+        """
+        Staff every unassigned scheduled trip departing in [start, end) from driver_ids
+        (default: all drivers). Returns {"assigned": {trip_id: driver_id}, "unstaffed":
+        [...], "written": bool, "elapsed_ms"}. Nothing is written if dry_run is set or if
+        another caller assigned one of the trips meanwhile.
+        """
+        started = time.perf_counter()
+        start, end = self._parse(start), self._parse(end)
+        assignments, unstaffed, trips = self.plan(start, end, driver_ids)
+        summary = {"assigned": assignments, "unstaffed": unstaffed, "written": False, "elapsed_ms": None}
+
+        if assignments and not dry_run:
+            with self.service.pool.connection() as conn:
+                cursor = conn.cursor()
+                updated = 0
+                # executemany's rowcount is not portable across drivers, so count per row
+                for trip_id, driver_id in assignments.items():
+                    cursor.execute("UPDATE Trips SET DriverID = %s WHERE TripID = %s AND DriverID IS NULL",
+                                   (driver_id, trip_id))
+                    updated += cursor.rowcount
+                if updated == len(assignments):
+                    conn.commit()
+                    summary["written"] = True
+                else:
+                    conn.rollback()
+                    print("[Roster] Trips were assigned by someone else during allocation; nothing was written.")
+
+        if summary["written"]:
+            windows = {trip_id: (departure, arrival) for trip_id, departure, arrival in trips}
+            for trip_id, driver_id in assignments.items():
+                departure, arrival = windows[trip_id]
+                self.service.driver_schedule.add(driver_id, trip_id, departure, arrival)
+                if self.service.status_scheduler is not None:
+                    self.service.status_scheduler.push_trip(trip_id, None, driver_id, departure, arrival)
+            if self.service.status_scheduler is not None:
+                for driver_id in set(assignments.values()):
+                    self.service.status_scheduler.refresh(DRIVER, driver_id)
+
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return summary
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, Iterator, List
 from entity.Vehicle import Vehicle
 from entity.Booking import Booking
 from entity.Driver import Driver
@@ -10,6 +10,10 @@ class ITransportManagementService(ABC):
     def add_vehicle(self, vehicle: Vehicle) -> bool:
         pass
 
+    @abstractmethod
+    def add_vehicles_bulk(self, vehicles) -> dict:
+        pass
+
     @abstractmethod
     def update_vehicle(self, vehicle: Vehicle) -> bool:
         pass
@@ -22,12 +26,34 @@ class ITransportManagementService(ABC):
     def schedule_trip(self, vehicle_id: int, route_id: int, departure_date: str, arrival_date: str) -> bool:
         pass
 
+    @abstractmethod
+    def schedule_trips_bulk(self, trips) -> dict:
+        pass
+
     @abstractmethod
     def cancel_trip(self, trip_id: int) -> bool:
         pass
 
     @abstractmethod
-    def book_trip(self, trip_id: int, passenger_id: int, booking_date: str) -> bool:
+    def book_trip(self, trip_id: int, passenger_id: int, booking_date: str,
+                  from_stop=None, to_stop=None) -> bool:
+        pass
+
+    @abstractmethod
+    def book_trip_batch(self, trip_id: int, passenger_ids: List[int], booking_date: str,
+                        from_stop=None, to_stop=None) -> Dict[int, str]:
+        pass
+
+    @abstractmethod
+    def add_trip_stops(self, trip_id: int, stops) -> bool:
+        pass
+
+    @abstractmethod
+    def get_trip_legs(self, trip_id: int) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def seats_available(self, trip_id: int, from_stop=None, to_stop=None) -> int:
         pass
 
     @abstractmethod
@@ -50,6 +76,37 @@ class ITransportManagementService(ABC):
     def get_bookings_by_trip(self, trip_id: int) -> List[Booking]:
         pass
 
+    @abstractmethod
+    def iter_bookings_by_passenger(self, passenger_id: int, chunk_size: int = 500) -> Iterator[Booking]:
+        pass
+
+    @abstractmethod
+    def iter_bookings_by_trip(self, trip_id: int, chunk_size: int = 500) -> Iterator[Booking]:
+        pass
+
+    @abstractmethod
+    def get_bookings_page_by_passenger(self, passenger_id: int, after_booking_id: int = 0,
+                                       limit: int = 100) -> List[Booking]:
+        pass
+
+    @abstractmethod
+    def get_bookings_page_by_trip(self, trip_id: int, after_booking_id: int = 0,
+                                  limit: int = 100) -> List[Booking]:
+        pass
+
     @abstractmethod
     def get_available_drivers(self) -> List[Driver]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_drivers_available_for(self, departure, arrival) -> List[Driver]:
+        pass
+
+    @abstractmethod
+    def find_trips(self, start: str, end: str, depart_from=None, depart_to=None,
+                   min_free_seats: int = 1, limit: int = 50) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def autocomplete_destinations(self, prefix: str, limit: int = 10) -> List[str]:
+        pass
@@ -0,0 +1,165 @@
+'''
+This file defines the RecurringTripPlanner class, which stores recurring trip templates
+(vehicle, route, departure time, duration, recurrence rule, horizon) and expands them
+into Trips rows on demand.
+
+Templates are never expanded all at once. Each template remembers how far it has been
+materialized (ExpandedUntil); expand() only generates the occurrences between that
+watermark and now + HorizonDays, lazily, and hands them to schedule_trips_bulk in
+batches so every generated trip goes through the same vehicle overlap and 3-day rest
+checks as a hand-scheduled one. Calling expand() daily (the app does it at start-up)
+keeps a rolling window of trips just ahead of the booking window.
+
+Recurrence rules: DAILY, WEEKDAYS, WEEKENDS or WEEKLY:MON,WED,FRI.
+'''
+
+from datetime import datetime, timedelta
+from typing import List
+from entity.TripTemplate import TripTemplate
+from exception.CustomExceptions import InvalidTripDataException
+from util.RowMapper import RowMapper
+
+# Occurrences handed to schedule_trips_bulk per call
+EXPANSION_BATCH = 1000
+
+WEEKDAY_NAMES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+
+
+class RecurringTripPlanner:
+    def __init__(self, service, batch_size=EXPANSION_BATCH, clock=datetime.now):
+        self.service = service
+        self.batch_size = batch_size
+        self.clock = clock
+
+    @staticmethod
+    def parse_recurrence(rule) -> frozenset:
+        """Return the weekdays (0 = Monday) on which the rule runs."""
+        rule = str(rule or "").strip().upper()
+        if rule == "DAILY":
+            return frozenset(range(7))
+        if rule == "WEEKDAYS":
+            return frozenset(range(5))
+        if rule == "WEEKENDS":
+            return frozenset((5, 6))
+        if rule.startswith("WEEKLY:"):
+            days = [day.strip() for day in rule[len("WEEKLY:"):].split(",") if day.strip()]
+            if days and all(day in WEEKDAY_NAMES for day in days):
+                return frozenset(WEEKDAY_NAMES.index(day) for day in days)
+        raise InvalidTripDataException(
+            f"Invalid recurrence '{rule}'. Use DAILY, WEEKDAYS, WEEKENDS or WEEKLY:MON,WED,...")
+
+    @staticmethod
+    def parse_departure_time(value):
+        for fmt in ("%H:%M:%S", "%H:%M"):
+            try:
+                return datetime.strptime(str(value).strip(), fmt).time()
+            except ValueError:
+                continue
+        raise InvalidTripDataException(f"Invalid departure time '{value}'. Use HH:MM or HH:MM:SS.")
+
+    def add_template(self, vehicle_id, route_id, departure_time, duration_minutes, recurrence,
+                     start_date, end_date=None, horizon_days=14) -> int:
+        """
+        Validate and store a template; returns its TemplateID. Nothing is expanded yet.
+        end_date is the last day a trip may depart on (inclusive).
+        """
+        departure_time = self.parse_departure_time(departure_time)
+        self.parse_recurrence(recurrence)
+        if isinstance(start_date, str):
+            start_date = datetime.strptime(start_date, "%Y-%m-%d")
+        if isinstance(end_date, str):
+            end_date = datetime.strptime(end_date, "%Y-%m-%d")
+        if int(duration_minutes) <= 0:
+            raise InvalidTripDataException("Duration must be greater than 0 minutes.")
+        if int(horizon_days) <= 0:
+            raise InvalidTripDataException("Horizon must be at least one day.")
+        if end_date is not None and end_date < start_date:
+            raise InvalidTripDataException("End date must not be before the start date.")
+
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO trip_templates (VehicleID, RouteID, DepartureTime, DurationMinutes, Recurrence,
+                                            StartDate, EndDate, HorizonDays, Status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'Active')
+            """, (vehicle_id, route_id, departure_time.strftime("%H:%M:%S"), int(duration_minutes),
+                  str(recurrence).strip().upper(), start_date, end_date, int(horizon_days)))
+            template_id = cursor.lastrowid
+            conn.commit()
+        return template_id
+
+    def get_templates(self, active_only=True) -> List[TripTemplate]:
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {", ".join(TripTemplate.COLUMNS)}
+                FROM trip_templates
+                {"WHERE Status = 'Active'" if active_only else ""}
+                ORDER BY TemplateID
+            """)
+            return RowMapper.map_rows(cursor, TripTemplate, cursor.fetchall())
+
+    def occurrences(self, template, start, end):
+        """Yield (departure, arrival) for every occurrence departing in [start, end)."""
+        weekdays = self.parse_recurrence(template.recurrence)
+        departure_time = self.parse_departure_time(template.departure_time)
+        duration = timedelta(minutes=int(template.duration_minutes))
+        day = start.date()
+        while True:
+            departure = datetime.combine(day, departure_time)
+            if departure >= end:
+                return
+            if departure >= start and day.weekday() in weekdays:
+                yield departure, departure + duration
+            day += timedelta(days=1)
+
+    def _window(self, template, current_time):
+        """The [start, end) range of a template that is due for expansion, or None."""
+        start = max(template.start_date, template.expanded_until or template.start_date, current_time)
+        end = current_time + timedelta(days=int(template.horizon_days))
+        if template.end_date is not None:
+            # end_date is the last day that runs, so the window stops at the following midnight
+            end = min(end, template.end_date + timedelta(days=1))
+        return (start, end) if start < end else None
+
+    def expand(self, current_time=None) -> dict:
+        """
+        Materialize every active template up to its horizon. Returns the number of trips
+        created and the occurrences schedule_trips_bulk refused, tagged with TemplateID.
+        """
+        current_time = (current_time or self.clock()).replace(microsecond=0)
+        summary = {"templates": 0, "created": 0, "rejected": []}
+        watermarks = []
+
+        def pending():
+            for template in self.get_templates():
+                window = self._window(template, current_time)
+                if window is None:
+                    continue
+                summary["templates"] += 1
+                watermarks.append((window[1], template.template_id))
+                for departure, arrival in self.occurrences(template, *window):
+                    yield template.template_id, (template.vehicle_id, template.route_id, departure, arrival)
+
+        batch = []
+        for item in pending():
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._schedule_batch(batch, summary)
+                batch = []
+        if batch:
+            self._schedule_batch(batch, summary)
+
+        if watermarks:
+            with self.service.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany("UPDATE trip_templates SET ExpandedUntil = %s WHERE TemplateID = %s", watermarks)
+                conn.commit()
+        return summary
+
+    def _schedule_batch(self, batch, summary):
+        result = self.service.schedule_trips_bulk([trip for _, trip in batch])
+        summary["created"] += result["scheduled"]
+        for rejection in result["rejected"]:
+            rejection["template_id"] = batch[rejection["index"]][0]
+            summary["rejected"].append(rejection)
@@ -0,0 +1,230 @@
+'''
+This file defines the RouteNetwork class, which treats the Routes table as a directed
+graph (StartDestination -> EndDestination, weighted by Distance) and answers:
+
+- shortest_path(origin, destination): the shortest chain of routes by distance
+  (Dijkstra; there are no coordinates to drive an A* heuristic).
+- plan_journey(origin, destination, earliest_departure): concrete scheduled trips,
+  possibly with changes, that arrive at the destination as early as possible.
+
+The adjacency lists are built from Routes once and rebuilt only when the service's
+route_version changes. Single-source Dijkstra results are cached per origin, so hot
+origins are effectively precomputed (precompute() warms them explicitly). Scheduled
+trips are indexed per route, sorted by departure, and rebuilt when trip_version
+changes, so each journey leg is one bisect.
+
+Destination names are matched case-insensitively and ignoring surrounding spaces.
+'''
+
+import heapq
+import itertools
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+# Origins whose shortest-path trees are kept; the oldest is dropped beyond this
+MAX_CACHED_ORIGINS = 512
+
+
+def _key(name):
+    return str(name or "").strip().lower()
+
+
+class RouteNetwork:
+    def __init__(self, service, min_connection=timedelta(minutes=30), horizon=timedelta(days=14),
+                 timetable_ttl=60.0):
+        """
+        min_connection: shortest allowed change between an arrival and the next departure.
+        horizon: how far past the requested departure trips are considered.
+        timetable_ttl: seconds before the trip index is re-read even without a local change,
+                       to pick up trips written by other processes.
+        """
+        self.service = service
+        self.min_connection = min_connection
+        self.horizon = horizon
+        self.timetable_ttl = timetable_ttl
+        self._lock = threading.RLock()
+        self._graph = None            # stop -> [(next_stop, distance, route_id)]
+        self._names = {}              # stop key -> display name
+        self._graph_version = None
+        self._trees = {}              # origin -> (distances, predecessors)
+        self._timetable = None        # route_id -> ([departures], [(departure, arrival, trip_id)])
+        self._timetable_version = None
+        self._timetable_loaded_at = None
+        self._timetable_from = None
+
+    # ---- graph ------------------------------------------------------------
+
+    def invalidate(self):
+        with self._lock:
+            self._graph = None
+            self._trees.clear()
+            self._timetable = None
+
+    def _ensure_graph(self):
+        # Caller holds the lock
+        if self._graph is not None and self._graph_version == self.service.route_version:
+            return
+        version = self.service.route_version
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT RouteID, StartDestination, EndDestination, Distance FROM Routes")
+            rows = cursor.fetchall()
+        graph, names = {}, {}
+        for route_id, start, end, distance in rows:
+            if not _key(start) or not _key(end) or distance is None:
+                continue
+            names.setdefault(_key(start), str(start).strip())
+            names.setdefault(_key(end), str(end).strip())
+            graph.setdefault(_key(start), []).append((_key(end), float(distance), route_id))
+            graph.setdefault(_key(end), [])
+        self._graph, self._names, self._graph_version = graph, names, version
+        self._trees.clear()
+
+    def _tree(self, origin):
+        # Caller holds the lock; single-source Dijkstra, cached per origin
+        tree = self._trees.get(origin)
+        if tree is not None:
+            return tree
+        distances, predecessors = {origin: 0.0}, {}
+        heap = [(0.0, origin)]
+        while heap:
+            distance, stop = heapq.heappop(heap)
+            if distance > distances.get(stop, float("inf")):
+                continue
+            for next_stop, length, route_id in self._graph.get(stop, ()):
+                candidate = distance + length
+                if candidate < distances.get(next_stop, float("inf")):
+                    distances[next_stop] = candidate
+                    predecessors[next_stop] = (stop, route_id)
+                    heapq.heappush(heap, (candidate, next_stop))
+        if len(self._trees) >= MAX_CACHED_ORIGINS:
+            self._trees.pop(next(iter(self._trees)))
+        self._trees[origin] = (distances, predecessors)
+        return self._trees[origin]
+
+    def precompute(self, origins=None):
+        """Build shortest-path trees for origins (default: every stop) ahead of queries."""
+        with self._lock:
+            self._ensure_graph()
+            for origin in (origins if origins is not None else list(self._graph)):
+                if _key(origin) in self._graph:
+                    self._tree(_key(origin))
+
+    def stops(self):
+        with self._lock:
+            self._ensure_graph()
+            return sorted(self._names.values())
+
+    def shortest_path(self, origin, destination):
+        """
+        Return {"distance", "stops", "route_ids"} for the shortest chain of routes from
+        origin to destination, or None if destination cannot be reached.
+        """
+        origin, destination = _key(origin), _key(destination)
+        with self._lock:
+            self._ensure_graph()
+            if origin not in self._graph or destination not in self._graph:
+                return None
+            distances, predecessors = self._tree(origin)
+            if destination not in distances:
+                return None
+            stops, route_ids, stop = [destination], [], destination
+            while stop != origin:
+                stop, route_id = predecessors[stop]
+                stops.append(stop)
+                route_ids.append(route_id)
+            return {"distance": distances[destination],
+                    "stops": [self._names[s] for s in reversed(stops)],
+                    "route_ids": list(reversed(route_ids))}
+
+    # ---- journeys over scheduled trips ----------------------------------------
+
+    def _ensure_timetable(self, earliest, latest):
+        # Caller holds the lock
+        fresh = (self._timetable is not None
+                 and self._timetable_version == self.service.trip_version
+                 and time.monotonic() - self._timetable_loaded_at < self.timetable_ttl
+                 and self._timetable_from[0] <= earliest and latest <= self._timetable_from[1])
+        if fresh:
+            return
+        version = self.service.trip_version
+        window = (earliest, latest + self.horizon)  # load a little beyond to serve nearby queries
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT RouteID, TripID, DepartureDate, ArrivalDate
+                FROM Trips
+                WHERE Status = 'Scheduled' AND RouteID IS NOT NULL
+                  AND DepartureDate >= %s AND DepartureDate <= %s
+                ORDER BY RouteID, DepartureDate, TripID
+            """, window)
+            rows = cursor.fetchall()
+        timetable = {}
+        for route_id, trip_id, departure, arrival in rows:
+            departures, trips = timetable.setdefault(route_id, ([], []))
+            departures.append(departure)
+            trips.append((departure, arrival, trip_id))
+        self._timetable, self._timetable_version = timetable, version
+        self._timetable_loaded_at, self._timetable_from = time.monotonic(), window
+
+    def plan_journey(self, origin, destination, earliest_departure=None, max_legs=4):
+        """
+        Earliest-arrival journey from origin to destination using scheduled trips that
+        depart at or after earliest_departure, with at most max_legs trips and at least
+        min_connection between legs. Returns {"departure_date", "arrival_date", "legs": [
+        {trip_id, route_id, from, to, departure_date, arrival_date}]} or None.
+        """
+        earliest = earliest_departure or datetime.now()
+        if isinstance(earliest, str):
+            earliest = datetime.strptime(earliest, "%Y-%m-%d %H:%M:%S")
+        latest = earliest + self.horizon
+        origin, destination = _key(origin), _key(destination)
+
+        with self._lock:
+            self._ensure_graph()
+            if origin not in self._graph or destination not in self._graph:
+                return None
+            self._ensure_timetable(earliest, latest)
+            graph, timetable, names = self._graph, self._timetable, self._names
+
+        # Time-dependent Dijkstra on (arrival time, legs used); a label is dropped when the
+        # stop was already reached as early with no more legs
+        # The counter breaks ties so heapq never compares two paths (and their leg dicts)
+        best, order = {}, itertools.count()
+        heap = [(earliest, 0, origin, next(order), None)]
+        while heap:
+            arrival, legs, stop, _, path = heapq.heappop(heap)
+            if stop == destination:
+                journey = []
+                while path is not None:
+                    path, leg = path
+                    journey.append(leg)
+                journey.reverse()
+                return {"departure_date": journey[0]["departure_date"] if journey else arrival,
+                        "arrival_date": arrival, "legs": journey}
+            if any(best.get((stop, used), datetime.max) <= arrival for used in range(legs + 1)):
+                continue
+            best[(stop, legs)] = arrival
+            if legs >= max_legs:
+                continue
+            ready = arrival if path is None else arrival + self.min_connection
+            for next_stop, _, route_id in graph.get(stop, ()):
+                departures, trips = timetable.get(route_id, ((), ()))
+                position = bisect_left(departures, ready)
+                if position == len(trips) or trips[position][0] > latest:
+                    continue
+                # Trips on one route can differ in duration, so a later departure may still
+                # arrive first; only departures before the best arrival so far can beat it
+                chosen = trips[position]
+                for trip in itertools.islice(trips, position + 1, None):
+                    if trip[0] >= chosen[1]:
+                        break
+                    if trip[1] < chosen[1]:
+                        chosen = trip
+                departure, trip_arrival, trip_id = chosen
+                leg = {"trip_id": trip_id, "route_id": route_id, "from": names[stop], "to": names[next_stop],
+                       "departure_date": departure, "arrival_date": trip_arrival}
+                heapq.heappush(heap, (trip_arrival, legs + 1, next_stop, next(order), (path, leg)))
+        return None
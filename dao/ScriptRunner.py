@@ -0,0 +1,265 @@
+'''
+This file defines the ScriptRunner class, which applies a JSONL or CSV script of
+operations through a non-interactive service and writes one JSON result per operation.
+
+Each record names its operation in "op" and carries that operation's fields:
+
+    add_vehicle        model, capacity, type, status
+    update_vehicle     vehicle_id [, model, capacity, type]
+    delete_vehicle     vehicle_id
+    schedule_trip      vehicle_id, route_id, departure_date, arrival_date
+    cancel_trip        trip_id
+    book_trip          trip_id, passenger_id [, booking_date, from_stop, to_stop]
+    cancel_booking     booking_id
+    allocate_driver    trip_id, driver_id
+    deallocate_driver  trip_id
+
+The script is read lazily. Consecutive operations of the same kind (up to group_size)
+form a group, and groups run strictly in script order. Inside a group:
+
+- add_vehicle rows go through add_vehicles_bulk: one commit per BULK_INSERT_CHUNK
+  rows, and rows that are invalid or refused by the database are reported one by one.
+- schedule_trip rows go through schedule_trips_bulk: one conflict sweep and chunked
+  inserts. As there, a vehicle's trips are checked in departure order.
+- book_trip rows for the same trip, date and segment become one book_trip_batch call:
+  one seat reservation and one insert in one transaction. Different trips are booked
+  in parallel.
+- Every other operation is one service call. Operations on different resources run in
+  parallel on up to workers threads; operations on the same vehicle, trip or booking run
+  in script order. Driver allocations always run in order, since they compete for
+  drivers.
+
+Results are written in script order as JSON lines {"line", "op", "ok", ...} followed by
+a final {"summary": {...}} line. A refused operation has "ok": false (the service's own
+message goes to the log); a malformed one also has "error". If a whole group raises,
+each of its lines gets "ok": false with the error, and the script continues.
+
+Usage (from the repository root):
+    python -m main.TransportManagementApp --script ops.jsonl --output results.jsonl --workers 8
+'''
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from entity.Vehicle import Vehicle
+from .BulkImporter import BulkImporter
+from .TransportManagementServiceImpl import BOOKED, NO_SEATS
+
+# op -> (required fields, optional fields)
+OPERATIONS = {
+    "add_vehicle": (("model", "capacity", "type", "status"), ()),
+    "update_vehicle": (("vehicle_id",), ("model", "capacity", "type")),
+    "delete_vehicle": (("vehicle_id",), ()),
+    "schedule_trip": (("vehicle_id", "route_id", "departure_date", "arrival_date"), ()),
+    "cancel_trip": (("trip_id",), ()),
+    "book_trip": (("trip_id", "passenger_id"), ("booking_date", "from_stop", "to_stop")),
+    "cancel_booking": (("booking_id",), ()),
+    "allocate_driver": (("trip_id", "driver_id"), ()),
+    "deallocate_driver": (("trip_id",), ()),
+}
+ID_FIELDS = {"vehicle_id", "route_id", "trip_id", "passenger_id", "booking_id", "driver_id"}
+
+# Operations that touch the same key keep their script order within a group
+ORDER_KEYS = {
+    "update_vehicle": lambda args: args["vehicle_id"],
+    "delete_vehicle": lambda args: args["vehicle_id"],
+    "cancel_trip": lambda args: args["trip_id"],
+    "cancel_booking": lambda args: args["booking_id"],
+    "allocate_driver": lambda args: None,
+    "deallocate_driver": lambda args: args["trip_id"],
+}
+
+DEFAULT_WORKERS = 8
+DEFAULT_GROUP_SIZE = 1000
+
+
+def _stop(value):
+    if value is None or isinstance(value, int):
+        return value
+    return int(value) if str(value).isdigit() else value
+
+
+def parse_operation(record):
+    """Return (op, args) for a script record; raises ValueError if it is malformed."""
+    normalized = {str(key).strip().lower(): value for key, value in record.items()}
+    op = str(normalized.get("op") or "").strip().lower()
+    if op not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{op}'. Expected one of: {', '.join(OPERATIONS)}")
+    required, optional = OPERATIONS[op]
+    args = {}
+    for field in required + optional:
+        value = normalized.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            if field in required:
+                raise ValueError(f"{op} needs {field}.")
+            continue
+        if field in ID_FIELDS:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{field} must be an integer.")
+        elif field in ("from_stop", "to_stop"):
+            value = _stop(value)
+        args[field] = value
+    return op, args
+
+
+class ScriptRunner:
+    def __init__(self, service, workers=DEFAULT_WORKERS, group_size=DEFAULT_GROUP_SIZE):
+        if service.interactive:
+            raise ValueError("ScriptRunner needs a service created with interactive=False.")
+        self.service = service
+        self.workers = workers
+        self.group_size = group_size
+
+    # ---- grouping ---------------------------------------------------------
+
+    def run(self, path, output=None, file_format=None, log=None) -> dict:
+        """
+        Execute every operation of path, writing results to output (default stdout) and
+        the service's messages to log (default stderr). Returns the summary.
+        """
+        output = output or sys.stdout
+        file_format = (file_format or os.path.splitext(path)[1].lstrip(".") or "jsonl").lower()
+        if file_format == "json":
+            file_format = "jsonl"
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported script format '{file_format}'. Use csv or jsonl.")
+
+        started = time.perf_counter()
+        summary = {"operations": 0, "succeeded": 0, "failed": 0, "groups": 0, "elapsed_ms": None}
+        kind, group, invalid = None, [], []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tm-script") as executor, \
+                redirect_stdout(log or sys.stderr):
+            for line_number, record, error in BulkImporter.read_records(path, file_format):
+                if error is None:
+                    try:
+                        op, args = parse_operation(record)
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    invalid.append({"line": line_number, "op": record.get("op"), "ok": False, "error": error})
+                    continue
+                if group and (op != kind or len(group) >= self.group_size):
+                    self._flush(executor, kind, group, invalid, output, summary)
+                    group, invalid = [], []
+                kind = op
+                group.append((line_number, args))
+            self._flush(executor, kind, group, invalid, output, summary)
+
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        output.write(json.dumps({"summary": summary}) + "\n")
+        output.flush()
+        return summary
+
+    def _flush(self, executor, kind, group, invalid, output, summary):
+        results = list(invalid)
+        if group:
+            summary["groups"] += 1
+            handler = {"add_vehicle": self._add_vehicles, "schedule_trip": self._schedule_trips,
+                       "book_trip": self._book_trips}.get(kind, self._run_each)
+            try:
+                group_results = handler(executor, kind, group)
+            except Exception as e:
+                # A group that fails as a whole fails only its own lines; the script goes on
+                group_results = [(line_number, {"ok": False, "error": str(e)}) for line_number, _ in group]
+            for line_number, result in group_results:
+                results.append({"line": line_number, "op": kind, **result})
+        results.sort(key=lambda result: result["line"])
+        for result in results:
+            summary["operations"] += 1
+            summary["succeeded" if result["ok"] else "failed"] += 1
+            output.write(json.dumps(result, default=str) + "\n")
+
+    # ---- groups -----------------------------------------------------------
+
+    def _add_vehicles(self, executor, kind, group):
+        report = self.service.add_vehicles_bulk([args for _, args in group])
+        rejected = {rejection["index"]: rejection["reason"] for rejection in report["rejected"]}
+        results = []
+        for index, (line_number, _) in enumerate(group):
+            if index in report["vehicle_ids"]:
+                results.append((line_number, {"ok": True, "vehicle_id": report["vehicle_ids"][index]}))
+            else:
+                results.append((line_number, {"ok": False, "error": rejected.get(index)}))
+        return results
+
+    def _schedule_trips(self, executor, kind, group):
+        report = self.service.schedule_trips_bulk([args for _, args in group])
+        rejected = {rejection["index"]: rejection["reason"] for rejection in report["rejected"]}
+        results = []
+        for index, (line_number, _) in enumerate(group):
+            if index in report["trip_ids"]:
+                results.append((line_number, {"ok": True, "trip_id": report["trip_ids"][index]}))
+            else:
+                results.append((line_number, {"ok": False, "error": rejected.get(index)}))
+        return results
+
+    def _book_trips(self, executor, kind, group):
+        # Per (trip, date, segment): batches of distinct passengers, in script order; a
+        # passenger listed again starts a new batch so the repeat sees the first booking
+        batches, batch_passengers = {}, {}  # key -> batches; key -> passengers of its last batch
+        for line_number, args in group:
+            key = (args["trip_id"], args.get("booking_date"), args.get("from_stop"), args.get("to_stop"))
+            key_batches = batches.setdefault(key, [[]])
+            passengers = batch_passengers.setdefault(key, set())
+            if args["passenger_id"] in passengers:
+                key_batches.append([])
+                passengers.clear()
+            passengers.add(args["passenger_id"])
+            key_batches[-1].append((line_number, args))
+
+        def book(key, key_batches):
+            trip_id, booking_date, from_stop, to_stop = key
+            results = []
+            for batch in key_batches:
+                passenger_ids = [args["passenger_id"] for _, args in batch]
+                try:
+                    outcomes = self.service.book_trip_batch(trip_id, passenger_ids, booking_date, from_stop, to_stop)
+                    refused = [pid for pid in passenger_ids if outcomes.get(pid) == NO_SEATS]
+                    if len(refused) > 1:
+                        # A batch takes all its seats or none; booked one by one, the
+                        # earliest passengers in the script would still have had a seat
+                        free = self.service.seats_available(trip_id, from_stop, to_stop)
+                        if free > 0:
+                            outcomes.update(self.service.book_trip_batch(trip_id, refused[:free], booking_date,
+                                                                         from_stop, to_stop))
+                except Exception as e:
+                    results.extend((line_number, {"ok": False, "error": str(e)}) for line_number, _ in batch)
+                    continue
+                for line_number, args in batch:
+                    outcome = outcomes.get(args["passenger_id"])
+                    results.append((line_number, {"ok": outcome == BOOKED, "outcome": outcome}))
+            return results
+
+        futures = [executor.submit(book, key, key_batches) for key, key_batches in batches.items()]
+        return [result for future in futures for result in future.result()]
+
+    def _call(self, kind, args):
+        service = self.service
+        if kind == "update_vehicle":
+            return service.update_vehicle(Vehicle(args["vehicle_id"], args.get("model"), args.get("capacity"),
+                                                  args.get("type")))
+        return getattr(service, kind)(**args)
+
+    def _run_each(self, executor, kind, group):
+        lanes = {}
+        for line_number, args in group:
+            lanes.setdefault(ORDER_KEYS[kind](args), []).append((line_number, args))
+
+        def run_lane(lane):
+            results = []
+            for line_number, args in lane:
+                try:
+                    results.append((line_number, {"ok": bool(self._call(kind, args))}))
+                except Exception as e:
+                    results.append((line_number, {"ok": False, "error": str(e)}))
+            return results
+
+        futures = [executor.submit(run_lane, lane) for lane in lanes.values()]
+        return [result for future in futures for result in future.result()]
@@ -0,0 +1,179 @@
+'''
+This file defines the StatusTransitionScheduler class, which keeps vehicle and driver
+statuses current without re-scanning every row on a timer. It keeps a min-heap of the
+instants at which a status can change (departure, arrival and the end of the 3-day
+rest buffer of each scheduled trip) and sleeps until the earliest one is due. When an
+instant fires, only the vehicle or driver it belongs to is recomputed.
+
+The write methods of TransportManagementServiceImpl push new instants (schedule_trip,
+allocate_driver) or invalidate old ones (cancel_trip, allocate_driver, deallocate_driver)
+so the heap stays current without polling.
+'''
+
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+
+VEHICLE = "vehicle"
+DRIVER = "driver"
+
+
+class StatusTransitionScheduler:
+    # Statuses are compared at second precision; "Resting"/"Available" start just after the boundary
+    BOUNDARY_OFFSET = timedelta(seconds=1)
+
+    def __init__(self, service, rest_buffer=timedelta(days=3), clock=datetime.now,
+                 resync_interval=None, max_sleep=60.0):
+        """
+        service: TransportManagementServiceImpl used to recompute statuses.
+        resync_interval: optional seconds between full set-based recomputes, to pick up
+                         changes made outside this process. None disables it.
+        max_sleep: upper bound on a single wait so wall-clock jumps are noticed.
+        """
+        self.service = service
+        self.rest_buffer = rest_buffer
+        self.clock = clock
+        self.resync_interval = resync_interval
+        self.max_sleep = max_sleep
+
+        self._heap = []            # (instant, seq, kind, resource_id, trip_id, generation)
+        self._seq = itertools.count()
+        self._generation = {}      # (trip_id, kind, resource_id) -> current generation
+        self._pending = {}         # (trip_id, kind, resource_id) -> entries still in the heap
+        self._cond = threading.Condition(threading.Lock())
+        self._thread = None
+        self._stopped = False
+        self._next_resync = None
+
+    # ---- heap maintenance -------------------------------------------------
+
+    def _push(self, instant, kind, resource_id, trip_id=None):
+        generation = 0
+        if trip_id is not None:
+            # Refresh entries (no trip) cannot be invalidated, so they are not tracked
+            token = (trip_id, kind, resource_id)
+            generation = self._generation.get(token, 0)
+            self._pending[token] = self._pending.get(token, 0) + 1
+        heapq.heappush(self._heap, (instant, next(self._seq), kind, resource_id, trip_id, generation))
+
+    def push_trip(self, trip_id, vehicle_id, driver_id, departure, arrival):
+        """Register the future transition instants of a scheduled trip."""
+        now = self.clock()
+        instants = (departure, arrival + self.BOUNDARY_OFFSET, arrival + self.rest_buffer + self.BOUNDARY_OFFSET)
+        with self._cond:
+            for kind, resource_id in ((VEHICLE, vehicle_id), (DRIVER, driver_id)):
+                if resource_id is None:
+                    continue
+                for instant in instants:
+                    if instant > now:
+                        self._push(instant, kind, resource_id, trip_id)
+            self._cond.notify()
+
+    def invalidate(self, trip_id, kind, resource_id):
+        """Drop the pending instants of one trip for one vehicle or driver."""
+        token = (trip_id, kind, resource_id)
+        with self._cond:
+            if token in self._pending:
+                self._generation[token] = self._generation.get(token, 0) + 1
+
+    def refresh(self, kind, resource_id):
+        """Recompute a vehicle or driver as soon as possible."""
+        if resource_id is None:
+            return
+        with self._cond:
+            self._push(self.clock(), kind, resource_id)
+            self._cond.notify()
+
+    def next_instant(self):
+        with self._cond:
+            return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+    # ---- processing ---------------------------------------------------------
+
+    def load(self, current_time=None):
+        """Bring every status up to date once and seed the heap from the Trips table."""
+        current_time = current_time or self.clock()
+        self.service.auto_update_vehicle_statuses(current_time)
+        self.service.auto_update_driver_statuses(current_time)
+
+        horizon = current_time - self.rest_buffer - self.BOUNDARY_OFFSET
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT TripID, VehicleID, DriverID, DepartureDate, ArrivalDate
+                FROM Trips
+                WHERE Status = 'Scheduled' AND ArrivalDate >= %s
+            """, (horizon,))
+            trips = cursor.fetchall()
+
+        for trip_id, vehicle_id, driver_id, departure, arrival in trips:
+            self.push_trip(trip_id, vehicle_id, driver_id, departure, arrival)
+
+    def _pop_due(self, current_time):
+        due = set()
+        with self._cond:
+            while self._heap and self._heap[0][0] <= current_time:
+                _, _, kind, resource_id, trip_id, generation = heapq.heappop(self._heap)
+                if trip_id is None:
+                    due.add((kind, resource_id))
+                    continue
+                token = (trip_id, kind, resource_id)
+                valid = generation == self._generation.get(token, 0)
+                self._pending[token] -= 1
+                if not self._pending[token]:
+                    del self._pending[token]
+                    self._generation.pop(token, None)
+                if valid:
+                    due.add((kind, resource_id))
+        return due
+
+    def run_due(self, current_time=None) -> int:
+        """Apply every transition that is due; returns the number of status rows changed."""
+        current_time = current_time or self.clock()
+        changed = 0
+        for kind, resource_id in self._pop_due(current_time):
+            changed += self.service.refresh_resource_status(kind, resource_id, current_time)
+        return changed
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = self.clock()
+                wake_at = self._heap[0][0] if self._heap else None
+                if self._next_resync is not None and (wake_at is None or self._next_resync < wake_at):
+                    wake_at = self._next_resync
+                if wake_at is None or wake_at > now:
+                    timeout = self.max_sleep if wake_at is None else \
+                        min(self.max_sleep, (wake_at - now).total_seconds())
+                    self._cond.wait(timeout)
+                    continue
+
+            try:
+                if self._next_resync is not None and self._next_resync <= now:
+                    self.service.auto_update_vehicle_statuses(now)
+                    self.service.auto_update_driver_statuses(now)
+                    self._next_resync = now + timedelta(seconds=self.resync_interval)
+                self.run_due(now)
+            except Exception as e:
+                print(f"[Status Scheduler] Error applying transitions: {e}")
+
+    def start(self):
+        self.load()
+        if self.resync_interval:
+            self._next_resync = self.clock() + timedelta(seconds=self.resync_interval)
+        self._thread = threading.Thread(target=self._run, name="status-transition-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
@@ -1,40 +1,206 @@
-from typing import List
+from typing import Dict, Iterator, List
 from .ITransportManagementService import ITransportManagementService
 from entity.Vehicle import Vehicle
 from entity.Booking import Booking
 from entity.Driver import Driver
 from exception.CustomExceptions import VehicleNotFoundException, InvalidVehicleStatusException, BookingNotFoundException,TripNotFoundException, BookingNotFoundException, InvalidVehicleDataException
 from util.DBConnUtil import DBConnUtil
-import mysql.connector
+from util.EntityCache import EntityCache
+from util.EntityValidator import EntityValidator, VEHICLE_STATUSES
+from util.IntervalIndex import ScheduleIndex
+from util.RowMapper import RowMapper
+from util.SegmentTree import LegInventory
+from util.TripSearchIndex import TripSearchIndex
+from .StatusTransitionScheduler import StatusTransitionScheduler, VEHICLE, DRIVER
 from datetime import datetime, timedelta
+import itertools
 import threading
+import time
+from bisect import bisect_right
+
+# Per-passenger outcomes reported by book_trip_batch
+BOOKED = "BOOKED"
+PASSENGER_NOT_FOUND = "PASSENGER_NOT_FOUND"
+ALREADY_BOOKED = "ALREADY_BOOKED"
+NO_SEATS = "NO_SEATS"
+TRIP_CANCELLED = "TRIP_CANCELLED"
+BOOKING_CLOSED = "BOOKING_CLOSED"
+BOOKING_FAILED = "BOOKING_FAILED"
+INVALID_SEGMENT = "INVALID_SEGMENT"
+
+# Upper bound on IDs bound into a single IN (...) list
+IN_CLAUSE_CHUNK = 500
+
+# Booking listings: default fetchmany() chunk and the largest page a caller may request
+FETCH_CHUNK = 500
+MAX_PAGE_SIZE = 1000
+
+# Rows per executemany when inserting a bulk timetable
+BULK_INSERT_CHUNK = 1000
+
+# Entity cache kinds not shared with the status scheduler
+PASSENGER = "passenger"
+
+# Seconds before the trip search index is rebuilt even without a local change, to pick
+# up trips and bookings written by other processes
+SEARCH_REFRESH_SECONDS = 60.0
 
 class TransportManagementServiceImpl(ITransportManagementService):
-    def __init__(self):
-        self.conn = DBConnUtil.get_connection("connection_string")
-        self.cursor = self.conn.cursor()
+    def __init__(self, connection_string=None, entity_cache=None, instrumentation=None, metrics=None,
+                 interactive=True):
+        # connection_string is a backend URL (mysql://..., sqlite:///...) or a property
+        # file name; None falls back to TM_DB_URL / db.properties / the local MySQL default.
+        # Connections are borrowed per call so concurrent callers (menu thread,
+        # status updater, workers) never share a cursor.
+        self.backend = DBConnUtil.get_backend(connection_string)
+        # Headless callers (API server, scripts) pass interactive=False: nothing reads stdin,
+        # the request itself is the confirmation and update_vehicle takes the new values
+        # from the Vehicle it is given
+        self.interactive = interactive
+        self.pool = DBConnUtil.get_pool(connection_string)
+        self.status_scheduler = None
+        # Bumped on every write to Routes / Trips so derived caches (route network,
+        # timetables) know to rebuild; next() on a counter is atomic under the GIL
+        self._versions = itertools.count(1)
+        self.route_version = 0
+        self.trip_version = 0
+        # Built on the first find_trips() call; see _trip_search_index()
+        self.trip_search = None
+        self._trip_search_lock = threading.Lock()
+        # Reference rows read on every booking/scheduling call; see cache_stats()
+        self.entity_cache = entity_cache if entity_cache is not None else EntityCache()
+        # Per-vehicle / per-driver trip schedules for overlap and rest-buffer checks
+        self.vehicle_schedule = ScheduleIndex(lambda vehicle_id, cursor:
+                                              self._load_schedule("VehicleID", vehicle_id, cursor))
+        self.driver_schedule = ScheduleIndex(lambda driver_id, cursor:
+                                             self._load_schedule("DriverID", driver_id, cursor))
+        # Per-leg seat counts of multi-stop trips; see add_trip_stops()
+        self.leg_inventory = LegInventory(self._load_leg_loads)
+        # Optional util.QueryInstrumentation: per-method statement counts, slow-query log
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self)
+        # Optional util.MetricsRegistry: operation latencies and business counters
+        self.metrics = metrics
+        if metrics is not None:
+            self._register_metrics(metrics)
+
+    def _register_metrics(self, metrics):
+        metrics.counter("tm_bookings_total", "Booking requests per passenger, by outcome", ("outcome",))
+        metrics.counter("tm_oversell_refusals_total", "Bookings refused because the trip or segment was full")
+        metrics.counter("tm_scheduling_conflicts_total",
+                        "Trips or allocations refused for overlap or rest buffer", ("resource",))
+        metrics.histogram("tm_status_update_seconds", "Duration of a status update cycle", ("kind",))
+        wait_time = metrics.histogram("tm_pool_wait_seconds", "Time spent waiting for a pooled connection")
+        # Once per pool and registry: services sharing both must not count a wait twice
+        self.pool.add_wait_listener(wait_time.observe)
+        for key in ("open", "in_use", "idle", "waits", "total_wait_time"):
+            metrics.gauge(f"tm_pool_{key}", f"Connection pool {key.replace('_', ' ')}",
+                          lambda key=key: self.pool.stats()[key])
+        metrics.instrument(self)
+
+    def _confirm(self, question):
+        if not self.interactive:
+            return True
+        return input(question).strip().upper() == "Y"
+
+    def _count(self, name, amount=1, **labels):
+        if self.metrics is not None and amount:
+            self.metrics.get(name).inc(amount, **labels)
+
+    def _load_schedule(self, key_column, resource_id, cursor=None):
+        query = f"""
+            SELECT TripID, DepartureDate, ArrivalDate
+            FROM Trips
+            WHERE {key_column} = %s AND Status = 'Scheduled'
+        """
+        if cursor is not None:
+            cursor.execute(query, (resource_id,))
+            return cursor.fetchall()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (resource_id,))
+            return cursor.fetchall()
+
+    def _load_leg_loads(self, trip_id, cursor=None):
+        query = "SELECT SeatsBooked FROM trip_legs WHERE TripID = %s ORDER BY LegIndex"
+        if cursor is not None:
+            cursor.execute(query, (trip_id,))
+            return [row[0] for row in cursor.fetchall()]
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (trip_id,))
+            return [row[0] for row in cursor.fetchall()]
+
+    def _fetch_row(self, query, key, cursor=None):
+        if cursor is not None:
+            cursor.execute(query, (key,))
+            return cursor.fetchone()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (key,))
+            return cursor.fetchone()
+
+    def _get_vehicle_row(self, vehicle_id, cursor=None):
+        """(VehicleID, Model, Capacity, Type, Status) through the entity cache, or None."""
+        return self.entity_cache.get(VEHICLE, vehicle_id, lambda: self._fetch_row(
+            "SELECT VehicleID, Model, Capacity, Type, Status FROM Vehicles WHERE VehicleID = %s",
+            vehicle_id, cursor))
+
+    def _get_driver_row(self, driver_id, cursor=None):
+        """(DriverID, Name, Age, Gender, LicenseNumber, ContactNumber, Address, Status), or None."""
+        return self.entity_cache.get(DRIVER, driver_id, lambda: self._fetch_row(
+            """SELECT DriverID, Name, Age, Gender, LicenseNumber, ContactNumber, Address, Status
+               FROM Drivers WHERE DriverID = %s""", driver_id, cursor))
+
+    def _existing_passengers(self, cursor, passenger_ids) -> set:
+        """IDs from passenger_ids that exist, querying only those not already cached."""
+        found, missing = self.entity_cache.get_many(PASSENGER, passenger_ids)
+        existing = set(found)
+        for start in range(0, len(missing), IN_CLAUSE_CHUNK):
+            chunk = missing[start:start + IN_CLAUSE_CHUNK]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"""
+                SELECT PassengerID, FirstName, Gender, Age, Email, PhoneNumber
+                FROM Passengers WHERE PassengerID IN ({placeholders})
+            """, chunk)
+            for row in cursor.fetchall():
+                self.entity_cache.put(PASSENGER, row[0], row)
+                existing.add(row[0])
+        return existing
+
+    def cache_stats(self) -> dict:
+        return self.entity_cache.stats()
+
+    def invalidate_routes(self):
+        """Call after writing to Routes so route-derived caches are rebuilt."""
+        self.route_version = next(self._versions)
+
+    def invalidate_trips(self):
+        """Call after adding, cancelling or re-timing Trips so timetable caches are rebuilt."""
+        self.trip_version = next(self._versions)
 
     def add_vehicle(self, vehicle: Vehicle) -> bool:
         try:
-            # Validate required fields
-            if not vehicle.model or not str(vehicle.model).strip():
-                raise InvalidVehicleDataException("Model is required and cannot be empty.")
-            if vehicle.capacity is None or str(vehicle.capacity).strip() == "" or float(vehicle.capacity) <= 0:
-                raise InvalidVehicleDataException("Capacity is required and must be greater than 0.")
-            if not vehicle.type or not str(vehicle.type).strip():
-                raise InvalidVehicleDataException("Type is required and cannot be empty.")
-            allowed_statuses = ["Available", "On Trip", "Maintenance"]
+            # Validate required fields (shared with the bulk importer)
+            EntityValidator.validate_vehicle(vehicle, check_status=False)
+            allowed_statuses = VEHICLE_STATUSES
             while vehicle.status not in allowed_statuses:
                 print(f"Invalid status: '{vehicle.status}'")
                 print("Allowed values: Available, On Trip, Maintenance")
+                if not self.interactive:
+                    raise InvalidVehicleStatusException()
                 vehicle.status = input("Please re-enter valid status: ").strip()
                 if vehicle.status not in allowed_statuses:
                     raise InvalidVehicleStatusException()
 
             query = "INSERT INTO Vehicles (Model, Capacity, Type, Status) VALUES (%s, %s, %s, %s)"
             values = (vehicle.model, vehicle.capacity, vehicle.type, vehicle.status)
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, values)
+                conn.commit()
+            self.entity_cache.invalidate(VEHICLE, cursor.lastrowid)
             return True
         except (InvalidVehicleDataException, InvalidVehicleStatusException) as e:
             print(f"Error adding vehicle: {e}")
@@ -43,12 +209,52 @@ class TransportManagementServiceImpl(ITransportManagementService):
             print(f"Unexpected error: {e}")
             return False
 
+    def add_vehicles_bulk(self, vehicles) -> dict:
+        """
+        Add many vehicles without prompting, committing every BULK_INSERT_CHUNK rows.
+        vehicles is a sequence of Vehicle objects or dicts with model, capacity, type and
+        status. Each row is checked
+        like add_vehicle; rows that fail validation or that the database refuses are
+        rejected without stopping the rest. Returns {"added", "vehicle_ids" (input index ->
+        VehicleID), "rejected" (list of {index, reason}), "elapsed_ms"}.
+        """
+        started = time.perf_counter()
+        rows, rejected = [], []
+        for index, vehicle in enumerate(vehicles):
+            if isinstance(vehicle, dict):
+                vehicle = Vehicle(None, vehicle.get("model"), vehicle.get("capacity"), vehicle.get("type"),
+                                  vehicle.get("status"))
+            try:
+                EntityValidator.validate_vehicle(vehicle)
+                rows.append((index, (vehicle.model, float(vehicle.capacity), vehicle.type, vehicle.status)))
+            except (InvalidVehicleDataException, InvalidVehicleStatusException, TypeError, ValueError) as e:
+                rejected.append({"index": index, "reason": str(e)})
+
+        # One statement per row so every row gets its own VehicleID and a refused row
+        # only rejects itself; one commit per BULK_INSERT_CHUNK rows
+        vehicle_ids = {}
+        query = "INSERT INTO Vehicles (Model, Capacity, Type, Status) VALUES (%s, %s, %s, %s)"
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(rows), BULK_INSERT_CHUNK):
+                for index, values in rows[start:start + BULK_INSERT_CHUNK]:
+                    try:
+                        cursor.execute(query, values)
+                        vehicle_ids[index] = cursor.lastrowid
+                    except self.backend.error_types as e:
+                        rejected.append({"index": index, "reason": f"Rejected by database: {e}"})
+                conn.commit()
+
+        for vehicle_id in vehicle_ids.values():
+            self.entity_cache.invalidate(VEHICLE, vehicle_id)
+        rejected.sort(key=lambda rejection: rejection["index"])
+        return {"added": len(vehicle_ids), "vehicle_ids": vehicle_ids, "rejected": rejected,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+
     def update_vehicle(self, vehicle: Vehicle) -> bool:
         try:
             # Step 1: Check if vehicle exists
-            select_query = "SELECT * FROM Vehicles WHERE VehicleID = %s"
-            self.cursor.execute(select_query, (vehicle.vehicle_id,))
-            result = self.cursor.fetchone()
+            result = self._get_vehicle_row(vehicle.vehicle_id)
 
             if not result:
                 raise VehicleNotFoundException()
@@ -61,23 +267,10 @@ class TransportManagementServiceImpl(ITransportManagementService):
             print(f"Status: {result[4]} (Note: Status cannot be updated here)")
 
             # Step 2: Ask which fields to update
-            updates = {}
-            print("\nLeave input blank if you don't want to update that field.")
-
-            new_model = input("Enter new Model: ")
-            if new_model.strip():
-                updates['Model'] = new_model.strip()
-
-            new_capacity = input("Enter new Capacity: ")
-            if new_capacity.strip():
-                try:
-                    updates['Capacity'] = float(new_capacity)
-                except ValueError:
-                    print("Invalid capacity entered. Skipping.")
-
-            new_type = input("Enter new Type (Truck/Van/Bus): ")
-            if new_type.strip():
-                updates['Type'] = new_type.strip()
+            if self.interactive:
+                updates = self._ask_vehicle_updates()
+            else:
+                updates = self._vehicle_updates(vehicle)
 
             # Step 3: If no updates, skip
             if not updates:
@@ -89,8 +282,11 @@ class TransportManagementServiceImpl(ITransportManagementService):
             values = list(updates.values()) + [vehicle.vehicle_id]
 
             update_query = f"UPDATE Vehicles SET {set_clause} WHERE VehicleID = %s"
-            self.cursor.execute(update_query, values)
-            self.conn.commit()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(update_query, values)
+                conn.commit()
+            self.entity_cache.invalidate(VEHICLE, vehicle.vehicle_id)
 
             print("Vehicle updated successfully with selected fields.")
             return True
@@ -107,13 +303,48 @@ class TransportManagementServiceImpl(ITransportManagementService):
             print(f"Error updating vehicle: {e}")
             return False
 
+    @staticmethod
+    def _vehicle_updates(vehicle) -> dict:
+        """The non-empty Model/Capacity/Type of vehicle, as update_vehicle applies them headless."""
+        updates = {}
+        if vehicle.model is not None and str(vehicle.model).strip():
+            updates['Model'] = str(vehicle.model).strip()
+        if vehicle.capacity is not None and str(vehicle.capacity).strip():
+            try:
+                updates['Capacity'] = float(vehicle.capacity)
+            except (TypeError, ValueError):
+                raise InvalidVehicleDataException("Capacity must be a number.")
+            if updates['Capacity'] <= 0:
+                raise InvalidVehicleDataException("Capacity must be greater than 0.")
+        if vehicle.type is not None and str(vehicle.type).strip():
+            updates['Type'] = str(vehicle.type).strip()
+        return updates
+
+    @staticmethod
+    def _ask_vehicle_updates() -> dict:
+        updates = {}
+        print("\nLeave input blank if you don't want to update that field.")
+
+        new_model = input("Enter new Model: ")
+        if new_model.strip():
+            updates['Model'] = new_model.strip()
+
+        new_capacity = input("Enter new Capacity: ")
+        if new_capacity.strip():
+            try:
+                updates['Capacity'] = float(new_capacity)
+            except ValueError:
+                print("Invalid capacity entered. Skipping.")
+
+        new_type = input("Enter new Type (Truck/Van/Bus): ")
+        if new_type.strip():
+            updates['Type'] = new_type.strip()
+        return updates
 
     def delete_vehicle(self, vehicle_id: int) -> bool:
         try:
             # Check if vehicle exists
-            select_query = "SELECT * FROM Vehicles WHERE VehicleID = %s"
-            self.cursor.execute(select_query, (vehicle_id,))
-            result = self.cursor.fetchone()
+            result = self._get_vehicle_row(vehicle_id)
 
             if not result:
                 raise VehicleNotFoundException(f"Vehicle with ID {vehicle_id} not found.")
@@ -125,20 +356,23 @@ class TransportManagementServiceImpl(ITransportManagementService):
             print(f"Type: {result[3]}")
             print(f"Status: {result[4]}")
 
-            confirm = input("\nAre you sure you want to delete this vehicle and deallocate all related trips and bookings? (Y/N): ")
-            if confirm.strip().upper() != "Y":
+            if not self._confirm("\nAre you sure you want to delete this vehicle and deallocate all related trips and bookings? (Y/N): "):
                 print("Delete operation terminated.")
                 return False
 
-            # 1. Set VehicleID to NULL in Trips (deallocate vehicle from trips)
-            self.cursor.execute("""
-                UPDATE Trips SET VehicleID = NULL WHERE VehicleID = %s
-            """, (vehicle_id,))
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                # 1. Set VehicleID to NULL in Trips (deallocate vehicle from trips)
+                cursor.execute("""
+                    UPDATE Trips SET VehicleID = NULL WHERE VehicleID = %s
+                """, (vehicle_id,))
 
-            # 4. Delete the vehicle
-            delete_query = "DELETE FROM Vehicles WHERE VehicleID = %s"
-            self.cursor.execute(delete_query, (vehicle_id,))
-            self.conn.commit()
+                # 4. Delete the vehicle
+                delete_query = "DELETE FROM Vehicles WHERE VehicleID = %s"
+                cursor.execute(delete_query, (vehicle_id,))
+                conn.commit()
+            self.vehicle_schedule.invalidate(vehicle_id)
+            self.entity_cache.invalidate(VEHICLE, vehicle_id)
             print(f"Vehicle with ID {vehicle_id} and all related trips/bookings have been deallocated and deleted.")
             return True
 
@@ -159,34 +393,37 @@ class TransportManagementServiceImpl(ITransportManagementService):
                 print("Arrival must be after departure.")
                 return False
 
-            # Check if vehicle exists
-            self.cursor.execute("SELECT Capacity FROM Vehicles WHERE VehicleID = %s", (vehicle_id,))
-            result = self.cursor.fetchone()
-            if not result:
-                raise VehicleNotFoundException(f"Vehicle with ID {vehicle_id} not found.")
-            capacity = result[0]
-
-            # Fetch scheduled trips for this vehicle
-            self.cursor.execute("""
-                SELECT DepartureDate, ArrivalDate
-                FROM Trips
-                WHERE VehicleID = %s AND Status = 'Scheduled'
-            """, (vehicle_id,))
-            existing_trips = self.cursor.fetchall()
-
-            for existing_dep, existing_arr in existing_trips:
-                rest_buffer = existing_arr + timedelta(days=3)
-                if (new_dep <= rest_buffer and new_arr >= existing_dep):
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+
+                # Check if vehicle exists
+                result = self._get_vehicle_row(vehicle_id, cursor)
+                if not result:
+                    raise VehicleNotFoundException(f"Vehicle with ID {vehicle_id} not found.")
+                capacity = result[2]
+
+                # Check the vehicle's scheduled trips for overlap or rest buffer
+                conflict = self.vehicle_schedule.find_conflict(vehicle_id, new_dep, new_arr, cursor=cursor)
+                if conflict:
+                    existing_dep, existing_arr, _ = conflict
+                    rest_buffer = existing_arr + timedelta(days=3)
                     print(f"Vehicle is not available between {existing_dep} and {rest_buffer} due to another scheduled trip.")
+                    self._count("tm_scheduling_conflicts_total", resource="vehicle")
                     return False
 
-            # Insert new trip
-            self.cursor.execute("""
-                INSERT INTO Trips (VehicleID, RouteID, DepartureDate, ArrivalDate, Status, TripType, MaxPassengers)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (vehicle_id, route_id, departure_date, arrival_date, "Scheduled", "Freight", capacity))
+                # Insert new trip
+                cursor.execute("""
+                    INSERT INTO Trips (VehicleID, RouteID, DepartureDate, ArrivalDate, Status, TripType, MaxPassengers)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, (vehicle_id, route_id, departure_date, arrival_date, "Scheduled", "Freight", capacity))
+                trip_id = cursor.lastrowid
+
+                conn.commit()
 
-            self.conn.commit()
+            self.vehicle_schedule.add(vehicle_id, trip_id, new_dep, new_arr)
+            self.invalidate_trips()
+            if self.status_scheduler is not None:
+                self.status_scheduler.push_trip(trip_id, vehicle_id, None, new_dep, new_arr)
             print(f"Trip scheduled successfully for Vehicle ID {vehicle_id}.")
             return True
 
@@ -197,26 +434,206 @@ class TransportManagementServiceImpl(ITransportManagementService):
             print(f"Error scheduling trip: {e}")
             return False
 
+    def schedule_trips_bulk(self, trips) -> dict:
+        """
+        Schedule a timetable of trips in one call. trips is a sequence of dicts with
+        vehicle_id, route_id, departure_date and arrival_date (or tuples in that order).
+
+        Per vehicle, the proposed trips are swept in departure order against the vehicle's
+        existing scheduled trips and the trips accepted so far, applying the same overlap
+        and 3-day rest rule as schedule_trip, so the result equals scheduling the accepted
+        trips one by one in departure order. Rows naming an unknown vehicle or route are
+        rejected before the sweep. Accepted trips are inserted with executemany in chunks of
+        BULK_INSERT_CHUNK; a chunk the database refuses is retried row by row. Returns {"scheduled", "trip_ids" (input index ->
+        TripID), "rejected" (list of {index, vehicle_id, departure_date, arrival_date,
+        reason}), "elapsed_ms"}.
+        """
+        started = time.perf_counter()
+        rest = timedelta(days=3)
+        rejected = []
+        proposals = {}  # vehicle_id -> [(departure, arrival, index, route_id)]
+
+        def reject(index, vehicle_id, departure, arrival, reason):
+            rejected.append({"index": index, "vehicle_id": vehicle_id, "departure_date": str(departure),
+                             "arrival_date": str(arrival), "reason": reason})
+
+        for index, trip in enumerate(trips):
+            if isinstance(trip, dict):
+                vehicle_id, route_id = trip.get("vehicle_id"), trip.get("route_id")
+                departure, arrival = trip.get("departure_date"), trip.get("arrival_date")
+            else:
+                vehicle_id, route_id, departure, arrival = trip
+            try:
+                vehicle_id, route_id = int(vehicle_id), int(route_id)
+            except (TypeError, ValueError):
+                reject(index, vehicle_id, departure, arrival, "vehicle_id and route_id must be integers.")
+                continue
+            try:
+                new_dep = departure if isinstance(departure, datetime) else \
+                    datetime.strptime(departure, "%Y-%m-%d %H:%M:%S")
+                new_arr = arrival if isinstance(arrival, datetime) else \
+                    datetime.strptime(arrival, "%Y-%m-%d %H:%M:%S")
+            except (TypeError, ValueError):
+                reject(index, vehicle_id, departure, arrival, "Dates must use YYYY-MM-DD HH:MM:SS.")
+                continue
+            # DATETIME columns keep whole seconds; match what will be read back
+            new_dep, new_arr = new_dep.replace(microsecond=0), new_arr.replace(microsecond=0)
+            if new_arr <= new_dep:
+                reject(index, vehicle_id, departure, arrival, "Arrival must be after departure.")
+                continue
+            proposals.setdefault(vehicle_id, []).append((new_dep, new_arr, index, route_id))
+
+        vehicle_ids = list(proposals)
+        route_ids = list({route_id for proposed in proposals.values() for _, _, _, route_id in proposed})
+        capacities, existing = {}, {vehicle_id: [] for vehicle_id in vehicle_ids}
+        known_routes = set()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(route_ids), IN_CLAUSE_CHUNK):
+                chunk = route_ids[start:start + IN_CLAUSE_CHUNK]
+                cursor.execute(f"SELECT RouteID FROM Routes WHERE RouteID IN ({', '.join(['%s'] * len(chunk))})", chunk)
+                known_routes.update(row[0] for row in cursor.fetchall())
+            for start in range(0, len(vehicle_ids), IN_CLAUSE_CHUNK):
+                chunk = vehicle_ids[start:start + IN_CLAUSE_CHUNK]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(f"SELECT VehicleID, Capacity FROM Vehicles WHERE VehicleID IN ({placeholders})", chunk)
+                capacities.update(cursor.fetchall())
+                cursor.execute(f"""
+                    SELECT VehicleID, DepartureDate, ArrivalDate
+                    FROM Trips
+                    WHERE Status = 'Scheduled' AND VehicleID IN ({placeholders})
+                """, chunk)
+                for vehicle_id, dep, arr in cursor.fetchall():
+                    existing[vehicle_id].append((dep, arr))
+
+        # Sweep each vehicle: existing trips sorted by departure with a running maximum of
+        # their rest-buffer end, so "is there an existing trip departing by this arrival
+        # whose buffer reaches this departure" is one bisect. Accepted proposals all depart
+        # no later than the current one, so a single running maximum covers them.
+        accepted = []
+        for vehicle_id, proposed in proposals.items():
+            if vehicle_id not in capacities:
+                for dep, arr, index, _ in proposed:
+                    reject(index, vehicle_id, dep, arr, f"Vehicle with ID {vehicle_id} not found.")
+                continue
+            booked = sorted(existing[vehicle_id])
+            starts = [dep for dep, _ in booked]
+            buffer_ends, latest = [], None
+            for _, arr in booked:
+                latest = arr + rest if latest is None else max(latest, arr + rest)
+                buffer_ends.append(latest)
+
+            accepted_buffer_end = None
+            for dep, arr, index, route_id in sorted(proposed, key=lambda p: (p[0], p[2])):
+                position = bisect_right(starts, arr)
+                if route_id not in known_routes:
+                    reject(index, vehicle_id, dep, arr, f"Route with ID {route_id} not found.")
+                elif position and buffer_ends[position - 1] >= dep:
+                    reject(index, vehicle_id, dep, arr, "Conflicts with an existing scheduled trip or its rest buffer.")
+                    self._count("tm_scheduling_conflicts_total", resource="vehicle")
+                elif accepted_buffer_end is not None and accepted_buffer_end >= dep:
+                    reject(index, vehicle_id, dep, arr, "Conflicts with an earlier trip in this timetable or its rest buffer.")
+                    self._count("tm_scheduling_conflicts_total", resource="vehicle")
+                else:
+                    accepted.append((vehicle_id, route_id, dep, arr, index))
+                    end = arr + rest
+                    accepted_buffer_end = end if accepted_buffer_end is None else max(accepted_buffer_end, end)
+
+        insert = """
+            INSERT INTO Trips (VehicleID, RouteID, DepartureDate, ArrivalDate, Status, TripType, MaxPassengers)
+            VALUES (%s, %s, %s, %s, 'Scheduled', 'Freight', %s)
+        """
+        refused = set()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(accepted), BULK_INSERT_CHUNK):
+                chunk = accepted[start:start + BULK_INSERT_CHUNK]
+                try:
+                    cursor.executemany(insert, [(vehicle_id, route_id, dep, arr, capacities[vehicle_id])
+                                                for vehicle_id, route_id, dep, arr, _ in chunk])
+                except self.backend.error_types:
+                    # A row changed under us (e.g. its route was deleted); retry one by one
+                    # so only the rows the database refuses are rejected
+                    conn.rollback()
+                    for vehicle_id, route_id, dep, arr, index in chunk:
+                        try:
+                            cursor.execute(insert, (vehicle_id, route_id, dep, arr, capacities[vehicle_id]))
+                        except self.backend.error_types as e:
+                            reject(index, vehicle_id, dep, arr, f"Rejected by database: {e}")
+                            refused.add(index)
+                conn.commit()
+        if refused:
+            accepted = [trip for trip in accepted if trip[4] not in refused]
+
+        # executemany does not report generated keys; read them back by (vehicle, window),
+        # which is unique among a vehicle's scheduled trips once the sweep has passed
+        trip_ids = {}
+        pending = {(vehicle_id, dep, arr): index for vehicle_id, _, dep, arr, index in accepted}
+        affected = sorted({vehicle_id for vehicle_id, _, _, _, _ in accepted})
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(affected), IN_CLAUSE_CHUNK):
+                chunk = affected[start:start + IN_CLAUSE_CHUNK]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(f"""
+                    SELECT TripID, VehicleID, DepartureDate, ArrivalDate
+                    FROM Trips
+                    WHERE Status = 'Scheduled' AND VehicleID IN ({placeholders})
+                """, chunk)
+                for trip_id, vehicle_id, dep, arr in cursor.fetchall():
+                    index = pending.pop((vehicle_id, dep, arr), None)
+                    if index is not None:
+                        trip_ids[index] = trip_id
+
+        for vehicle_id, _, dep, arr, index in accepted:
+            trip_id = trip_ids.get(index)
+            if trip_id is None:
+                self.vehicle_schedule.invalidate(vehicle_id)
+                continue
+            self.vehicle_schedule.add(vehicle_id, trip_id, dep, arr)
+            if self.status_scheduler is not None:
+                self.status_scheduler.push_trip(trip_id, vehicle_id, None, dep, arr)
+
+        if accepted:
+            self.invalidate_trips()
+        rejected.sort(key=lambda rejection: rejection["index"])
+        return {"scheduled": len(accepted), "trip_ids": trip_ids, "rejected": rejected,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+
     def cancel_trip(self, trip_id: int) -> bool:
         try:
-            # 1. Check if trip exists and fetch vehicle_id
-            self.cursor.execute("SELECT VehicleID FROM Trips WHERE TripID = %s", (trip_id,))
-            trip = self.cursor.fetchone()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            if not trip:
-                raise Exception(f"No trip found with ID {trip_id}.")
+                # 1. Check if trip exists and fetch vehicle_id
+                cursor.execute("SELECT VehicleID, DriverID FROM Trips WHERE TripID = %s", (trip_id,))
+                trip = cursor.fetchone()
+
+                if not trip:
+                    raise Exception(f"No trip found with ID {trip_id}.")
+
+                vehicle_id, driver_id = trip  # Extract VehicleID from result
 
-            vehicle_id = trip[0]  # Extract VehicleID from result
+                # 2. Update trip status to CANCELLED
+                update_query = "UPDATE Trips SET Status = %s WHERE TripID = %s"
+                cursor.execute(update_query, ("CANCELLED", trip_id))
 
-            # 2. Update trip status to CANCELLED
-            update_query = "UPDATE Trips SET Status = %s WHERE TripID = %s"
-            self.cursor.execute(update_query, ("CANCELLED", trip_id))
+                # 3. Update vehicle status to Available
+                vehicle_update_query = "UPDATE Vehicles SET Status = %s WHERE VehicleID = %s"
+                cursor.execute(vehicle_update_query, ("Available", vehicle_id))
 
-            # 3. Update vehicle status to Available
-            vehicle_update_query = "UPDATE Vehicles SET Status = %s WHERE VehicleID = %s"
-            self.cursor.execute(vehicle_update_query, ("Available", vehicle_id))
+                conn.commit()
 
-            self.conn.commit()
+            self.vehicle_schedule.remove(vehicle_id, trip_id)
+            self.invalidate_trips()
+            self.leg_inventory.invalidate(trip_id)
+            self.driver_schedule.remove(driver_id, trip_id)
+            self.entity_cache.invalidate(VEHICLE, vehicle_id)
+            if self.status_scheduler is not None:
+                self.status_scheduler.invalidate(trip_id, VEHICLE, vehicle_id)
+                self.status_scheduler.invalidate(trip_id, DRIVER, driver_id)
+                self.status_scheduler.refresh(VEHICLE, vehicle_id)
+                self.status_scheduler.refresh(DRIVER, driver_id)
 
             print(f"Trip ID {trip_id} has been successfully cancelled.")
             print(f"Vehicle ID {vehicle_id} status set to 'Available'.")
@@ -227,125 +644,398 @@ class TransportManagementServiceImpl(ITransportManagementService):
             return False
 
 
-    def book_trip(self) -> bool:
+    def book_trip(self, trip_id: int, passenger_id: int, booking_date=None, from_stop=None, to_stop=None) -> bool:
+        results = self.book_trip_batch(trip_id, [passenger_id], booking_date, from_stop, to_stop)
+        return results.get(passenger_id) == BOOKED
+
+    def _resolve_segment(self, cursor, trip_id, leg_count, from_stop, to_stop):
+        """Stop positions (first, last) for a booking; stops are names or positions 0..leg_count."""
+        if isinstance(from_stop, str) or isinstance(to_stop, str):
+            cursor.execute("SELECT FromStop, ToStop FROM trip_legs WHERE TripID = %s ORDER BY LegIndex", (trip_id,))
+            rows = cursor.fetchall()
+            names = [" ".join(str(name).split()).lower() for name in [rows[0][0]] + [row[1] for row in rows]]
+            positions = {}
+            for position, name in enumerate(names):
+                positions.setdefault(name, position)
+
+            def position_of(stop):
+                if not isinstance(stop, str):
+                    return stop
+                key = " ".join(stop.split()).lower()
+                if key not in positions:
+                    raise ValueError(f"Trip {trip_id} does not stop at {stop}.")
+                return positions[key]
+            from_stop, to_stop = position_of(from_stop), position_of(to_stop)
+        first = 0 if from_stop is None else int(from_stop)
+        last = leg_count if to_stop is None else int(to_stop)
+        if not 0 <= first < last <= leg_count:
+            raise ValueError(f"Stops {first} to {last} are not a forward journey on Trip {trip_id}.")
+        return first, last
+
+    def book_trip_batch(self, trip_id: int, passenger_ids: List[int], booking_date=None,
+                        from_stop=None, to_stop=None) -> Dict[int, str]:
+        """
+        Book a group of passengers on one trip without prompting. Passenger existence and
+        duplicate bookings are each checked with one set-based query and all bookings are
+        inserted with a single executemany in one transaction. Returns the outcome for
+        every passenger ID (BOOKED, PASSENGER_NOT_FOUND, ALREADY_BOOKED, ...).
+
+        On a multi-stop trip, from_stop/to_stop (stop names or positions, default the whole
+        trip) pick the legs booked; a seat is sold if every leg in between has one free.
+        """
+        results = self._book_trip_batch(trip_id, passenger_ids, booking_date, from_stop, to_stop)
+        if self.metrics is not None:
+            outcomes = {}
+            for outcome in results.values():
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            for outcome, count in outcomes.items():
+                self._count("tm_bookings_total", count, outcome=outcome)
+            self._count("tm_oversell_refusals_total", outcomes.get(NO_SEATS, 0))
+        return results
+
+    def _book_trip_batch(self, trip_id, passenger_ids, booking_date, from_stop, to_stop):
         try:
-            # Step 1: Ask for trip ID
-            trip_id = int(input("Enter Trip ID to book: "))
-
-            # Step 2: Fetch trip details
-            self.cursor.execute("""
-                SELECT T.TripID, T.Status, T.DepartureDate, V.Capacity,
-                    (SELECT COUNT(*) FROM Bookings WHERE TripID = T.TripID AND Status = 'BOOKED') AS BookedSeats
-                FROM Trips T
-                JOIN Vehicles V ON T.VehicleID = V.VehicleID
-                WHERE T.TripID = %s
-            """, (trip_id,))
-            trip_data = self.cursor.fetchone()
-
-            if not trip_data:
-                raise TripNotFoundException(f"Trip ID {trip_id} not found.")
+            if booking_date is None:
+                booking_date = datetime.now()
+            elif isinstance(booking_date, str):
+                booking_date = datetime.strptime(booking_date, "%Y-%m-%d %H:%M:%S")
 
-            trip_id, status, departure_date, capacity, booked_seats = trip_data
-            booking_date = datetime.now()
+            # A passenger listed twice is booked once
+            results = dict.fromkeys(passenger_ids)
+            requested = list(results)
 
-            # Step 3: Validate trip status
-            if status.upper() == "CANCELLED":
-                print("Sorry, the trip was cancelled due to certain circumstances.")
-                return False
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            # Step 4: Validate booking cutoff
-            if booking_date > departure_date - timedelta(days=1):
-                print("Sorry, bookings are closed.")
-                return False
-
-            # Step 5: Ask for number of people
-            num_people = int(input("Enter number of people to book: "))
+                # Step 1: Fetch trip details; SeatsBooked is the trip's seat inventory
+                cursor.execute("""
+                    SELECT TripID, Status, DepartureDate, MaxPassengers, SeatsBooked
+                    FROM Trips
+                    WHERE TripID = %s
+                """, (trip_id,))
+                trip_data = cursor.fetchone()
 
-            # Check availability
-            available_seats = capacity - booked_seats
-            if num_people > available_seats:
-                print(f"Only {available_seats} seats are available. Cannot book {num_people} seats.")
-                return False
+                if not trip_data:
+                    raise TripNotFoundException(f"Trip ID {trip_id} not found.")
 
-            passenger_ids = []
-            for i in range(num_people):
-                pid = int(input(f"Enter Passenger ID for person {i+1}: "))
-
-                # Validate passenger ID
-                self.cursor.execute("SELECT * FROM Passengers WHERE PassengerID = %s", (pid,))
-                if not self.cursor.fetchone():
-                    print(f"Passenger ID {pid} not found. Skipping this ID.")
-                    continue
-
-                # Check for duplicate active booking
-                self.cursor.execute("""
-                    SELECT PassengerID, TripID, BookingDate 
-                    FROM Bookings 
-                    WHERE PassengerID = %s AND TripID = %s AND Status = 'BOOKED'
-                """, (pid, trip_id))
-                existing = self.cursor.fetchone()
-
-                if existing:
-                    print(f"Passenger ID {pid} is already booked on Trip {trip_id}.")
-                    print(f"Existing Booking - PassengerID: {existing[0]}, TripID: {existing[1]}, BookingDate: {existing[2]}")
-                    continue
-
-                passenger_ids.append(pid)
-
-            # Final confirmation
-            if not passenger_ids:
-                print("No valid passengers to book.")
-                return False
+                trip_id, status, departure_date, capacity, booked_seats = trip_data
 
-            # Step 6: Insert all bookings
-            for pid in passenger_ids:
-                self.cursor.execute("""
-                    INSERT INTO Bookings (PassengerID, TripID, BookingDate, Status)
-                    VALUES (%s, %s, %s, %s)
-                """, (pid, trip_id, booking_date, "BOOKED"))
+                # Step 2: Validate trip status and booking cutoff
+                if status.upper() == "CANCELLED":
+                    print("Sorry, the trip was cancelled due to certain circumstances.")
+                    return {pid: outcome or TRIP_CANCELLED for pid, outcome in results.items()}
+                if booking_date > departure_date - timedelta(days=1):
+                    print("Sorry, bookings are closed.")
+                    return {pid: outcome or BOOKING_CLOSED for pid, outcome in results.items()}
 
-            self.conn.commit()
-            print(f"[Booking] Successfully booked {len(passenger_ids)} passenger(s) on Trip {trip_id}.")
-            return True
+                legs = self.leg_inventory.get(trip_id, cursor)
+                segment = None
+                try:
+                    if legs is not None:
+                        segment = self._resolve_segment(cursor, trip_id, len(legs), from_stop, to_stop)
+                    elif from_stop is not None or to_stop is not None:
+                        raise ValueError(f"Trip {trip_id} has no intermediate stops.")
+                except ValueError as e:
+                    print(f"[Booking Error] {e}")
+                    return {pid: outcome or INVALID_SEGMENT for pid, outcome in results.items()}
+
+                # Step 3: Passengers come from the entity cache (one query for any misses),
+                # active bookings on this trip from one set-based query
+                existing = self._existing_passengers(cursor, requested)
+                already_booked = set()
+                for start in range(0, len(requested), IN_CLAUSE_CHUNK):
+                    chunk = requested[start:start + IN_CLAUSE_CHUNK]
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    cursor.execute(f"""
+                        SELECT PassengerID FROM Bookings
+                        WHERE TripID = %s AND Status = 'BOOKED' AND PassengerID IN ({placeholders})
+                    """, [trip_id] + chunk)
+                    already_booked.update(row[0] for row in cursor.fetchall())
+
+                to_book = []
+                for pid in requested:
+                    if pid not in existing:
+                        results[pid] = PASSENGER_NOT_FOUND
+                    elif pid in already_booked:
+                        results[pid] = ALREADY_BOOKED
+                    else:
+                        to_book.append(pid)
+
+                if not to_book:
+                    print("No valid passengers to book.")
+                    return results
+
+                # Step 4: Reserve seats for the whole group. The conditional UPDATE is atomic
+                # (it locks the trip row until commit), so concurrent bookers cannot oversell.
+                if segment is None:
+                    cursor.execute("""
+                        UPDATE Trips SET SeatsBooked = SeatsBooked + %s
+                        WHERE TripID = %s AND Status <> 'CANCELLED' AND SeatsBooked + %s <= MaxPassengers
+                    """, (len(to_book), trip_id, len(to_book)))
+                    reserved = cursor.rowcount == 1
+                    available_seats = capacity - booked_seats
+                else:
+                    reserved, available_seats, seats_taken = self._reserve_legs(cursor, trip_id, segment,
+                                                                                len(to_book), capacity)
+                if not reserved:
+                    conn.rollback()
+                    print(f"Only {available_seats} seats are available. Cannot book {len(to_book)} seats.")
+                    results.update((pid, NO_SEATS) for pid in to_book)
+                    return results
+
+                # Step 5: Insert all bookings
+                if segment is None:
+                    cursor.executemany("""
+                        INSERT INTO Bookings (PassengerID, TripID, BookingDate, Status)
+                        VALUES (%s, %s, %s, %s)
+                    """, [(pid, trip_id, booking_date, "BOOKED") for pid in to_book])
+                else:
+                    cursor.executemany("""
+                        INSERT INTO Bookings (PassengerID, TripID, BookingDate, Status, FromStop, ToStop)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                    """, [(pid, trip_id, booking_date, "BOOKED") + segment for pid in to_book])
+                conn.commit()
 
         except (TripNotFoundException, BookingNotFoundException) as e:
             print(f"[Booking Error] {e}")
             raise
         except Exception as e:
             print(f"[Booking Error] Unexpected error: {e}")
-            return False
+            return {pid: BOOKING_FAILED for pid in passenger_ids}
+
+        # Committed: from here on only in-memory bookkeeping, which must not turn the
+        # outcome into a failure
+        results.update((pid, BOOKED) for pid in to_book)
+        if segment is None:
+            seats_taken = len(to_book)
+        else:
+            self.leg_inventory.range_add(trip_id, segment[0], segment[1], len(to_book))
+        if self.trip_search is not None:
+            self.trip_search.adjust_seats(trip_id, seats_taken)
+        print(f"[Booking] Successfully booked {len(to_book)} passenger(s) on Trip {trip_id}.")
+        return results
+
+    def _reserve_legs(self, cursor, trip_id, segment, seats, capacity):
+        """
+        Take seats on legs [first, last) of a multi-stop trip inside the caller's transaction.
+        The segment tree rejects full segments without writing; the database re-checks the
+        legs after incrementing them (the rows stay locked until commit), so concurrent
+        bookers cannot oversell either. Returns (reserved, seats free before the attempt,
+        growth of the trip's busiest leg).
+        """
+        first, last = segment
+        available_seats = capacity - self._segment_peak(cursor, trip_id, first, last)
+        if seats > available_seats:
+            return False, available_seats, 0
+        cursor.execute("""
+            UPDATE trip_legs SET SeatsBooked = SeatsBooked + %s
+            WHERE TripID = %s AND LegIndex >= %s AND LegIndex < %s
+        """, (seats, trip_id, first, last))
+        cursor.execute("SELECT MAX(SeatsBooked) FROM trip_legs WHERE TripID = %s AND LegIndex >= %s AND LegIndex < %s",
+                       (trip_id, first, last))
+        if cursor.fetchone()[0] > capacity:
+            # Another process sold seats this process has not seen; reload on next use
+            self.leg_inventory.invalidate(trip_id)
+            return False, available_seats, 0
+        # Trips.SeatsBooked of a multi-stop trip is its busiest leg, so end-to-end checks stay valid
+        return True, available_seats, self._sync_busiest_leg(cursor, trip_id)
+
+    def _segment_peak(self, cursor, trip_id, first, last):
+        """Most seats booked on legs [first, last), from the inventory or, if another thread dropped the trip, the database."""
+        peak = self.leg_inventory.range_max(trip_id, first, last)
+        if peak is None:
+            cursor.execute("SELECT MAX(SeatsBooked) FROM trip_legs WHERE TripID = %s AND LegIndex >= %s AND LegIndex < %s",
+                           (trip_id, first, last))
+            peak = cursor.fetchone()[0]
+        return peak
+
+    def _sync_busiest_leg(self, cursor, trip_id):
+        """Set Trips.SeatsBooked to the trip's busiest leg; returns how much it changed."""
+        cursor.execute("SELECT SeatsBooked FROM Trips WHERE TripID = %s", (trip_id,))
+        before = cursor.fetchone()[0]
+        cursor.execute("SELECT MAX(SeatsBooked) FROM trip_legs WHERE TripID = %s", (trip_id,))
+        after = cursor.fetchone()[0]
+        cursor.execute("UPDATE Trips SET SeatsBooked = %s WHERE TripID = %s", (after, trip_id))
+        return after - before
 
     def cancel_booking(self, booking_id: int) -> bool:
         try:
-            # 1. Check if booking exists
-            self.cursor.execute("SELECT * FROM Bookings WHERE BookingID = %s", (booking_id,))
-            existing_booking = self.cursor.fetchone()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+
+                # 1. Check if booking exists
+                cursor.execute("SELECT TripID, FromStop, ToStop FROM Bookings WHERE BookingID = %s", (booking_id,))
+                existing_booking = cursor.fetchone()
+
+                if not existing_booking:
+                    raise BookingNotFoundException(f"Booking with ID {booking_id} not found.")
+                trip_id, first, last = existing_booking
+
+                # 2. Update the booking status to CANCELLED and give the seat back,
+                #    but only if this call is the one that cancelled it
+                cursor.execute("UPDATE Bookings SET Status = %s WHERE BookingID = %s AND Status = 'BOOKED'",
+                               ("CANCELLED", booking_id))
+                released = cursor.rowcount == 1
+                seats_freed = 1
+                if released and first is not None:
+                    # Multi-stop booking: free its legs, then recompute the trip's busiest leg
+                    cursor.execute("""
+                        UPDATE trip_legs SET SeatsBooked = SeatsBooked - 1
+                        WHERE TripID = %s AND LegIndex >= %s AND LegIndex < %s AND SeatsBooked > 0
+                    """, (trip_id, first, last))
+                    seats_freed = -self._sync_busiest_leg(cursor, trip_id)
+                elif released:
+                    cursor.execute("UPDATE Trips SET SeatsBooked = SeatsBooked - 1 WHERE TripID = %s AND SeatsBooked > 0",
+                                   (trip_id,))
+                conn.commit()
+        except BookingNotFoundException as e:
+            print(f"[Cancellation Error] {e}")
+            raise
+        except Exception as e:
+            print(f"[Cancellation Error] Unexpected error: {e}")
+            return False
+
+        # Committed: in-memory bookkeeping only
+        if released:
+            if first is not None:
+                self.leg_inventory.range_add(trip_id, first, last, -1)
+            if self.trip_search is not None:
+                self.trip_search.adjust_seats(trip_id, -seats_freed)
+        print(f"[Cancellation] Booking ID {booking_id} has been successfully cancelled.")
+        return True
+
+    def rebuild_seat_inventory(self) -> int:
+        """Recount SeatsBooked for every trip and leg from its BOOKED rows (one-off backfill or repair)."""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE Trips AS T SET SeatsBooked =
+                    (SELECT COUNT(*) FROM Bookings B WHERE B.TripID = T.TripID AND B.Status = 'BOOKED')
+            """)
+            rows_updated = cursor.rowcount
+            # A booking without stops covers every leg of its trip
+            cursor.execute("""
+                UPDATE trip_legs AS L SET SeatsBooked =
+                    (SELECT COUNT(*) FROM Bookings B
+                     WHERE B.TripID = L.TripID AND B.Status = 'BOOKED'
+                       AND (B.FromStop IS NULL OR (B.FromStop <= L.LegIndex AND L.LegIndex < B.ToStop)))
+            """)
+            cursor.execute("""
+                UPDATE Trips AS T SET SeatsBooked =
+                    (SELECT MAX(L.SeatsBooked) FROM trip_legs L WHERE L.TripID = T.TripID)
+                WHERE EXISTS (SELECT 1 FROM trip_legs L WHERE L.TripID = T.TripID)
+            """)
+            conn.commit()
+        self.leg_inventory.invalidate()
+        return rows_updated
+
+    def add_trip_stops(self, trip_id: int, stops) -> bool:
+        """
+        Turn a scheduled, unbooked trip into a multi-stop trip. stops is the ordered list of
+        (stop_name, arrival_date, departure_date); the first stop's arrival and the last
+        stop's departure are ignored. Consecutive stops form the legs, which must run
+        forward in time within the trip's own departure and arrival.
+        """
+        try:
+            stops = [(str(name or "").strip(), arrival, departure) for name, arrival, departure in stops]
+            if len(stops) < 2 or not all(name for name, _, _ in stops):
+                print("A multi-stop trip needs at least two named stops.")
+                return False
 
-            if not existing_booking:
-                raise BookingNotFoundException(f"Booking with ID {booking_id} not found.")
+            def parse(value):
+                return datetime.strptime(value, "%Y-%m-%d %H:%M:%S") if isinstance(value, str) else value
+
+            legs = []
+            for index, ((from_name, _, departure), (to_name, arrival, _)) in enumerate(zip(stops, stops[1:])):
+                legs.append((trip_id, index, from_name, to_name, parse(departure), parse(arrival)))
+
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT Status, DepartureDate, ArrivalDate, SeatsBooked FROM Trips WHERE TripID = %s",
+                               (trip_id,))
+                trip = cursor.fetchone()
+                if not trip:
+                    raise TripNotFoundException(f"Trip ID {trip_id} not found.")
+                status, trip_departure, trip_arrival, seats_booked = trip
+                if status != "Scheduled" or seats_booked:
+                    print("Stops can only be set on a scheduled trip with no bookings.")
+                    return False
 
-            # 2. Update the booking status to CANCELLED
-            self.cursor.execute("UPDATE Bookings SET Status = %s WHERE BookingID = %s", ("CANCELLED", booking_id))
-            self.conn.commit()
+                previous = trip_departure
+                for _, _, from_name, to_name, departure, arrival in legs:
+                    if departure is None or arrival is None or not previous <= departure < arrival:
+                        print(f"Leg {from_name} -> {to_name} must depart after the previous arrival and before it arrives.")
+                        return False
+                    previous = arrival
+                if previous > trip_arrival:
+                    print(f"The last stop is reached after the trip's arrival at {trip_arrival}.")
+                    return False
 
-            print(f"[Cancellation] Booking ID {booking_id} has been successfully cancelled.")
+                cursor.execute("DELETE FROM trip_legs WHERE TripID = %s", (trip_id,))
+                cursor.executemany("""
+                    INSERT INTO trip_legs (TripID, LegIndex, FromStop, ToStop, DepartureDate, ArrivalDate, SeatsBooked)
+                    VALUES (%s, %s, %s, %s, %s, %s, 0)
+                """, legs)
+                conn.commit()
+
+            self.leg_inventory.invalidate(trip_id)
+            print(f"Trip ID {trip_id} now has {len(legs)} legs.")
             return True
-        except BookingNotFoundException as e:
-            print(f"[Cancellation Error] {e}")
+
+        except TripNotFoundException as e:
+            print(f"Error: {e}")
             raise
         except Exception as e:
-            print(f"[Cancellation Error] Unexpected error: {e}")
+            print(f"Error adding trip stops: {e}")
             return False
 
+    def get_trip_legs(self, trip_id: int) -> List[dict]:
+        """The legs of a multi-stop trip with seats booked and free on each; [] for a single-hop trip."""
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT L.LegIndex, L.FromStop, L.ToStop, L.DepartureDate, L.ArrivalDate, L.SeatsBooked,
+                           T.MaxPassengers
+                    FROM trip_legs L
+                    JOIN Trips T ON T.TripID = L.TripID
+                    WHERE L.TripID = %s
+                    ORDER BY L.LegIndex
+                """, (trip_id,))
+                return [{"leg_index": index, "from_stop": from_stop, "to_stop": to_stop,
+                         "departure_date": departure, "arrival_date": arrival,
+                         "seats_booked": booked, "free_seats": capacity - booked}
+                        for index, from_stop, to_stop, departure, arrival, booked, capacity in cursor.fetchall()]
+        except Exception as e:
+            print(f"[Error] Failed to fetch legs of Trip {trip_id}: {e}")
+            return []
+
+    def seats_available(self, trip_id: int, from_stop=None, to_stop=None) -> int:
+        """Seats free on every leg between two stops (names or positions; default the whole trip)."""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MaxPassengers, SeatsBooked FROM Trips WHERE TripID = %s", (trip_id,))
+            trip = cursor.fetchone()
+            if not trip:
+                raise TripNotFoundException(f"Trip ID {trip_id} not found.")
+            capacity, booked = trip
+            legs = self.leg_inventory.get(trip_id, cursor)
+            if legs is None:
+                return capacity - booked
+            first, last = self._resolve_segment(cursor, trip_id, len(legs), from_stop, to_stop)
+            return capacity - self._segment_peak(cursor, trip_id, first, last)
+
     def allocate_driver(self, trip_id: int, driver_id: int) -> bool:
         try:
             # Step 1: Fetch trip details
-            self.cursor.execute("""
-                SELECT DepartureDate, ArrivalDate, Status, DriverID
-                FROM Trips
-                WHERE TripID = %s
-            """, (trip_id,))
-            trip = self.cursor.fetchone()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT DepartureDate, ArrivalDate, Status, DriverID
+                    FROM Trips
+                    WHERE TripID = %s
+                """, (trip_id,))
+                trip = cursor.fetchone()
 
             if not trip:
                 print(f"No trip found with ID {trip_id}")
@@ -359,35 +1049,40 @@ class TransportManagementServiceImpl(ITransportManagementService):
 
             if existing_driver_id:
                 print(f"ℹTrip ID {trip_id} already has Driver ID {existing_driver_id} assigned.")
-                choice = input("Do you want to replace the existing driver? (Y/N): ").strip().upper()
-                if choice != 'Y':
+                if not self._confirm("Do you want to replace the existing driver? (Y/N): "):
                     print(" Driver allocation skipped. Existing driver retained.")
                     return False
 
-            # Step 2: Check if driver exists
-            self.cursor.execute("SELECT * FROM Drivers WHERE DriverID = %s", (driver_id,))
-            driver = self.cursor.fetchone()
-            if not driver:
-                print(f"No driver found with ID {driver_id}")
-                return False
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
 
-            # Step 3: Check for conflicting scheduled trips
-            self.cursor.execute("""
-                SELECT DepartureDate, ArrivalDate
-                FROM Trips
-                WHERE DriverID = %s AND Status = 'Scheduled'
-            """, (driver_id,))
-            trips = self.cursor.fetchall()
-
-            for dep, arr in trips:
-                rest_buffer = arr + timedelta(days=3)
-                if new_dep <= rest_buffer and new_arr >= dep:
+                # Step 2: Check if driver exists
+                driver = self._get_driver_row(driver_id, cursor)
+                if not driver:
+                    print(f"No driver found with ID {driver_id}")
+                    return False
+
+                # Step 3: Check for conflicting scheduled trips
+                if not self.driver_schedule.is_free(driver_id, new_dep, new_arr,
+                                                    exclude_trip_id=trip_id, cursor=cursor):
                     print(" Driver is not available for the selected trip due to overlap or rest buffer.")
+                    self._count("tm_scheduling_conflicts_total", resource="driver")
                     return False
 
-            # Step 4: Allocate driver
-            self.cursor.execute("UPDATE Trips SET DriverID = %s WHERE TripID = %s", (driver_id, trip_id))
-            self.conn.commit()
+                # Step 4: Allocate driver
+                cursor.execute("UPDATE Trips SET DriverID = %s WHERE TripID = %s", (driver_id, trip_id))
+                conn.commit()
+
+            self.driver_schedule.remove(existing_driver_id, trip_id)
+            if status == "Scheduled":
+                self.driver_schedule.add(driver_id, trip_id, new_dep, new_arr)
+
+            if self.status_scheduler is not None:
+                if existing_driver_id and existing_driver_id != driver_id:
+                    self.status_scheduler.invalidate(trip_id, DRIVER, existing_driver_id)
+                    self.status_scheduler.refresh(DRIVER, existing_driver_id)
+                self.status_scheduler.push_trip(trip_id, None, driver_id, new_dep, new_arr)
+                self.status_scheduler.refresh(DRIVER, driver_id)
             print(f" Driver ID {driver_id} successfully allocated to Trip ID {trip_id}")
             return True
 
@@ -398,12 +1093,14 @@ class TransportManagementServiceImpl(ITransportManagementService):
     def deallocate_driver(self, trip_id: int) -> bool:
         try:
             # Step 1: Fetch current driver assigned to the trip
-            self.cursor.execute("""
-                SELECT DriverID, Status
-                FROM Trips
-                WHERE TripID = %s
-            """, (trip_id,))
-            trip = self.cursor.fetchone()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT DriverID, Status
+                    FROM Trips
+                    WHERE TripID = %s
+                """, (trip_id,))
+                trip = cursor.fetchone()
 
             if not trip:
                 print(f" No trip found with ID {trip_id}")
@@ -422,14 +1119,21 @@ class TransportManagementServiceImpl(ITransportManagementService):
                 return False
 
             # Step 4: Ask for confirmation
-            confirm = input(f"Driver ID {current_driver_id} is currently assigned to Trip ID {trip_id}. Do you want to deallocate? (Y/N): ").strip().upper()
-            if confirm != 'Y':
+            if not self._confirm(f"Driver ID {current_driver_id} is currently assigned to Trip ID {trip_id}. Do you want to deallocate? (Y/N): "):
                 print(" Driver deallocation cancelled.")
                 return False
 
             # Step 5: Set DriverID to NULL
-            self.cursor.execute("UPDATE Trips SET DriverID = NULL WHERE TripID = %s", (trip_id,))
-            self.conn.commit()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE Trips SET DriverID = NULL WHERE TripID = %s", (trip_id,))
+                conn.commit()
+
+            self.driver_schedule.remove(current_driver_id, trip_id)
+
+            if self.status_scheduler is not None:
+                self.status_scheduler.invalidate(trip_id, DRIVER, current_driver_id)
+                self.status_scheduler.refresh(DRIVER, current_driver_id)
             print(f"Driver ID {current_driver_id} successfully deallocated from Trip ID {trip_id}")
             return True
 
@@ -440,14 +1144,15 @@ class TransportManagementServiceImpl(ITransportManagementService):
 
     def get_bookings_by_passenger(self, passenger_id: int) -> List[Booking]:
         try:
-            self.cursor.execute("""
-                SELECT BookingID, PassengerID, TripID, BookingDate, Status
-                FROM Bookings
-                WHERE PassengerID = %s
-            """, (passenger_id,))
-            rows = self.cursor.fetchall()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT BookingID, PassengerID, TripID, BookingDate, Status
+                    FROM Bookings
+                    WHERE PassengerID = %s
+                """, (passenger_id,))
+                bookings = RowMapper.map_rows(cursor, Booking, cursor.fetchall())
 
-            bookings = [Booking(*row) for row in rows]
             return bookings
 
         except Exception as e:
@@ -458,14 +1163,15 @@ class TransportManagementServiceImpl(ITransportManagementService):
 
     def get_bookings_by_trip(self, trip_id: int) -> List[Booking]:
         try:
-            self.cursor.execute("""
-                SELECT BookingID, PassengerID, TripID, BookingDate, Status
-                FROM Bookings
-                WHERE TripID = %s
-            """, (trip_id,))
-            rows = self.cursor.fetchall()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT BookingID, PassengerID, TripID, BookingDate, Status
+                    FROM Bookings
+                    WHERE TripID = %s
+                """, (trip_id,))
+                bookings = RowMapper.map_rows(cursor, Booking, cursor.fetchall())
 
-            bookings = [Booking(*row) for row in rows]
             return bookings
 
         except Exception as e:
@@ -474,118 +1180,288 @@ class TransportManagementServiceImpl(ITransportManagementService):
 
 
 
+    def _iter_bookings(self, key_column, key, chunk_size):
+        # The connection is held until the generator is exhausted or closed
+        with self.pool.connection() as conn:
+            cursor = self.backend.streaming_cursor(conn)
+            cursor.execute(f"""
+                SELECT BookingID, TripID, PassengerID, BookingDate, Status
+                FROM Bookings
+                WHERE {key_column} = %s
+                ORDER BY BookingID
+            """, (key,))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from RowMapper.map_rows(cursor, Booking, rows)
+
+    def iter_bookings_by_passenger(self, passenger_id: int, chunk_size: int = FETCH_CHUNK) -> Iterator[Booking]:
+        """Yield a passenger's bookings in BookingID order, chunk_size rows in memory at a time."""
+        return self._iter_bookings("PassengerID", passenger_id, chunk_size)
+
+    def iter_bookings_by_trip(self, trip_id: int, chunk_size: int = FETCH_CHUNK) -> Iterator[Booking]:
+        """Yield a trip's bookings in BookingID order, chunk_size rows in memory at a time."""
+        return self._iter_bookings("TripID", trip_id, chunk_size)
+
+    def _get_bookings_page(self, key_column, key, after_booking_id, limit):
+        # Keyset pagination: seeks past after_booking_id on the (key, BookingID) index,
+        # so page N costs the same as page 1
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT BookingID, TripID, PassengerID, BookingDate, Status
+                FROM Bookings
+                WHERE {key_column} = %s AND BookingID > %s
+                ORDER BY BookingID
+                LIMIT %s
+            """, (key, after_booking_id or 0, limit))
+            return RowMapper.map_rows(cursor, Booking, cursor.fetchall())
+
+    def get_bookings_page_by_passenger(self, passenger_id: int, after_booking_id: int = 0,
+                                       limit: int = 100) -> List[Booking]:
+        """
+        Up to limit bookings of a passenger with BookingID > after_booking_id. Pass the last
+        booking_id of a page to get the next one; a short page is the last page.
+        """
+        try:
+            return self._get_bookings_page("PassengerID", passenger_id, after_booking_id, limit)
+        except Exception as e:
+            print(f"[Error] Failed to fetch bookings for Passenger ID {passenger_id}: {e}")
+            return []
+
+    def get_bookings_page_by_trip(self, trip_id: int, after_booking_id: int = 0,
+                                  limit: int = 100) -> List[Booking]:
+        """
+        Up to limit bookings of a trip with BookingID > after_booking_id. Pass the last
+        booking_id of a page to get the next one; a short page is the last page.
+        """
+        try:
+            return self._get_bookings_page("TripID", trip_id, after_booking_id, limit)
+        except Exception as e:
+            print(f"[Error] Failed to fetch bookings for Trip ID {trip_id}: {e}")
+            return []
+
     def get_available_drivers(self) -> List[Driver]:
         try:
-            self.cursor.execute("""
-                SELECT DriverID, Name, Age, Gender, LicenseNumber, ContactNumber, Address, Status
-                FROM Drivers
-                WHERE Status = 'Available'
-            """)
-            rows = self.cursor.fetchall()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT DriverID, Name, Age, Gender, LicenseNumber, ContactNumber, Address, Status
+                    FROM Drivers
+                    WHERE Status = 'Available'
+                """)
+                drivers = RowMapper.map_rows(cursor, Driver, cursor.fetchall())
 
-            drivers = [Driver(*row) for row in rows]
             return drivers
 
         except Exception as e:
             print(f"[Error] Failed to fetch available drivers: {e}")
             return []
 
-
-    def auto_update_vehicle_statuses(self) -> None:
+    def get_drivers_available_for(self, departure, arrival) -> List[Driver]:
+        """
+        Drivers with no scheduled trip overlapping [departure, arrival] or its 3-day rest
+        buffer, whatever their current Status. One anti-join, served by the
+        (DriverID, Status, DepartureDate) index on Trips.
+        """
         try:
-            if not self.conn.is_connected():
-                self.conn = DBConnUtil.get_connection("connection_string")
-                self.cursor = self.conn.cursor()
-
-            current_date = datetime.now()
+            if isinstance(departure, str):
+                departure = datetime.strptime(departure, "%Y-%m-%d %H:%M:%S")
+            if isinstance(arrival, str):
+                arrival = datetime.strptime(arrival, "%Y-%m-%d %H:%M:%S")
+            if arrival <= departure:
+                print("Arrival must be after departure.")
+                return []
+
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT D.DriverID, D.Name, D.Age, D.Gender, D.LicenseNumber, D.ContactNumber, D.Address, D.Status
+                    FROM Drivers D
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM Trips T
+                        WHERE T.DriverID = D.DriverID AND T.Status = 'Scheduled'
+                          AND T.DepartureDate <= %s AND T.ArrivalDate >= %s
+                    )
+                    ORDER BY D.DriverID
+                """, (arrival, departure - timedelta(days=3)))
+                return RowMapper.map_rows(cursor, Driver, cursor.fetchall())
 
-            # Step 1: Fetch all vehicles
-            self.cursor.execute("SELECT VehicleID FROM Vehicles")
-            vehicles = self.cursor.fetchall()
+        except Exception as e:
+            print(f"[Error] Failed to fetch drivers available for the window: {e}")
+            return []
 
-            for (vehicle_id,) in vehicles:
-                new_status = "Available"
 
-                # Step 2: Get all non-cancelled scheduled trips for this vehicle
-                self.cursor.execute("""
-                    SELECT DepartureDate, ArrivalDate 
-                    FROM Trips 
-                    WHERE VehicleID = %s AND Status = 'Scheduled'
-                """, (vehicle_id,))
-                trips = self.cursor.fetchall()
-
-                for dep_date, arr_date in trips:
-                    buffer_end = arr_date + timedelta(days=3)
+    def _trip_search_index(self) -> TripSearchIndex:
+        """
+        The search index over upcoming scheduled trips, rebuilt when routes or trips were
+        written through this service or after SEARCH_REFRESH_SECONDS. Bookings made here
+        adjust its seat counts in place.
+        """
+        version = (self.route_version, self.trip_version)
+        index = self.trip_search
+        if index is not None and index.version == version and time.monotonic() - index.built_at < SEARCH_REFRESH_SECONDS:
+            return index
+        with self._trip_search_lock:
+            index = self.trip_search
+            if index is not None and index.version == version and time.monotonic() - index.built_at < SEARCH_REFRESH_SECONDS:
+                return index
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT T.TripID, T.RouteID, R.StartDestination, R.EndDestination,
+                           T.DepartureDate, T.ArrivalDate, T.MaxPassengers, T.SeatsBooked
+                    FROM Trips T
+                    JOIN Routes R ON R.RouteID = T.RouteID
+                    WHERE T.Status = 'Scheduled' AND T.DepartureDate >= %s
+                """, (datetime.now().replace(microsecond=0),))
+                rows = cursor.fetchall()
+            index = TripSearchIndex(rows, version)
+            index.built_at = time.monotonic()
+            self.trip_search = index
+            return index
+
+    def find_trips(self, start: str, end: str, depart_from=None, depart_to=None,
+                   min_free_seats: int = 1, limit: int = 50) -> List[dict]:
+        """
+        Upcoming scheduled trips from start to end departing in [depart_from, depart_to]
+        with at least min_free_seats free, earliest first. Destination names are matched
+        ignoring case and extra spaces. Each result has trip_id, route_id, start, end,
+        departure_date, arrival_date and free_seats.
+        """
+        try:
+            if isinstance(depart_from, str):
+                depart_from = datetime.strptime(depart_from, "%Y-%m-%d %H:%M:%S")
+            if isinstance(depart_to, str):
+                depart_to = datetime.strptime(depart_to, "%Y-%m-%d %H:%M:%S")
+            return self._trip_search_index().find(start, end, depart_from, depart_to,
+                                                  min_free_seats, min(limit, MAX_PAGE_SIZE))
+        except Exception as e:
+            print(f"[Error] Failed to search trips: {e}")
+            return []
 
-                    if dep_date <= current_date <= arr_date:
-                        new_status = "On Trip"
-                        break  # Highest priority
-                    elif arr_date < current_date <= buffer_end:
-                        new_status = "Maintenance"
-                        # Continue checking in case an active trip exists
+    def autocomplete_destinations(self, prefix: str, limit: int = 10) -> List[str]:
+        """Destination names served by upcoming trips that start with prefix, alphabetically."""
+        try:
+            return self._trip_search_index().destinations.complete(prefix, limit)
+        except Exception as e:
+            print(f"[Error] Failed to complete destination names: {e}")
+            return []
 
-                # Step 3: Update vehicle status
-                self.cursor.execute(
-                    "UPDATE Vehicles SET Status = %s WHERE VehicleID = %s",
-                    (new_status, vehicle_id)
-                )
 
-            self.conn.commit()
-            print("[Auto-Update] Vehicle statuses updated successfully.")
+    def _recompute_statuses(self, cursor, table, key_column, rest_status, current_time, resource_id=None) -> int:
+        """
+        Derive every row's status from its scheduled trips in three set-based UPDATEs
+        ("On Trip", rest status, "Available"). Each statement only matches rows whose
+        status actually changes, so the returned count is the number of rows touched.
+        Passing resource_id restricts the recompute to a single vehicle or driver.
+        """
+        buffer_start = current_time - timedelta(days=3)
+        # A scheduled trip that departed by %s and arrives at or after %s
+        overlapping = f"""
+            EXISTS (SELECT 1 FROM Trips T
+                    WHERE T.{key_column} = R.{key_column} AND T.Status = 'Scheduled'
+                      AND T.DepartureDate <= %s AND T.ArrivalDate >= %s)"""
+        resting = f"""
+            EXISTS (SELECT 1 FROM Trips T
+                    WHERE T.{key_column} = R.{key_column} AND T.Status = 'Scheduled'
+                      AND T.ArrivalDate < %s AND T.ArrivalDate >= %s)"""
+        changes = f"UPDATE {table} AS R SET Status = %s WHERE (R.Status IS NULL OR R.Status <> %s)"
+        if resource_id is not None:
+            changes += f" AND R.{key_column} = %s"
+        target = () if resource_id is None else (resource_id,)
+
+        statements = [
+            (f"{changes} AND {overlapping}",
+             ("On Trip", "On Trip", *target, current_time, current_time)),
+            (f"{changes} AND {resting} AND NOT {overlapping}",
+             (rest_status, rest_status, *target, current_time, buffer_start, current_time, current_time)),
+            (f"{changes} AND NOT {overlapping}",
+             ("Available", "Available", *target, current_time, buffer_start)),
+        ]
+
+        rows_updated = 0
+        for query, params in statements:
+            cursor.execute(query, params)
+            rows_updated += max(cursor.rowcount, 0)
+        return rows_updated
+
+    def auto_update_vehicle_statuses(self, current_time=None) -> dict:
+        try:
+            started = time.perf_counter()
+            current_time = (current_time or datetime.now()).replace(microsecond=0)
+
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                rows_updated = self._recompute_statuses(cursor, "Vehicles", "VehicleID", "Maintenance", current_time)
+                conn.commit()
+            if rows_updated:
+                self.entity_cache.invalidate(VEHICLE)
+            if self.metrics is not None:
+                self.metrics.get("tm_status_update_seconds").observe(time.perf_counter() - started, kind="vehicle")
+
+            report = {"rows_updated": rows_updated, "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+            print(f"[Auto-Update] Vehicle statuses updated successfully "
+                  f"({report['rows_updated']} changed in {report['elapsed_ms']} ms).")
+            return report
 
         except Exception as e:
             print(f"[Auto-Update] Error auto-updating vehicle statuses: {e}")
+            return {"rows_updated": 0, "elapsed_ms": None}
 
-    def auto_update_driver_statuses(self) -> None:
+    def auto_update_driver_statuses(self, current_time=None) -> dict:
         try:
-            if not self.conn.is_connected():
-                self.conn = DBConnUtil.get_connection("connection_string")
-                self.cursor = self.conn.cursor()
-
-            current_time = datetime.now()
-
-            # Fetch all drivers
-            self.cursor.execute("SELECT DriverID FROM Drivers")
-            drivers = self.cursor.fetchall()
-
-            for (driver_id,) in drivers:
-                new_status = "Available"
-
-                # Get all non-cancelled scheduled trips for this driver
-                self.cursor.execute("""
-                    SELECT DepartureDate, ArrivalDate
-                    FROM Trips
-                    WHERE DriverID = %s AND Status = 'Scheduled'
-                """, (driver_id,))
-                trips = self.cursor.fetchall()
-
-                for dep_date, arr_date in trips:
-                    rest_buffer = arr_date + timedelta(days=3)
-
-                    if dep_date <= current_time <= arr_date:
-                        new_status = "On Trip"
-                        break  # Priority
-                    elif arr_date < current_time <= rest_buffer:
-                        new_status = "Resting"
-                        # Continue checking if a new trip overrides this status
-
-                # Update driver status
-                self.cursor.execute(
-                    "UPDATE Drivers SET Status = %s WHERE DriverID = %s",
-                    (new_status, driver_id)
-                )
-
-            self.conn.commit()
-            print("[Driver Auto-Update] Driver statuses updated successfully.")
+            started = time.perf_counter()
+            current_time = (current_time or datetime.now()).replace(microsecond=0)
+
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                rows_updated = self._recompute_statuses(cursor, "Drivers", "DriverID", "Resting", current_time)
+                conn.commit()
+            if rows_updated:
+                self.entity_cache.invalidate(DRIVER)
+            if self.metrics is not None:
+                self.metrics.get("tm_status_update_seconds").observe(time.perf_counter() - started, kind="driver")
+
+            report = {"rows_updated": rows_updated, "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+            print(f"[Driver Auto-Update] Driver statuses updated successfully "
+                  f"({report['rows_updated']} changed in {report['elapsed_ms']} ms).")
+            return report
         except Exception as e:
             print(f"[Driver Auto-Update] Error: {e}")
-
-
-    def start_auto_status_updater(self):
-        """Start background thread to update vehicle status every 5 minutes."""
-        def update_and_reschedule():
-            self.auto_update_vehicle_statuses()
-            self.auto_update_driver_statuses()
-            threading.Timer(300, update_and_reschedule).start()  # 300 seconds = 5 minutes
-
-        update_and_reschedule()  # initial call
\ No newline at end of file
+            return {"rows_updated": 0, "elapsed_ms": None}
+
+
+    def refresh_resource_status(self, kind: str, resource_id: int, current_time=None) -> int:
+        """Recompute the status of a single vehicle or driver; returns 1 if it changed."""
+        current_time = (current_time or datetime.now()).replace(microsecond=0)
+        if kind == VEHICLE:
+            table, key_column, rest_status = "Vehicles", "VehicleID", "Maintenance"
+        else:
+            table, key_column, rest_status = "Drivers", "DriverID", "Resting"
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            rows_updated = self._recompute_statuses(cursor, table, key_column, rest_status,
+                                                    current_time, resource_id)
+            conn.commit()
+        if rows_updated:
+            self.entity_cache.invalidate(kind, resource_id)
+        return rows_updated
+
+    def start_auto_status_updater(self, resync_interval=None):
+        """
+        Bring all statuses up to date, then start a background scheduler that applies
+        each trip's status transitions exactly when they are due.
+        """
+        if self.status_scheduler is None:
+            self.status_scheduler = StatusTransitionScheduler(self, resync_interval=resync_interval)
+            self.status_scheduler.start()
+        return self.status_scheduler
+
+    def stop_auto_status_updater(self):
+        if self.status_scheduler is not None:
+            self.status_scheduler.stop()
+            self.status_scheduler = None
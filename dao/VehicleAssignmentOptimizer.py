@@ -0,0 +1,129 @@
+'''
+This file defines the VehicleAssignmentOptimizer class, which picks a vehicle for each
+trip request (route, departure, arrival, seats needed) instead of leaving the choice
+to the caller.
+
+Requests are handled largest seat demand first (best-fit decreasing). For each request
+the vehicles big enough for it are tried from the smallest capacity upwards, and the
+first one that is free for the window plus its rest buffer wins, so every assignment
+wastes as few seats as possible. Availability comes from an in-memory IntervalIndex
+per vehicle, built with one query and updated as the plan grows, so a request costs a
+bisect over capacities plus a bisect per vehicle tried.
+
+A planned trip keeps the full 3-day rest buffer on both sides of every other trip of
+the vehicle. That is stricter than schedule_trip, so commit() can hand the plan to
+schedule_trips_bulk, which re-checks it and inserts it in batches.
+'''
+
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from util.IntervalIndex import IntervalIndex
+
+REST_BUFFER = timedelta(days=3)
+
+
+class VehicleAssignmentOptimizer:
+    def __init__(self, service, rest_buffer=REST_BUFFER):
+        self.service = service
+        self.rest_buffer = rest_buffer
+
+    @staticmethod
+    def _normalize(index, request):
+        if isinstance(request, dict):
+            route_id, seats = request.get("route_id"), request.get("seats")
+            departure, arrival = request.get("departure_date"), request.get("arrival_date")
+            vehicle_type = request.get("vehicle_type")
+        else:
+            route_id, departure, arrival, seats = request[:4]
+            vehicle_type = request[4] if len(request) > 4 else None
+        if isinstance(departure, str):
+            departure = datetime.strptime(departure, "%Y-%m-%d %H:%M:%S")
+        if isinstance(arrival, str):
+            arrival = datetime.strptime(arrival, "%Y-%m-%d %H:%M:%S")
+        return {"index": index, "route_id": route_id, "departure_date": departure.replace(microsecond=0),
+                "arrival_date": arrival.replace(microsecond=0), "seats": int(seats),
+                "vehicle_type": vehicle_type}
+
+    def _load(self, first_departure, last_arrival):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT VehicleID, Capacity, Type FROM Vehicles WHERE Capacity IS NOT NULL")
+            vehicles = [(float(capacity), vehicle_id, vehicle_type)
+                        for vehicle_id, capacity, vehicle_type in cursor.fetchall()]
+            cursor.execute("""
+                SELECT VehicleID, TripID, DepartureDate, ArrivalDate
+                FROM Trips
+                WHERE Status = 'Scheduled' AND VehicleID IS NOT NULL
+                  AND ArrivalDate >= %s AND DepartureDate <= %s
+            """, (first_departure - self.rest_buffer, last_arrival + self.rest_buffer))
+            trips = cursor.fetchall()
+
+        availability = {vehicle_id: IntervalIndex(self.rest_buffer) for _, vehicle_id, _ in vehicles}
+        for vehicle_id, trip_id, departure, arrival in trips:
+            if vehicle_id in availability:
+                availability[vehicle_id].add(trip_id, departure, arrival)
+        vehicles.sort()
+        return vehicles, availability
+
+    def optimize(self, requests) -> dict:
+        """
+        Build a plan for requests: a sequence of dicts with route_id, departure_date,
+        arrival_date, seats and optional vehicle_type (or tuples in that order). Returns
+        {"assignments": [...], "unassigned": [...], "wasted_seats", "elapsed_ms"}; each
+        assignment carries the request index, the chosen vehicle and its spare seats.
+        """
+        started = time.perf_counter()
+        plan = {"assignments": [], "unassigned": [], "wasted_seats": 0, "elapsed_ms": None}
+        valid = []
+        for index, request in enumerate(requests):
+            try:
+                normalized = self._normalize(index, request)
+            except (TypeError, ValueError, AttributeError) as e:
+                plan["unassigned"].append({"index": index, "reason": f"Invalid request: {e}"})
+                continue
+            if normalized["arrival_date"] <= normalized["departure_date"] or normalized["seats"] <= 0:
+                plan["unassigned"].append({"index": index, "reason": "Arrival must be after departure and seats above 0."})
+                continue
+            valid.append(normalized)
+
+        if valid:
+            vehicles, availability = self._load(min(r["departure_date"] for r in valid),
+                                                max(r["arrival_date"] for r in valid))
+            capacities = [capacity for capacity, _, _ in vehicles]
+            for request in sorted(valid, key=lambda r: (-r["seats"], r["departure_date"], r["index"])):
+                departure, arrival = request["departure_date"], request["arrival_date"]
+                chosen = None
+                for capacity, vehicle_id, vehicle_type in vehicles[bisect_left(capacities, request["seats"]):]:
+                    if request["vehicle_type"] and str(vehicle_type).lower() != str(request["vehicle_type"]).lower():
+                        continue
+                    # Passing arrival + rest as the window end keeps the rest buffer after this trip too
+                    if availability[vehicle_id].find_conflict(departure, arrival + self.rest_buffer) is None:
+                        chosen = (capacity, vehicle_id)
+                        break
+                if chosen is None:
+                    plan["unassigned"].append({"index": request["index"],
+                                               "reason": "No vehicle with enough seats is free for this window."})
+                    continue
+                capacity, vehicle_id = chosen
+                availability[vehicle_id].add(-(request["index"] + 1), departure, arrival)
+                wasted = capacity - request["seats"]
+                plan["wasted_seats"] += wasted
+                plan["assignments"].append({
+                    "index": request["index"], "vehicle_id": vehicle_id, "route_id": request["route_id"],
+                    "departure_date": departure, "arrival_date": arrival,
+                    "seats": request["seats"], "capacity": capacity, "wasted_seats": wasted
+                })
+
+        plan["assignments"].sort(key=lambda assignment: assignment["index"])
+        plan["unassigned"].sort(key=lambda rejection: rejection["index"])
+        plan["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return plan
+
+    def commit(self, plan) -> dict:
+        """Schedule every planned assignment with schedule_trips_bulk; returns its result."""
+        return self.service.schedule_trips_bulk([
+            (assignment["vehicle_id"], assignment["route_id"],
+             assignment["departure_date"], assignment["arrival_date"])
+            for assignment in plan["assignments"]
+        ])
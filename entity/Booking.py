@@ -1,9 +1,15 @@
 '''
 This file defines the Booking class (Constructor), which represents a booking in the transport management system.
 It includes attributes such as booking ID, trip ID, passenger ID, booking date, and status.
+Entities use __slots__ so large result sets carry no per-object __dict__; COLUMNS maps
+each constructor argument to its database column for util/RowMapper.py.
 '''
 
 class Booking:
+    __slots__ = ("booking_id", "trip_id", "passenger_id", "booking_date", "status")
+
+    COLUMNS = ("BookingID", "TripID", "PassengerID", "BookingDate", "Status")
+
     def __init__(self, booking_id, trip_id, passenger_id, booking_date, status):
         self.booking_id = booking_id
         self.trip_id = trip_id
@@ -16,4 +22,4 @@ class Booking:
                 f"PassengerID: {self.passenger_id}, "
                 f"TripID: {self.trip_id}, "
                 f"BookingDate: {self.booking_date}, "
-                f"Status: {self.status}")
\ No newline at end of file
+                f"Status: {self.status}")
@@ -4,6 +4,12 @@ a driver in the transport management system.
 '''
 
 class Driver:
+    __slots__ = ("driver_id", "name", "age", "gender", "license_number",
+                 "contact_number", "address", "status")
+
+    COLUMNS = ("DriverID", "Name", "Age", "Gender", "LicenseNumber",
+               "ContactNumber", "Address", "Status")
+
     def __init__(self, driver_id=None, name=None, age=None, gender=None,
                  license_number=None, contact_number=None, address=None, status=None):
         self.driver_id = driver_id
@@ -4,10 +4,14 @@ represents a passenger in the transport management system.
 '''
 
 class Passenger:
+    __slots__ = ("passenger_id", "first_name", "gender", "age", "email", "phone_number")
+
+    COLUMNS = ("PassengerID", "FirstName", "Gender", "Age", "Email", "PhoneNumber")
+
     def __init__(self, passenger_id, first_name, gender, age, email, phone_number):
         self.passenger_id = passenger_id
         self.first_name = first_name
         self.gender = gender
         self.age = age
         self.email = email
-        self.phone_number = phone_number
\ No newline at end of file
+        self.phone_number = phone_number
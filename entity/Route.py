@@ -4,8 +4,12 @@ represents a route in the transport management system.
 '''
 
 class Route:
+    __slots__ = ("route_id", "start_destination", "end_destination", "distance")
+
+    COLUMNS = ("RouteID", "StartDestination", "EndDestination", "Distance")
+
     def __init__(self, route_id, start_destination, end_destination, distance):
         self.route_id = route_id
         self.start_destination = start_destination
         self.end_destination = end_destination
-        self.distance = distance
\ No newline at end of file
+        self.distance = distance
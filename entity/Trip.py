@@ -4,8 +4,14 @@ a trip in the transport management system.
 '''
 
 class Trip:
+    __slots__ = ("trip_id", "vehicle_id", "route_id", "departure_date", "arrival_date",
+                 "status", "trip_type", "max_passengers", "driver_id", "seats_booked")
+
+    COLUMNS = ("TripID", "VehicleID", "RouteID", "DepartureDate", "ArrivalDate",
+               "Status", "TripType", "MaxPassengers", "DriverID", "SeatsBooked")
+
     def __init__(self, trip_id, vehicle_id, route_id, departure_date, arrival_date, 
-                 status, trip_type, max_passengers):
+                 status, trip_type, max_passengers, driver_id=None, seats_booked=0):
         self.trip_id = trip_id
         self.vehicle_id = vehicle_id
         self.route_id = route_id
@@ -13,4 +19,6 @@ class Trip:
         self.arrival_date = arrival_date
         self.status = status
         self.trip_type = trip_type
-        self.max_passengers = max_passengers
\ No newline at end of file
+        self.max_passengers = max_passengers
+        self.driver_id = driver_id
+        self.seats_booked = seats_booked
@@ -0,0 +1,27 @@
+'''
+Similar to Booking.py, this file defines the TripTemplate class (Constructor), which
+represents a recurring trip (same vehicle, route and departure time on a repeating
+schedule) that is expanded into Trips rows ahead of the booking window.
+'''
+
+class TripTemplate:
+    __slots__ = ("template_id", "vehicle_id", "route_id", "departure_time", "duration_minutes",
+                 "recurrence", "start_date", "end_date", "horizon_days", "expanded_until", "status")
+
+    COLUMNS = ("TemplateID", "VehicleID", "RouteID", "DepartureTime", "DurationMinutes",
+               "Recurrence", "StartDate", "EndDate", "HorizonDays", "ExpandedUntil", "Status")
+
+    def __init__(self, template_id, vehicle_id, route_id, departure_time, duration_minutes,
+                 recurrence, start_date, end_date=None, horizon_days=14, expanded_until=None,
+                 status="Active"):
+        self.template_id = template_id
+        self.vehicle_id = vehicle_id
+        self.route_id = route_id
+        self.departure_time = departure_time
+        self.duration_minutes = duration_minutes
+        self.recurrence = recurrence
+        self.start_date = start_date
+        self.end_date = end_date
+        self.horizon_days = horizon_days
+        self.expanded_until = expanded_until
+        self.status = status
@@ -54,3 +54,22 @@ class InvalidVehicleStatusException(Exception):
     def __init__(self, message="Invalid vehicle status. Must be one of: Available, On Trip, Maintenance."):
         super().__init__(message)
 
+class DatabaseConnectionException(Exception):
+    def __init__(self, message="Unable to establish a connection to the database."):
+        self.message = message
+        super().__init__(self.message)
+
+class ConnectionPoolExhaustedException(Exception):
+    def __init__(self, message="No database connection is available in the pool."):
+        self.message = message
+        super().__init__(self.message)
+
+class InvalidRouteDataException(Exception):
+    def __init__(self, message="Invalid or missing route data. Start, end and distance are required."):
+        self.message = message
+        super().__init__(self.message)
+
+class QueryBudgetExceededException(AssertionError):
+    def __init__(self, message="A call issued more SQL statements than its query budget allows."):
+        self.message = message
+        super().__init__(self.message)
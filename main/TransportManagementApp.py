@@ -1,5 +1,16 @@
-from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+import argparse
+import os
+import sys
+from datetime import datetime
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl, BOOKED
+from dao.BulkImporter import BulkImporter, IMPORT_SPECS
+from dao.RecurringTripPlanner import RecurringTripPlanner
+from dao.DriverRosterAllocator import DriverRosterAllocator
+from dao.RouteNetwork import RouteNetwork
+from dao.ScriptRunner import ScriptRunner
 from entity.Vehicle import Vehicle
+from util.MetricsRegistry import MetricsRegistry
+from util.QueryInstrumentation import QueryInstrumentation
 from exception.CustomExceptions import (
     VehicleNotFoundException,
     BookingNotFoundException,
@@ -13,8 +24,24 @@ from exception.CustomExceptions import (
 
 class TransportManagementApp:
     def __init__(self):
-        self.service = TransportManagementServiceImpl()
-        self.service.start_auto_status_updater()  # Starts background auto-update every 5 mins
+        # TM_SLOW_QUERY_MS=<ms> logs statements at least that slow to slow_queries.log
+        slow_query_ms = os.environ.get("TM_SLOW_QUERY_MS")
+        instrumentation = QueryInstrumentation(float(slow_query_ms)) if slow_query_ms else None
+        # TM_METRICS_PORT=<port> serves Prometheus metrics on http://127.0.0.1:<port>/metrics;
+        # TM_METRICS_SNAPSHOT=<file> rewrites a JSON snapshot every TM_METRICS_INTERVAL seconds
+        metrics_port = os.environ.get("TM_METRICS_PORT")
+        metrics_snapshot = os.environ.get("TM_METRICS_SNAPSHOT")
+        self.metrics = MetricsRegistry() if metrics_port or metrics_snapshot else None
+        self.service = TransportManagementServiceImpl(instrumentation=instrumentation, metrics=self.metrics)
+        if metrics_port:
+            self.metrics.serve(int(metrics_port))
+            print(f"Metrics available at http://127.0.0.1:{metrics_port}/metrics")
+        if metrics_snapshot:
+            self.metrics.start_snapshots(metrics_snapshot, float(os.environ.get("TM_METRICS_INTERVAL", "60")))
+        self.service.start_auto_status_updater()  # Applies vehicle/driver status transitions as they fall due
+        self.planner = RecurringTripPlanner(self.service)
+        self.network = RouteNetwork(self.service)
+        self.expand_recurring_trips(quiet=True)  # Roll recurring templates forward to their horizon
 
     def main_menu(self):
         while True:
@@ -31,6 +58,13 @@ class TransportManagementApp:
             print("10. Get Bookings by Passenger")
             print("11. Get Bookings by Trip")
             print("12. Get Available Drivers")
+            print("13. Find Drivers Available for a Time Window")
+            print("14. Bulk Import from CSV/JSONL")
+            print("15. Add Recurring Trip Template")
+            print("16. Expand Recurring Trips Now")
+            print("17. Auto-Allocate Drivers for a Period")
+            print("18. Plan a Journey")
+            print("19. Search Trips")
             print("0. Exit")
 
             choice = input("Enter your choice: ")
@@ -60,8 +94,24 @@ class TransportManagementApp:
                     self.get_bookings_by_trip_menu()
                 elif choice == "12":
                     self.get_available_drivers_menu()
+                elif choice == "13":
+                    self.get_drivers_available_for_menu()
+                elif choice == "14":
+                    self.bulk_import_menu()
+                elif choice == "15":
+                    self.add_trip_template_menu()
+                elif choice == "16":
+                    self.expand_recurring_trips()
+                elif choice == "17":
+                    self.allocate_roster_menu()
+                elif choice == "18":
+                    self.plan_journey_menu()
+                elif choice == "19":
+                    self.search_trips_menu()
                 elif choice == "0":
                     print("Exiting application. Goodbye!")
+                    if self.metrics is not None:
+                        self.metrics.stop()
                     break
                 else:
                     print("Invalid choice. Please try again.")
@@ -166,10 +216,25 @@ class TransportManagementApp:
             except ValueError:
                 raise InvalidBookingDataException("Trip ID and number of people must be integers.")
 
-            # Continue with booking logic...
-            # (You may want to validate passenger IDs similarly)
-            result = self.service.book_trip()
-            if result:
+            passenger_ids = []
+            for i in range(num_people):
+                try:
+                    passenger_ids.append(int(input(f"Enter Passenger ID for person {i+1}: ").strip()))
+                except ValueError:
+                    raise InvalidBookingDataException("Passenger IDs must be integers.")
+
+            from_stop = to_stop = None
+            legs = self.service.get_trip_legs(trip_id)
+            if legs:
+                stops = [legs[0]["from_stop"]] + [leg["to_stop"] for leg in legs]
+                print(f"This trip stops at: {', '.join(stops)}")
+                from_stop = input("Boarding stop (blank for the first): ").strip() or None
+                to_stop = input("Alighting stop (blank for the last): ").strip() or None
+
+            results = self.service.book_trip_batch(trip_id, passenger_ids, datetime.now(), from_stop, to_stop)
+            for passenger_id, outcome in results.items():
+                print(f"Passenger ID {passenger_id}: {outcome}")
+            if BOOKED in results.values():
                 print("Booking successful!")
             else:
                 print("Booking failed.")
@@ -235,12 +300,14 @@ class TransportManagementApp:
     def get_bookings_by_passenger_menu(self):
         try:
             passenger_id = int(input("Enter Passenger ID: "))
-            bookings = self.service.get_bookings_by_passenger(passenger_id)
-            if bookings:
-                print(f"Bookings for Passenger ID {passenger_id}:")
-                for booking in bookings:
-                    print(booking)
-            else:
+            # Streamed so very large booking lists are printed without being loaded at once
+            count = 0
+            for booking in self.service.iter_bookings_by_passenger(passenger_id):
+                if count == 0:
+                    print(f"Bookings for Passenger ID {passenger_id}:")
+                print(booking)
+                count += 1
+            if count == 0:
                 print(f"No bookings found for Passenger ID {passenger_id}.")
         except ValueError:
             print("❌ Invalid input. Please enter a numeric value for Passenger ID.")
@@ -250,12 +317,14 @@ class TransportManagementApp:
     def get_bookings_by_trip_menu(self):
         try:
             trip_id = int(input("Enter Trip ID: "))
-            bookings = self.service.get_bookings_by_trip(trip_id)
-            if bookings:
-                print(f"Bookings for Trip ID {trip_id}:")
-                for booking in bookings:
-                    print(booking)
-            else:
+            # Streamed so very large booking lists are printed without being loaded at once
+            count = 0
+            for booking in self.service.iter_bookings_by_trip(trip_id):
+                if count == 0:
+                    print(f"Bookings for Trip ID {trip_id}:")
+                print(booking)
+                count += 1
+            if count == 0:
                 print(f"No bookings found for Trip ID {trip_id}.")
         except ValueError:
             print("❌ Invalid input. Please enter a numeric value for Trip ID.")
@@ -274,8 +343,158 @@ class TransportManagementApp:
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
 
+    def get_drivers_available_for_menu(self):
+        try:
+            departure = input("Enter departure date (YYYY-MM-DD HH:MM:SS): ").strip()
+            arrival = input("Enter arrival date (YYYY-MM-DD HH:MM:SS): ").strip()
+            drivers = self.service.get_drivers_available_for(departure, arrival)
+            if drivers:
+                print(f"Drivers available between {departure} and {arrival}:")
+                for driver in drivers:
+                    print(driver)
+            else:
+                print("No drivers are free for that window.")
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+
+    def bulk_import_menu(self):
+        try:
+            kind = input(f"What to import ({'/'.join(IMPORT_SPECS)}): ").strip().lower()
+            path = input("Enter file path (.csv or .jsonl): ").strip()
+            summary = BulkImporter(self.service).import_file(kind, path)
+            print(f"Read {summary['rows_read']} rows: {summary['inserted']} imported, "
+                  f"{summary['rejected']} rejected in {summary['elapsed_ms']} ms.")
+            if summary["error_report"]:
+                print(f"Rejected rows and reasons were written to {summary['error_report']}")
+        except (ValueError, OSError) as e:
+            print(f"❌ Import failed: {e}")
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+
+    def add_trip_template_menu(self):
+        try:
+            vehicle_id = int(input("Enter Vehicle ID: "))
+            route_id = int(input("Enter Route ID: "))
+            departure_time = input("Enter departure time (HH:MM): ").strip()
+            duration = int(input("Enter trip duration in minutes: "))
+            recurrence = input("Enter recurrence (DAILY / WEEKDAYS / WEEKENDS / WEEKLY:MON,WED): ").strip()
+            start_date = input("Enter first date (YYYY-MM-DD): ").strip()
+            end_date = input("Enter last date (YYYY-MM-DD, blank for no end): ").strip() or None
+            horizon = input("Schedule how many days ahead? (default 14): ").strip() or 14
+            template_id = self.planner.add_template(vehicle_id, route_id, departure_time, duration,
+                                                    recurrence, start_date, end_date, int(horizon))
+            print(f"Recurring template {template_id} created.")
+            self.expand_recurring_trips()
+        except ValueError:
+            print("❌ Invalid input. IDs, duration and horizon must be numbers; dates use YYYY-MM-DD.")
+        except InvalidTripDataException as e:
+            print(f"❌ {e}")
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+
+    def expand_recurring_trips(self, quiet=False):
+        try:
+            summary = self.planner.expand()
+            if summary["templates"] or not quiet:
+                print(f"Recurring trips: {summary['created']} scheduled from {summary['templates']} template(s), "
+                      f"{len(summary['rejected'])} skipped due to conflicts.")
+                for rejection in summary["rejected"][:10]:
+                    print(f"  Template {rejection['template_id']} at {rejection['departure_date']}: {rejection['reason']}")
+        except Exception as e:
+            print(f"❌ Could not expand recurring trips: {e}")
+
+    def allocate_roster_menu(self):
+        try:
+            start = datetime.strptime(input("Allocate trips departing from (YYYY-MM-DD): ").strip(), "%Y-%m-%d")
+            end = datetime.strptime(input("Up to, not including (YYYY-MM-DD): ").strip(), "%Y-%m-%d")
+            summary = DriverRosterAllocator(self.service).allocate(start, end)
+            print(f"{len(summary['assigned'])} trip(s) staffed, {len(summary['unstaffed'])} could not be staffed "
+                  f"({summary['elapsed_ms']} ms).")
+            for trip in summary["unstaffed"]:
+                print(f"  Trip ID {trip['trip_id']} departing {trip['departure_date']}: {trip['reason']}")
+        except ValueError:
+            print("❌ Invalid date format. Please use YYYY-MM-DD.")
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+
+    def plan_journey_menu(self):
+        try:
+            origin = input("From: ").strip()
+            destination = input("To: ").strip()
+            departure = input("Earliest departure (YYYY-MM-DD HH:MM:SS, blank for now): ").strip()
+            departure = datetime.strptime(departure, "%Y-%m-%d %H:%M:%S") if departure else datetime.now()
+            path = self.network.shortest_path(origin, destination)
+            if path is None:
+                print(f"No route connects {origin} to {destination}.")
+                return
+            print(f"Shortest route: {' -> '.join(path['stops'])}, distance {path['distance']}")
+            journey = self.network.plan_journey(origin, destination, departure)
+            if journey is None:
+                print("No scheduled trips make this journey in the next two weeks.")
+                return
+            for leg in journey["legs"]:
+                print(f"  Trip ID {leg['trip_id']}: {leg['from']} {leg['departure_date']} -> "
+                      f"{leg['to']} {leg['arrival_date']}")
+        except ValueError:
+            print("❌ Invalid date format. Please use YYYY-MM-DD HH:MM:SS.")
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+
+    def complete_destination(self, label):
+        text = input(label).strip()
+        matches = self.service.autocomplete_destinations(text)
+        if text and len(matches) == 1:
+            return matches[0]
+        if len(matches) > 1 and text.lower() not in (match.lower() for match in matches):
+            print(f"  Did you mean: {', '.join(matches)}")
+            return input(label).strip()
+        return text
+
+    def search_trips_menu(self):
+        try:
+            start = self.complete_destination("From: ")
+            end = self.complete_destination("To: ")
+            depart_from = datetime.strptime(input("Departing on or after (YYYY-MM-DD): ").strip(), "%Y-%m-%d")
+            depart_to = datetime.strptime(input("Departing on or before (YYYY-MM-DD): ").strip(), "%Y-%m-%d")
+            seats = int(input("Seats needed: ").strip() or 1)
+            trips = self.service.find_trips(start, end, depart_from, depart_to.replace(hour=23, minute=59, second=59), seats)
+            if not trips:
+                print("No matching trips found.")
+            for trip in trips:
+                print(f"  Trip ID {trip['trip_id']}: {trip['start']} {trip['departure_date']} -> "
+                      f"{trip['end']} {trip['arrival_date']}, {trip['free_seats']} seat(s) free")
+        except ValueError:
+            print("❌ Invalid input. Dates use YYYY-MM-DD and seats must be a number.")
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+
     
 
+def run_script(argv):
+    """Batch mode: apply a JSONL/CSV script of operations without prompts (see dao.ScriptRunner)."""
+    parser = argparse.ArgumentParser(description="Run a script of operations without the menu.")
+    parser.add_argument("--script", required=True, help="JSONL or CSV file of operations")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="script format (default: from the extension)")
+    parser.add_argument("--db", help="connection string (default: TM_DB_URL / db.properties)")
+    parser.add_argument("--workers", type=int, default=8, help="operations applied in parallel")
+    parser.add_argument("--output", help="write the JSON result stream here instead of stdout")
+    parser.add_argument("--log", help="write the service's messages here instead of stderr")
+    args = parser.parse_args(argv)
+
+    service = TransportManagementServiceImpl(args.db, interactive=False)
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    log = open(args.log, "a", encoding="utf-8") if args.log else None
+    try:
+        summary = ScriptRunner(service, workers=args.workers).run(args.script, output, args.format, log)
+    finally:
+        for handle in (output, log):
+            if handle is not None:
+                handle.close()
+    return 0 if summary["failed"] == 0 else 1
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_script(sys.argv[1:]))
     app = TransportManagementApp()
     app.main_menu()
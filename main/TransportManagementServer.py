@@ -0,0 +1,467 @@
+'''
+This file defines the TransportManagementServer class, a headless HTTP/JSON front end
+for ITransportManagementService, so clients and load generators can drive the system
+without the menu.
+
+Requests are handled by a fixed pool of worker threads (WorkerPoolHTTPServer) rather
+than one thread per connection. The service is created with interactive=False, so no
+call ever waits on stdin, and every service call borrows its own connection from the
+shared pool, which is sized to the number of workers.
+
+Endpoints (bodies and responses are JSON; dates use YYYY-MM-DD HH:MM:SS):
+
+    GET    /health
+    POST   /vehicles                      {model, capacity, type, status}
+    PUT    /vehicles/<id>                 {model?, capacity?, type?}
+    DELETE /vehicles/<id>
+    POST   /trips                         {vehicle_id, route_id, departure_date, arrival_date}
+    POST   /trips/bulk                    {trips: [{vehicle_id, route_id, departure_date, arrival_date}]}
+    DELETE /trips/<id>
+    GET    /trips/search?start=&end=[&depart_from=&depart_to=&min_free_seats=&limit=]
+    GET    /trips/<id>/legs
+    GET    /trips/<id>/seats[?from_stop=&to_stop=]
+    GET    /trips/<id>/bookings[?after=&limit=]
+    POST   /trips/<id>/bookings           {passenger_id | passenger_ids, booking_date?, from_stop?, to_stop?}
+    PUT    /trips/<id>/driver             {driver_id}
+    DELETE /trips/<id>/driver
+    DELETE /bookings/<id>
+    GET    /passengers/<id>/bookings[?after=&limit=]
+    GET    /drivers/available[?departure=&arrival=]
+    GET    /destinations?prefix=[&limit=]
+
+A service call returning False answers 409 with {"ok": false, "reason"}, the reason
+being the last message the service printed for that request. Missing vehicles, trips,
+routes and bookings answer 404. Malformed requests (missing fields, bad IDs, dates,
+capacities, statuses or Content-Length) answer 400 with {"error"}.
+
+Usage (from the repository root):
+    python -m main.TransportManagementServer --db sqlite:///transport.db --port 8080 --workers 32
+'''
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from entity.Vehicle import Vehicle
+from exception.CustomExceptions import (
+    VehicleNotFoundException,
+    BookingNotFoundException,
+    TripNotFoundException,
+    RouteNotFoundException,
+    InvalidVehicleDataException,
+    InvalidTripDataException,
+    InvalidVehicleStatusException
+)
+from util.DBConnUtil import DBConnUtil
+from util.EntityValidator import EntityValidator
+
+DEFAULT_WORKERS = 16
+# An idle keep-alive connection holds a worker thread, so it is closed after this many
+# seconds: long enough for a client issuing back-to-back requests, short enough that
+# idle clients cannot tie up the pool
+KEEP_ALIVE_TIMEOUT = 2
+MAX_BODY_BYTES = 10 * 1024 * 1024
+# Accepted connections allowed to wait for a worker, per worker
+PENDING_PER_WORKER = 1
+
+NOT_FOUND_ERRORS = (VehicleNotFoundException, BookingNotFoundException, TripNotFoundException, RouteNotFoundException)
+BAD_REQUEST_ERRORS = (InvalidVehicleDataException, InvalidTripDataException, InvalidVehicleStatusException)
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class BadRequest(Exception):
+    pass
+
+
+def to_json(value):
+    """json.dumps default: entities by their slots, dates as text."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(type(value), "__slots__"):
+        return {slot: getattr(value, slot) for slot in type(value).__slots__}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"{name} must be an integer.")
+
+
+def _date(value, name):
+    """Check a YYYY-MM-DD HH:MM:SS field; None (absent) passes through."""
+    if value is None or value == "":
+        return None
+    try:
+        datetime.strptime(str(value), DATE_FORMAT)
+    except ValueError:
+        raise BadRequest(f"{name} must use YYYY-MM-DD HH:MM:SS.")
+    return str(value)
+
+
+def _capacity(value):
+    try:
+        capacity = float(value)
+    except (TypeError, ValueError):
+        raise BadRequest("capacity must be a number.")
+    if capacity <= 0:
+        raise BadRequest("capacity must be greater than 0.")
+    return value
+
+
+def _required(body, *names):
+    missing = [name for name in names if body.get(name) in (None, "")]
+    if missing:
+        raise BadRequest(f"Missing field(s): {', '.join(missing)}.")
+    return [body[name] for name in names]
+
+
+def _stop(value):
+    """Stops are names or positions; query strings carry both as text."""
+    if value is None or isinstance(value, int):
+        return value
+    return int(value) if str(value).isdigit() else value
+
+
+class ServiceMessages:
+    """
+    Stand-in for sys.stdout that passes everything through and, inside capture(), also
+    records what the current thread prints: the service reports why it refused a call
+    with print(), and that reason belongs in the 409 response.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        lines = getattr(self._local, "lines", None)
+        if lines is not None:
+            lines.append(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    @contextmanager
+    def capture(self):
+        self._local.lines = lines = []
+        try:
+            yield lines
+        finally:
+            self._local.lines = None
+
+    @staticmethod
+    def last(lines):
+        text = "".join(lines).strip()
+        return text.splitlines()[-1].strip() if text else None
+
+
+class WorkerPoolHTTPServer(HTTPServer):
+    """HTTPServer that hands each accepted connection to a fixed pool of worker threads."""
+
+    def __init__(self, address, handler, workers=DEFAULT_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tm-http")
+        # At most this many accepted connections are in process at once (being served or
+        # waiting for a worker). Beyond that the accept loop blocks, so further connections
+        # wait in the kernel's listen backlog instead of piling up as open sockets here.
+        self._slots = threading.BoundedSemaphore(workers * (1 + PENDING_PER_WORKER))
+        self.request_queue_size = max(128, workers * 4)
+        super().__init__(address, handler)
+
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        try:
+            self.executor.submit(self._process, request, client_address)
+        except RuntimeError:  # executor already shut down
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+class TransportManagementServer:
+    def __init__(self, connection_string=None, host="127.0.0.1", port=8080, workers=DEFAULT_WORKERS,
+                 service=None):
+        """
+        connection_string: backend URL or property file (see DBConnUtil); ignored when service is given.
+        workers: request worker threads; the connection pool is sized to match.
+        service: an existing non-interactive service to expose instead of creating one.
+        """
+        if service is None:
+            # Create the shared pool at the worker count before the service asks for it
+            DBConnUtil.get_pool(connection_string, max_size=workers)
+            service = TransportManagementServiceImpl(connection_string, interactive=False)
+        self.service = service
+        self.routes = self._build_routes()
+        self.messages = ServiceMessages(sys.stdout)
+        sys.stdout = self.messages
+        self.httpd = WorkerPoolHTTPServer((host, port), self._handler_class(), workers)
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if sys.stdout is self.messages:
+            sys.stdout = self.messages.stream
+
+    # ---- routing ----------------------------------------------------------
+
+    def _build_routes(self):
+        table = [
+            ("GET", r"/health", self.health),
+            ("POST", r"/vehicles", self.add_vehicle),
+            ("PUT", r"/vehicles/(\d+)", self.update_vehicle),
+            ("DELETE", r"/vehicles/(\d+)", self.delete_vehicle),
+            ("POST", r"/trips", self.schedule_trip),
+            ("POST", r"/trips/bulk", self.schedule_trips_bulk),
+            ("GET", r"/trips/search", self.find_trips),
+            ("DELETE", r"/trips/(\d+)", self.cancel_trip),
+            ("GET", r"/trips/(\d+)/legs", self.get_trip_legs),
+            ("GET", r"/trips/(\d+)/seats", self.seats_available),
+            ("GET", r"/trips/(\d+)/bookings", self.get_bookings_by_trip),
+            ("POST", r"/trips/(\d+)/bookings", self.book_trip),
+            ("PUT", r"/trips/(\d+)/driver", self.allocate_driver),
+            ("DELETE", r"/trips/(\d+)/driver", self.deallocate_driver),
+            ("DELETE", r"/bookings/(\d+)", self.cancel_booking),
+            ("GET", r"/passengers/(\d+)/bookings", self.get_bookings_by_passenger),
+            ("GET", r"/drivers/available", self.get_available_drivers),
+            ("GET", r"/destinations", self.autocomplete_destinations),
+        ]
+        return [(method, re.compile(pattern + r"/?$"), action) for method, pattern, action in table]
+
+    def dispatch(self, method, path, query, body):
+        """Return (status, payload) for one request."""
+        allowed = False
+        for route_method, pattern, action in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            try:
+                with self.messages.capture() as printed:
+                    status, payload = action(*[int(group) for group in match.groups()], query=query, body=body)
+                if status == 409 and isinstance(payload, dict):
+                    payload.setdefault("reason", ServiceMessages.last(printed))
+                return status, payload
+            except (BadRequest,) + BAD_REQUEST_ERRORS as e:
+                return 400, {"error": str(e)}
+            except NOT_FOUND_ERRORS as e:
+                return 404, {"error": str(e)}
+            except Exception as e:
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+        if allowed:
+            return 405, {"error": f"{method} is not supported on {path}."}
+        return 404, {"error": f"No such resource: {path}"}
+
+    @staticmethod
+    def _outcome(ok):
+        return (200, {"ok": True}) if ok else (409, {"ok": False})
+
+    # ---- actions ----------------------------------------------------------
+
+    def health(self, query, body):
+        return 200, {"ok": True, "backend": self.service.backend.name, "pool": self.service.pool.stats()}
+
+    def add_vehicle(self, query, body):
+        model, capacity, vehicle_type, status = _required(body, "model", "capacity", "type", "status")
+        vehicle = Vehicle(None, model, _capacity(capacity), vehicle_type, status)
+        EntityValidator.validate_vehicle(vehicle)
+        return self._outcome(self.service.add_vehicle(vehicle))
+
+    def update_vehicle(self, vehicle_id, query, body):
+        capacity = body.get("capacity")
+        vehicle = Vehicle(vehicle_id, body.get("model"), None if capacity in (None, "") else _capacity(capacity),
+                          body.get("type"))
+        return self._outcome(self.service.update_vehicle(vehicle))
+
+    def delete_vehicle(self, vehicle_id, query, body):
+        return self._outcome(self.service.delete_vehicle(vehicle_id))
+
+    def schedule_trip(self, query, body):
+        vehicle_id, route_id, departure, arrival = _required(body, "vehicle_id", "route_id",
+                                                             "departure_date", "arrival_date")
+        return self._outcome(self.service.schedule_trip(_int(vehicle_id, "vehicle_id"), _int(route_id, "route_id"),
+                                                        _date(departure, "departure_date"),
+                                                        _date(arrival, "arrival_date")))
+
+    def schedule_trips_bulk(self, query, body):
+        trips = body.get("trips")
+        if not isinstance(trips, list):
+            raise BadRequest("trips must be a list.")
+        return 200, self.service.schedule_trips_bulk(trips)
+
+    def cancel_trip(self, trip_id, query, body):
+        return self._outcome(self.service.cancel_trip(trip_id))
+
+    def find_trips(self, query, body):
+        start, end = _required(query, "start", "end")
+        return 200, self.service.find_trips(start, end, _date(query.get("depart_from"), "depart_from"),
+                                            _date(query.get("depart_to"), "depart_to"),
+                                            _int(query.get("min_free_seats", 1), "min_free_seats"),
+                                            _int(query.get("limit", 50), "limit"))
+
+    def get_trip_legs(self, trip_id, query, body):
+        return 200, self.service.get_trip_legs(trip_id)
+
+    def seats_available(self, trip_id, query, body):
+        seats = self.service.seats_available(trip_id, _stop(query.get("from_stop")), _stop(query.get("to_stop")))
+        return 200, {"trip_id": trip_id, "seats_available": seats}
+
+    def get_bookings_by_trip(self, trip_id, query, body):
+        return 200, self.service.get_bookings_page_by_trip(trip_id, _int(query.get("after", 0), "after"),
+                                                          _int(query.get("limit", 100), "limit"))
+
+    def book_trip(self, trip_id, query, body):
+        passenger_ids = body.get("passenger_ids")
+        if passenger_ids is None:
+            passenger_ids = _required(body, "passenger_id")
+        if not isinstance(passenger_ids, list) or not passenger_ids:
+            raise BadRequest("passenger_ids must be a non-empty list.")
+        passenger_ids = [_int(pid, "passenger_ids") for pid in passenger_ids]
+        results = self.service.book_trip_batch(trip_id, passenger_ids, _date(body.get("booking_date"), "booking_date"),
+                                               _stop(body.get("from_stop")), _stop(body.get("to_stop")))
+        booked = sum(1 for outcome in results.values() if outcome == "BOOKED")
+        return (200 if booked else 409), {"booked": booked, "results": results}
+
+    def allocate_driver(self, trip_id, query, body):
+        driver_id, = _required(body, "driver_id")
+        return self._outcome(self.service.allocate_driver(trip_id, _int(driver_id, "driver_id")))
+
+    def deallocate_driver(self, trip_id, query, body):
+        return self._outcome(self.service.deallocate_driver(trip_id))
+
+    def cancel_booking(self, booking_id, query, body):
+        return self._outcome(self.service.cancel_booking(booking_id))
+
+    def get_bookings_by_passenger(self, passenger_id, query, body):
+        return 200, self.service.get_bookings_page_by_passenger(passenger_id, _int(query.get("after", 0), "after"),
+                                                               _int(query.get("limit", 100), "limit"))
+
+    def get_available_drivers(self, query, body):
+        if query.get("departure") or query.get("arrival"):
+            departure, arrival = _required(query, "departure", "arrival")
+            return 200, self.service.get_drivers_available_for(_date(departure, "departure"),
+                                                               _date(arrival, "arrival"))
+        return 200, self.service.get_available_drivers()
+
+    def autocomplete_destinations(self, query, body):
+        return 200, self.service.autocomplete_destinations(query.get("prefix", ""),
+                                                           _int(query.get("limit", 10), "limit"))
+
+    # ---- HTTP plumbing ----------------------------------------------------
+
+    def _handler_class(self):
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so load generators can reuse connections
+            timeout = KEEP_ALIVE_TIMEOUT
+            # Headers and body go out as separate writes; without this, Nagle's algorithm and
+            # delayed ACKs hold every keep-alive response back for tens of milliseconds
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                parts = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                body = {}
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The body's extent is unknown, so the connection cannot be reused
+                    self.close_connection = True
+                    self._send(400, {"error": "Content-Length must be a non-negative integer."})
+                    return
+                if length > MAX_BODY_BYTES:
+                    self._send(413, {"error": "Request body too large."})
+                    return
+                if length:
+                    try:
+                        body = json.loads(self.rfile.read(length))
+                    except ValueError:
+                        self._send(400, {"error": "Body is not valid JSON."})
+                        return
+                    if not isinstance(body, dict):
+                        self._send(400, {"error": "Body must be a JSON object."})
+                        return
+                status, payload = server.dispatch(self.command, parts.path, query, body)
+                self._send(status, payload)
+
+            def _send(self, status, payload):
+                data = json.dumps(payload, default=to_json).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass  # one line per request would dominate the cost of a busy server
+
+        return RequestHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the transport management service over HTTP/JSON.")
+    parser.add_argument("--db", help="connection string (default: TM_DB_URL / db.properties)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="request threads and pooled connections")
+    parser.add_argument("--quiet", action="store_true", help="discard the service's progress messages")
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        sys.stdout = open(os.devnull, "w")
+    server = TransportManagementServer(args.db, args.host, args.port, args.workers)
+    print(f"Serving on http://{args.host}:{server.address[1]} with {args.workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        DBConnUtil.close_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+'''
+This file defines the ServiceTestCase class, the base of the test cases that run the
+service against a fresh in-memory SQLite database per test method.
+
+setUp creates the tables and self.service; service_options holds the keyword arguments
+a test case passes to TransportManagementServiceImpl. The add_* helpers insert the
+reference rows most tests need and return their IDs, so each test case only spells out
+the rows that are specific to it.
+'''
+
+import unittest
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from util.DBConnUtil import DBConnUtil
+
+
+class ServiceTestCase(unittest.TestCase):
+    # Keyword arguments for the service created in setUp (a property where they are per test)
+    service_options = {}
+
+    def setUp(self):
+        self.connection_string = self.create_database()
+        self.service = TransportManagementServiceImpl(self.connection_string, **self.service_options)
+
+    def create_database(self, label=None):
+        """Create the tables of an in-memory database named after this test (and label)."""
+        module = type(self).__module__.rsplit(".", 1)[-1]
+        name = f"{module}_{self._testMethodName}" + (f"_{label}" if label else "")
+        connection_string = f"sqlite:///:memory:?name={name}"
+        DBConnUtil.create_tables(connection_string)
+        return connection_string
+
+    def _insert(self, query, rows, service=None):
+        """Insert one row per parameter tuple in rows; returns the new IDs in order."""
+        with (service or self.service).pool.connection() as conn:
+            cursor = conn.cursor()
+            ids = []
+            for values in rows:
+                cursor.execute(query, values)
+                ids.append(cursor.lastrowid)
+            conn.commit()
+        return ids
+
+    def add_vehicle(self, capacity=10, model="M", vehicle_type="Bus", status="Available", service=None):
+        return self._insert("INSERT INTO Vehicles (Model, Capacity, Type, Status) VALUES (%s, %s, %s, %s)",
+                            [(model, capacity, vehicle_type, status)], service)[0]
+
+    def add_route(self, start="A", end="B", distance=10, service=None):
+        return self._insert("INSERT INTO Routes (StartDestination, EndDestination, Distance) VALUES (%s, %s, %s)",
+                            [(start, end, distance)], service)[0]
+
+    def add_drivers(self, count=1, status="Available", service=None):
+        return self._insert("INSERT INTO Drivers (Name, Status) VALUES (%s, %s)",
+                            [(f"D{n}", status) for n in range(count)], service)
+
+    def add_passengers(self, count=1, service=None):
+        with (service or self.service).pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM Passengers")
+            first = cursor.fetchone()[0]
+        # Numbered on from the rows already there, so every email stays distinct
+        return self._insert("INSERT INTO Passengers (FirstName, Email) VALUES (%s, %s)",
+                            [(f"P{n}", f"p{n}@example.com") for n in range(first, first + count)], service)
@@ -0,0 +1,146 @@
+import json
+import socket
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from main.TransportManagementServer import TransportManagementServer, PENDING_PER_WORKER
+from test_tm.service_test_case import ServiceTestCase
+
+BASE = datetime(2099, 10, 1, 9, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class ApiServerTest(ServiceTestCase):
+    service_options = {"interactive": False}
+
+    def setUp(self):
+        super().setUp()
+        self.add_drivers(2)
+        self.add_route("Chennai", "Madurai", 460)
+        self.add_passengers(30)
+        self.server = TransportManagementServer(port=0, workers=8, service=self.service)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def call(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def add_trip(self, capacity=5):
+        self.assertEqual(self.call("POST", "/vehicles", {"model": "Bus", "capacity": capacity, "type": "Bus",
+                                                         "status": "Available"})[0], 200)
+        departure = BASE + timedelta(days=10)
+        status, _ = self.call("POST", "/trips", {"vehicle_id": 1, "route_id": 1, "departure_date": departure.strftime(FMT),
+                                                 "arrival_date": (departure + timedelta(hours=8)).strftime(FMT)})
+        self.assertEqual(status, 200)
+
+    def test_vehicle_and_driver_changes_never_prompt(self):
+        self.add_trip()
+        with patch("builtins.input", side_effect=AssertionError("prompted")):
+            self.assertEqual(self.call("PUT", "/vehicles/1", {"model": "Coach", "capacity": 8})[0], 200)
+            self.assertEqual(self.call("PUT", "/trips/1/driver", {"driver_id": 1})[0], 200)
+            self.assertEqual(self.call("PUT", "/trips/1/driver", {"driver_id": 2})[0], 200)
+            self.assertEqual(self.call("DELETE", "/trips/1/driver")[0], 200)
+            self.assertEqual(self.call("DELETE", "/trips/1/driver")[0], 409)
+            self.assertEqual(self.call("DELETE", "/vehicles/1")[0], 200)
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM Vehicles")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_bookings_and_listings(self):
+        self.add_trip()
+        status, payload = self.call("POST", "/trips/1/bookings", {"passenger_ids": [1, 2, 99]})
+        self.assertEqual((status, payload["booked"]), (200, 2))
+        self.assertEqual(payload["results"]["99"], "PASSENGER_NOT_FOUND")
+
+        status, bookings = self.call("GET", "/trips/1/bookings?limit=10")
+        self.assertEqual([booking["passenger_id"] for booking in bookings], [1, 2])
+        self.assertEqual(self.call("GET", "/trips/1/seats")[1]["seats_available"], 3)
+        self.assertEqual(self.call("DELETE", f"/bookings/{bookings[0]['booking_id']}")[0], 200)
+
+        found = self.call("GET", "/trips/search?start=chennai&end=Madurai")[1]
+        self.assertEqual([trip["trip_id"] for trip in found], [1])
+        self.assertEqual(self.call("GET", "/destinations?prefix=ma")[1], ["Madurai"])
+
+    def test_errors_map_to_status_codes(self):
+        self.assertEqual(self.call("POST", "/trips/42/bookings", {"passenger_id": 1})[0], 404)
+        self.assertEqual(self.call("POST", "/vehicles", {"model": "Bus"})[0], 400)
+        self.assertEqual(self.call("GET", "/nowhere")[0], 404)
+        self.assertEqual(self.call("GET", "/vehicles")[0], 405)
+
+    def test_malformed_requests_answer_400(self):
+        self.add_trip()
+        departure = (BASE + timedelta(days=20)).strftime(FMT)
+        cases = [
+            ("POST", "/trips", {"vehicle_id": 1, "route_id": 1, "departure_date": "tomorrow", "arrival_date": departure}),
+            ("POST", "/vehicles", {"model": "Bus", "capacity": 5, "type": "Bus", "status": "Parked"}),
+            ("POST", "/vehicles", {"model": "Bus", "capacity": "five", "type": "Bus", "status": "Available"}),
+            ("PUT", "/vehicles/1", {"capacity": "lots"}),
+            ("GET", "/trips/search?start=A&end=B&depart_from=xx", None),
+            ("GET", f"/drivers/available?departure={departure.replace(' ', '%20')}&arrival=bad", None),
+            ("POST", "/trips/1/bookings", {"passenger_id": 1, "booking_date": "yesterday"}),
+        ]
+        for method, path, body in cases:
+            status, payload = self.call(method, path, body)
+            self.assertEqual(status, 400, (method, path, payload))
+            self.assertTrue(payload["error"])
+
+        status, payload = self.call("POST", "/trips/bulk", {"trips": [
+            {"vehicle_id": 1, "route_id": 999, "departure_date": departure, "arrival_date": departure}]})
+        self.assertEqual(status, 200)
+        self.assertEqual(len(payload["rejected"]), 1)
+
+    def test_refusals_carry_the_reason(self):
+        self.add_trip()
+        departure = BASE + timedelta(days=10, hours=1)
+        status, payload = self.call("POST", "/trips", {"vehicle_id": 1, "route_id": 1,
+                                                       "departure_date": departure.strftime(FMT),
+                                                       "arrival_date": (departure + timedelta(hours=2)).strftime(FMT)})
+        self.assertEqual(status, 409)
+        self.assertIn("not available", payload["reason"])
+
+    def test_idle_connections_beyond_the_workers_wait_in_the_kernel(self):
+        server = TransportManagementServer(port=0, workers=1, service=self.service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        clients = [socket.create_connection(server.address, timeout=5) for _ in range(6)]
+        try:
+            threading.Event().wait(0.3)
+            # One connection being served, at most PENDING_PER_WORKER accepted and waiting
+            self.assertLessEqual(server.httpd.executor._work_queue.qsize(), PENDING_PER_WORKER)
+        finally:
+            for client in clients:
+                client.close()
+            server.shutdown()
+
+    def test_bad_content_length_is_refused(self):
+        for length in ("abc", "-1"):
+            with socket.create_connection(self.server.address, timeout=5) as client:
+                client.sendall(f"POST /vehicles HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode())
+                reply = client.recv(4096).decode()
+            self.assertTrue(reply.startswith("HTTP/1.1 400"), reply)
+
+    def test_concurrent_bookings_do_not_oversell(self):
+        self.add_trip(capacity=5)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            responses = list(executor.map(lambda pid: self.call("POST", "/trips/1/bookings", {"passenger_id": pid}),
+                                          range(1, 31)))
+        self.assertEqual(sum(payload["booked"] for _, payload in responses), 5)
+        self.assertEqual(sum(1 for status, _ in responses if status == 409), 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
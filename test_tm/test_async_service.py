@@ -0,0 +1,95 @@
+import asyncio
+import inspect
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from benchmark.ConcurrencyBenchmark import ConcurrencyBenchmark
+from dao.AsyncTransportManagementService import AsyncTransportManagementService
+from dao.ITransportManagementService import ITransportManagementService
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from test_tm.service_test_case import ServiceTestCase
+from util.DBConnUtil import DBConnUtil
+from util.QueryInstrumentation import InstrumentedPool, QueryInstrumentation
+
+BASE = datetime(2099, 11, 1, 9, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class AsyncServiceTest(ServiceTestCase):
+    service_options = {"interactive": False}
+
+    def setUp(self):
+        super().setUp()
+        self.add_vehicle(capacity=5, model="Bus")
+        self.add_drivers(2)
+        self.add_route()
+        self.add_passengers(200)
+
+    def test_mirrors_the_service_interface(self):
+        for name in ITransportManagementService.__abstractmethods__:
+            method = getattr(AsyncTransportManagementService, name)
+            if name.startswith("iter_"):
+                continue
+            self.assertTrue(inspect.iscoroutinefunction(method), name)
+
+    def test_concurrent_bookings_do_not_oversell(self):
+        async def scenario():
+            async with AsyncTransportManagementService(self.connection_string, max_workers=4) as service:
+                departure = BASE + timedelta(days=10)
+                self.assertTrue(await service.schedule_trip(1, 1, departure.strftime(FMT),
+                                                            (departure + timedelta(hours=4)).strftime(FMT)))
+                results = await asyncio.gather(*(service.book_trip(1, pid) for pid in range(1, 201)))
+                seats = await service.seats_available(1)
+                streamed = [booking.passenger_id async for booking in service.iter_bookings_by_trip(1, chunk_size=2)]
+                with patch("builtins.input", side_effect=AssertionError("prompted")):
+                    self.assertTrue(await service.allocate_driver(1, 1))
+                    self.assertTrue(await service.allocate_driver(1, 2))
+                    self.assertTrue(await service.deallocate_driver(1))
+                self.assertIs(service.pool, DBConnUtil.get_pool(self.connection_string))
+                return results, seats, streamed, service.pool.stats()
+
+        shared = DBConnUtil.get_pool(self.connection_string)
+        max_size = shared.max_size
+        results, seats, streamed, pool = asyncio.run(scenario())
+        self.assertEqual(sum(results), 5)
+        self.assertEqual(seats, 0)
+        self.assertEqual(set(streamed), {pid for pid, booked in zip(range(1, 201), results) if booked})
+        self.assertEqual(pool["max_size"], max_size + 4)
+        self.assertEqual(shared.max_size, max_size)
+        self.assertLessEqual(shared.stats()["open"], max_size)
+
+    def test_wrapped_service_keeps_its_instrumented_pool(self):
+        service = TransportManagementServiceImpl(self.connection_string, instrumentation=QueryInstrumentation(),
+                                                 interactive=False)
+        instrumented = service.pool
+
+        async def scenario():
+            async with AsyncTransportManagementService(max_workers=2, service=service) as facade:
+                return await facade.get_available_drivers()
+        self.assertEqual(len(asyncio.run(scenario())), 2)
+        self.assertIs(service.pool, instrumented)
+        self.assertIsInstance(service.pool, InstrumentedPool)
+
+    def test_interactive_service_is_refused(self):
+        with self.assertRaises(ValueError):
+            AsyncTransportManagementService(service=TransportManagementServiceImpl(self.connection_string))
+
+    def test_concurrency_benchmark_report(self):
+        report = ConcurrencyBenchmark(self.connection_string, scale=200, requests=200, workers=4).run((4, 32))
+        for mode in ("sync", "async"):
+            for level in ("4", "32"):
+                result = report["results"][mode][level]
+                self.assertEqual(result["requests"], 200)
+                self.assertEqual(result["errors"], 0)
+                self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        # Every run starts from the same data, so each books the same seats
+        booked = {result["booked"] for mode in report["results"].values() for result in mode.values()}
+        self.assertEqual(len(booked), 1)
+        self.assertGreater(booked.pop(), 0)
+        # Measured, so other tests' background threads may come or go meanwhile
+        self.assertAlmostEqual(report["results"]["sync"]["32"]["threads"], 33, delta=2)
+        self.assertAlmostEqual(report["results"]["async"]["32"]["threads"], 5, delta=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
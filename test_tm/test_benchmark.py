@@ -0,0 +1,68 @@
+import json
+import unittest
+from datetime import datetime
+from benchmark.ServiceBenchmark import ServiceBenchmark, percentile
+from benchmark.SyntheticDataGenerator import SyntheticDataGenerator
+from util.DBConnUtil import DBConnUtil
+
+
+class BenchmarkTest(unittest.TestCase):
+    def connection_string(self, label):
+        return f"sqlite:///:memory:?name=test_benchmark_{self._testMethodName}_{label}"
+
+    def test_generator_is_reproducible(self):
+        now = datetime(2099, 1, 1, 12, 0, 0)
+        snapshots = []
+        for label in ("first", "second"):
+            connection_string = self.connection_string(label)
+            DBConnUtil.create_tables(connection_string)
+            dataset = SyntheticDataGenerator(connection_string, seed=7, now=now).generate(400)
+            with DBConnUtil.get_pool(connection_string).connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT VehicleID, RouteID, DepartureDate, DriverID, SeatsBooked FROM Trips ORDER BY TripID")
+                snapshots.append(cursor.fetchall())
+                cursor.execute("""
+                    SELECT COUNT(*) FROM Trips T
+                    WHERE T.SeatsBooked > T.MaxPassengers OR T.SeatsBooked <>
+                        (SELECT COUNT(*) FROM Bookings B WHERE B.TripID = T.TripID)
+                """)
+                self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(snapshots[0], snapshots[1])
+        self.assertEqual(dataset["counts"]["trips"], 400)
+        self.assertEqual(dataset["counts"]["vehicles"], 100)
+
+    def test_report_covers_every_operation(self):
+        report = ServiceBenchmark(self.connection_string("run"), scale=400, iterations=20).run()
+        json.dumps(report)
+
+        operations = report["operations"]
+        for name in ("add_vehicle", "update_vehicle", "delete_vehicle", "schedule_trip", "cancel_trip",
+                     "book_trip", "book_trip_batch", "cancel_booking", "allocate_driver", "deallocate_driver",
+                     "get_bookings_by_passenger", "get_bookings_by_trip", "get_bookings_page_by_passenger",
+                     "get_bookings_page_by_trip", "iter_bookings_by_passenger", "iter_bookings_by_trip",
+                     "auto_update_vehicle_statuses", "auto_update_driver_statuses"):
+            self.assertIn(name, operations)
+            self.assertEqual(operations[name]["errors"], 0)
+            self.assertGreater(operations[name]["calls"], 0)
+            self.assertLessEqual(operations[name]["p50_ms"], operations[name]["p99_ms"])
+        self.assertGreaterEqual(operations["book_trip"]["queries_per_call"], 2)
+        self.assertGreaterEqual(operations["iter_bookings_by_trip"]["queries_per_call"], 1)
+
+        # The prompting operations really ran: nothing waited for a confirmation
+        with DBConnUtil.get_pool(self.connection_string("run")).connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM Vehicles WHERE Model LIKE 'Spare %'")
+            self.assertEqual(cursor.fetchone()[0], 0)
+            cursor.execute("SELECT COUNT(*) FROM Vehicles WHERE Model LIKE 'Updated %'")
+            self.assertGreater(cursor.fetchone()[0], 0)
+            cursor.execute("SELECT COUNT(*) FROM Trips WHERE Status = 'CANCELLED'")
+            self.assertEqual(cursor.fetchone()[0], operations["cancel_trip"]["calls"])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual((percentile(values, 0.5), percentile(values, 0.99), percentile(values, 1.0)), (50, 99, 100))
+        self.assertIsNone(percentile([], 0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
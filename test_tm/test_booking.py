@@ -0,0 +1,86 @@
+import unittest
+from dao.TransportManagementServiceImpl import (
+    TransportManagementServiceImpl, BOOKED, PASSENGER_NOT_FOUND, ALREADY_BOOKED,
+    NO_SEATS, BOOKING_CLOSED, TRIP_CANCELLED
+)
+from exception.CustomExceptions import TripNotFoundException
+from util.DBConnUtil import DBConnUtil
+
+BOOKING_DATE = "2099-01-01 09:00:00"
+
+
+class BatchBookingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connection_string = "sqlite:///:memory:?name=test_booking"
+        DBConnUtil.create_tables(connection_string)
+        cls.service = TransportManagementServiceImpl(connection_string)
+
+    def create_trip(self, capacity, departure="2099-02-01 10:00:00", arrival="2099-02-01 12:00:00"):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO Vehicles (Model, Capacity, Type, Status) VALUES ('M', %s, 'Bus', 'Available')",
+                           (capacity,))
+            vehicle_id = cursor.lastrowid
+            cursor.execute("INSERT INTO Routes (StartDestination, EndDestination, Distance) VALUES ('A', 'B', 10)")
+            route_id = cursor.lastrowid
+            conn.commit()
+        self.assertTrue(self.service.schedule_trip(vehicle_id, route_id, departure, arrival))
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(TripID) FROM Trips")
+            return cursor.fetchone()[0]
+
+    def create_passengers(self, count):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            ids = []
+            for _ in range(count):
+                cursor.execute("INSERT INTO Passengers (FirstName, Gender, Age) VALUES ('P', 'F', 30)")
+                ids.append(cursor.lastrowid)
+            conn.commit()
+        return ids
+
+    def booked_count(self, trip_id):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM Bookings WHERE TripID = %s AND Status = 'BOOKED'", (trip_id,))
+            return cursor.fetchone()[0]
+
+    def test_group_booking_reports_each_passenger(self):
+        trip_id = self.create_trip(capacity=300)
+        passengers = self.create_passengers(250)
+        self.assertEqual(self.service.book_trip_batch(trip_id, passengers[:1], BOOKING_DATE)[passengers[0]], BOOKED)
+
+        request = passengers + [passengers[5], 999999]
+        results = self.service.book_trip_batch(trip_id, request, BOOKING_DATE)
+
+        self.assertEqual(results[passengers[0]], ALREADY_BOOKED)
+        self.assertEqual(results[passengers[5]], BOOKED)
+        self.assertEqual(results[999999], PASSENGER_NOT_FOUND)
+        self.assertEqual(sum(1 for outcome in results.values() if outcome == BOOKED), 249)
+        self.assertEqual(self.booked_count(trip_id), 250)
+
+    def test_group_larger_than_free_seats_is_refused(self):
+        trip_id = self.create_trip(capacity=3)
+        passengers = self.create_passengers(4)
+        results = self.service.book_trip_batch(trip_id, passengers, BOOKING_DATE)
+        self.assertEqual(set(results.values()), {NO_SEATS})
+        self.assertEqual(self.booked_count(trip_id), 0)
+
+    def test_closed_and_cancelled_trips(self):
+        trip_id = self.create_trip(capacity=3, departure="2099-03-01 10:00:00", arrival="2099-03-01 12:00:00")
+        passenger = self.create_passengers(1)[0]
+        self.assertEqual(self.service.book_trip_batch(trip_id, [passenger], "2099-02-28 11:00:00")[passenger],
+                         BOOKING_CLOSED)
+        self.service.cancel_trip(trip_id)
+        self.assertEqual(self.service.book_trip_batch(trip_id, [passenger], BOOKING_DATE)[passenger], TRIP_CANCELLED)
+        self.assertFalse(self.service.book_trip(trip_id, passenger, BOOKING_DATE))
+
+    def test_unknown_trip_raises(self):
+        with self.assertRaises(TripNotFoundException):
+            self.service.book_trip_batch(987654, [1], BOOKING_DATE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from datetime import datetime, timedelta
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from util.DBConnUtil import DBConnUtil
+
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class BookingPaginationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connection_string = "sqlite:///:memory:?name=test_booking_pagination"
+        DBConnUtil.create_tables(connection_string)
+        cls.service = TransportManagementServiceImpl(connection_string)
+        departure = (datetime.now() + timedelta(days=30)).strftime(FMT)
+        with cls.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO Routes (StartDestination, EndDestination, Distance) VALUES ('A', 'B', 10)")
+            route_id = cursor.lastrowid
+            cursor.execute("""
+                INSERT INTO Trips (RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers)
+                VALUES (%s, %s, %s, 'Scheduled', 5000)
+            """, (route_id, departure, departure))
+            cls.trip_id = cursor.lastrowid
+            cursor.execute("INSERT INTO Passengers (FirstName, Email) VALUES ('P', 'p@example.com')")
+            cls.passenger_id = cursor.lastrowid
+            cursor.executemany("""
+                INSERT INTO Bookings (TripID, PassengerID, BookingDate, Status) VALUES (%s, %s, %s, 'BOOKED')
+            """, [(cls.trip_id, cls.passenger_id, departure)] * 1234)
+            conn.commit()
+
+    def test_iterator_streams_every_booking_in_order(self):
+        bookings = list(self.service.iter_bookings_by_trip(self.trip_id, chunk_size=100))
+        self.assertEqual(len(bookings), 1234)
+        ids = [booking.booking_id for booking in bookings]
+        self.assertEqual(ids, sorted(ids))
+        self.assertTrue(all(booking.trip_id == self.trip_id and booking.passenger_id == self.passenger_id
+                            for booking in bookings))
+
+    def test_abandoned_iterator_returns_its_connection(self):
+        in_use_before = self.service.pool.stats()["in_use"]
+        iterator = self.service.iter_bookings_by_passenger(self.passenger_id, chunk_size=10)
+        next(iterator)
+        self.assertEqual(self.service.pool.stats()["in_use"], in_use_before + 1)
+        iterator.close()
+        self.assertEqual(self.service.pool.stats()["in_use"], in_use_before)
+
+    def test_keyset_pages_cover_all_bookings_once(self):
+        seen, after = [], 0
+        while True:
+            page = self.service.get_bookings_page_by_trip(self.trip_id, after_booking_id=after, limit=500)
+            seen.extend(booking.booking_id for booking in page)
+            if len(page) < 500:
+                break
+            after = page[-1].booking_id
+        self.assertEqual(len(seen), 1234)
+        self.assertEqual(len(set(seen)), 1234)
+        self.assertEqual(len(self.service.get_bookings_page_by_passenger(self.passenger_id, limit=10**6)), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
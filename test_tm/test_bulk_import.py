@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from dao.BulkImporter import BulkImporter
+from test_tm.service_test_case import ServiceTestCase
+
+
+class BulkImportTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.importer = BulkImporter(self.service, chunk_size=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write(content)
+        return path
+
+    def count(self, table):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            return cursor.fetchone()[0]
+
+    def test_vehicle_csv_rejects_invalid_rows_without_prompting(self):
+        path = self.write("vehicles.csv", "Model,Capacity,Type,Status\n"
+                                          "Volvo,40,Bus,Available\n"
+                                          ",20,Van,Available\n"
+                                          "Tata,abc,Truck,Available\n"
+                                          "Ford,12,Van,Parked\n"
+                                          "Isuzu,8,Van,Maintenance\n"
+                                          "Scania,60,Bus,On Trip\n"
+                                          "MAN,30,Truck,Available\n")
+        summary = self.importer.import_file("vehicles", path)
+
+        self.assertEqual((summary["rows_read"], summary["inserted"], summary["rejected"]), (7, 4, 3))
+        self.assertEqual(self.count("Vehicles"), 4)
+        with open(summary["error_report"], newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual([int(row["line"]) for row in rows], [3, 4, 5])
+        self.assertIn("Model is required", rows[0]["error"])
+
+    def test_passenger_jsonl_rejects_duplicates_row_by_row(self):
+        records = [{"first_name": f"P{n}", "email": f"p{n}@example.com", "age": 30} for n in range(5)]
+        records.insert(2, {"first_name": "Dup", "email": "p0@example.com"})
+        lines = [json.dumps(record) for record in records] + ["", "{not json"]
+        path = self.write("passengers.jsonl", "\n".join(lines) + "\n")
+
+        summary = self.importer.import_file("passengers", path)
+
+        self.assertEqual(summary["inserted"], 5)
+        self.assertEqual(summary["rejected"], 2)
+        self.assertEqual(self.count("Passengers"), 5)
+
+    def test_drivers_and_routes_use_column_or_attribute_names(self):
+        drivers = self.write("drivers.csv", "Name,LicenseNumber,Age\nAsha,DL-1,35\nRavi,,40\nTeen,DL-3,16\n")
+        routes = self.write("routes.jsonl", '{"StartDestination": "Kochi", "EndDestination": "Chennai", "Distance": 690}\n'
+                                            '{"start_destination": "Pune", "end_destination": "pune", "distance": 5}\n')
+
+        self.assertEqual(self.importer.import_file("drivers", drivers)["inserted"], 1)
+        self.assertEqual(self.importer.import_file("routes", routes)["inserted"], 1)
+        self.assertEqual(self.service.get_available_drivers()[0].name, "Asha")
+        with self.assertRaises(ValueError):
+            self.importer.import_file("trips", routes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from test_tm.service_test_case import ServiceTestCase
+
+BASE = datetime(2099, 9, 1)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class BulkSchedulingTest(ServiceTestCase):
+    def make_service(self, label):
+        service = TransportManagementServiceImpl(self.create_database(label))
+        for number in range(5):
+            self.add_vehicle(capacity=30, model=f"V{number}", service=service)
+        self.add_route(service=service)
+        return service
+
+    def scheduled(self, service):
+        with service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT VehicleID, DepartureDate, ArrivalDate FROM Trips WHERE Status = 'Scheduled'")
+            return sorted(cursor.fetchall())
+
+    def test_matches_scheduling_one_by_one_in_departure_order(self):
+        rng = random.Random(3)
+        existing, timetable = [], []
+        for rows, target in ((20, existing), (400, timetable)):
+            for _ in range(rows):
+                departure = BASE + timedelta(hours=rng.randint(0, 24 * 200))
+                arrival = departure + timedelta(hours=rng.randint(1, 72))
+                target.append((rng.randint(1, 5), 1, departure.strftime(FMT), arrival.strftime(FMT)))
+
+        bulk, sequential = self.make_service("bulk"), self.make_service("sequential")
+        for service in (bulk, sequential):
+            for trip in existing:
+                service.schedule_trip(*trip)
+
+        result = bulk.schedule_trips_bulk(timetable)
+        for trip in sorted(timetable, key=lambda trip: trip[2]):
+            sequential.schedule_trip(*trip)
+
+        self.assertEqual(self.scheduled(bulk), self.scheduled(sequential))
+        self.assertEqual(result["scheduled"] + len(result["rejected"]), len(timetable))
+        self.assertEqual(len(result["trip_ids"]), result["scheduled"])
+        # The schedule index was kept current: a follow-up single call sees the bulk trips
+        vehicle_id, _, departure, arrival = timetable[next(iter(result["trip_ids"]))]
+        self.assertFalse(bulk.schedule_trip(vehicle_id, 1, departure, arrival))
+
+    def test_rejections_explain_each_row(self):
+        service = self.make_service("reasons")
+        result = service.schedule_trips_bulk([
+            {"vehicle_id": 1, "route_id": 1, "departure_date": "2099-01-01 08:00:00", "arrival_date": "2099-01-01 12:00:00"},
+            {"vehicle_id": 1, "route_id": 1, "departure_date": "2099-01-02 08:00:00", "arrival_date": "2099-01-02 12:00:00"},
+            {"vehicle_id": 99, "route_id": 1, "departure_date": "2099-01-01 08:00:00", "arrival_date": "2099-01-01 12:00:00"},
+            {"vehicle_id": 2, "route_id": 1, "departure_date": "2099-01-01 08:00:00", "arrival_date": "2099-01-01 07:00:00"},
+            (3, 1, "01/01/2099", "2099-01-01 07:00:00"),
+        ])
+        self.assertEqual(result["scheduled"], 1)
+        self.assertEqual([rejection["index"] for rejection in result["rejected"]], [1, 2, 3, 4])
+        self.assertIn("earlier trip", result["rejected"][0]["reason"])
+        self.assertIn("not found", result["rejected"][1]["reason"])
+
+
+    def test_unknown_routes_and_string_ids(self):
+        service = self.make_service("routes")
+        result = service.schedule_trips_bulk([
+            ("1", "1", "2099-01-01 08:00:00", "2099-01-01 12:00:00"),
+            (2, 999, "2099-01-01 08:00:00", "2099-01-01 12:00:00"),
+            (2, 1, "2099-01-01 09:00:00", "2099-01-01 13:00:00"),
+            ("two", 1, "2099-01-01 09:00:00", "2099-01-01 13:00:00"),
+        ])
+        self.assertEqual(sorted(result["trip_ids"]), [0, 2])
+        self.assertEqual([rejection["index"] for rejection in result["rejected"]], [1, 3])
+        self.assertIn("Route with ID 999 not found", result["rejected"][0]["reason"])
+        self.assertEqual(len(self.scheduled(service)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import random
+import tempfile
+import threading
+import unittest
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl, BOOKED, NO_SEATS
+from util.DBConnUtil import DBConnUtil
+
+BOOKING_DATE = "2099-01-01 09:00:00"
+
+
+class ConcurrentBookingTest(unittest.TestCase):
+    """Many threads race for the seats of one trip; none may be oversold."""
+
+    THREADS = 16
+    CAPACITY = 25
+    PASSENGERS = 400
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        connection_string = os.environ.get(
+            "TM_TEST_DB_URL", "sqlite:///" + os.path.join(cls.directory.name, "concurrent_booking.db"))
+        DBConnUtil.create_tables(connection_string)
+        cls.service = TransportManagementServiceImpl(connection_string)
+
+    @classmethod
+    def tearDownClass(cls):
+        DBConnUtil.close_pools()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO Vehicles (Model, Capacity, Type, Status) VALUES ('M', %s, 'Bus', 'Available')",
+                           (self.CAPACITY,))
+            vehicle_id = cursor.lastrowid
+            cursor.execute("INSERT INTO Routes (StartDestination, EndDestination, Distance) VALUES ('A', 'B', 10)")
+            route_id = cursor.lastrowid
+            cursor.executemany("INSERT INTO Passengers (FirstName, Gender, Age) VALUES (%s, 'F', 30)",
+                               [(f"P{i}",) for i in range(self.PASSENGERS)])
+            conn.commit()
+            cursor.execute("SELECT PassengerID FROM Passengers ORDER BY PassengerID DESC LIMIT %s", (self.PASSENGERS,))
+            self.passengers = [row[0] for row in cursor.fetchall()]
+        self.assertTrue(self.service.schedule_trip(vehicle_id, route_id, "2099-05-01 10:00:00", "2099-05-01 12:00:00"))
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(TripID) FROM Trips")
+            self.trip_id = cursor.fetchone()[0]
+
+    def inventory(self):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT SeatsBooked, MaxPassengers FROM Trips WHERE TripID = %s", (self.trip_id,))
+            seats_booked, capacity = cursor.fetchone()
+            cursor.execute("SELECT COUNT(*) FROM Bookings WHERE TripID = %s AND Status = 'BOOKED'", (self.trip_id,))
+            return seats_booked, capacity, cursor.fetchone()[0]
+
+    def run_threads(self, worker):
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def guarded(index):
+            try:
+                barrier.wait()
+                worker(index)
+            except Exception as e:  # surfaced below so a crashing thread fails the test
+                errors.append(e)
+
+        threads = [threading.Thread(target=guarded, args=(i,)) for i in range(self.THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+
+    def test_no_oversell_under_contention(self):
+        outcomes = []
+        lock = threading.Lock()
+        share = self.PASSENGERS // self.THREADS
+
+        def worker(index):
+            mine = self.passengers[index * share:(index + 1) * share]
+            rng = random.Random(index)
+            while mine:
+                group = mine[:rng.randint(1, 3)]
+                mine = mine[len(group):]
+                results = self.service.book_trip_batch(self.trip_id, group, BOOKING_DATE)
+                with lock:
+                    outcomes.extend(results.values())
+
+        self.run_threads(worker)
+
+        seats_booked, capacity, booked_rows = self.inventory()
+        self.assertEqual(booked_rows, capacity)
+        self.assertEqual(seats_booked, booked_rows)
+        self.assertEqual(outcomes.count(BOOKED), booked_rows)
+        self.assertEqual(outcomes.count(BOOKED) + outcomes.count(NO_SEATS), len(outcomes))
+
+    def test_cancellations_release_seats_exactly_once(self):
+        first_wave = self.passengers[:self.CAPACITY]
+        results = self.service.book_trip_batch(self.trip_id, first_wave, BOOKING_DATE)
+        self.assertEqual(set(results.values()), {BOOKED})
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT BookingID FROM Bookings WHERE TripID = %s", (self.trip_id,))
+            booking_ids = [row[0] for row in cursor.fetchall()]
+
+        second_wave = self.passengers[self.CAPACITY:]
+
+        def worker(index):
+            # Every thread cancels the same bookings; each seat must come back once
+            for booking_id in booking_ids[:10]:
+                self.service.cancel_booking(booking_id)
+            share = len(second_wave) // self.THREADS
+            for passenger_id in second_wave[index * share:(index + 1) * share]:
+                self.service.book_trip(self.trip_id, passenger_id, BOOKING_DATE)
+
+        self.run_threads(worker)
+
+        seats_booked, capacity, booked_rows = self.inventory()
+        self.assertEqual(booked_rows, capacity)
+        self.assertEqual(seats_booked, booked_rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
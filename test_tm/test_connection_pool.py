@@ -0,0 +1,83 @@
+import sqlite3
+import threading
+import unittest
+from util.ConnectionPool import ConnectionPool
+from exception.CustomExceptions import ConnectionPoolExhaustedException
+
+
+def sqlite_connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def test_reuses_returned_connection(self):
+        pool = ConnectionPool(sqlite_connect, max_size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(pool.stats()["open"], 1)
+
+    def test_exhausted_pool_times_out(self):
+        pool = ConnectionPool(sqlite_connect, max_size=1, timeout=0.05)
+        held = pool.acquire()
+        with self.assertRaises(ConnectionPoolExhaustedException):
+            pool.acquire()
+        pool.release(held)
+        self.assertIsNotNone(pool.acquire())
+
+    def test_unhealthy_connection_is_replaced(self):
+        healthy = {"value": True}
+        pool = ConnectionPool(sqlite_connect, validate=lambda conn: healthy["value"],
+                              max_size=1, health_check_interval=0)
+        first = pool.acquire()
+        pool.release(first)
+        healthy["value"] = False
+        second = pool.acquire()
+        self.assertIsNot(first, second)
+        self.assertEqual(pool.stats()["reconnects"], 1)
+
+    def test_failed_block_discards_uncommitted_work(self):
+        pool = ConnectionPool(sqlite_connect, max_size=1)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+        with self.assertRaises(RuntimeError):
+            with pool.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError("boom")
+        with pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+
+    def test_concurrent_borrowers_stay_within_bound(self):
+        pool = ConnectionPool(sqlite_connect, max_size=3)
+        in_use = []
+        peak = {"value": 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            for _ in range(50):
+                with pool.connection() as conn:
+                    with lock:
+                        in_use.append(conn)
+                        peak["value"] = max(peak["value"], len(in_use))
+                    conn.execute("SELECT 1").fetchone()
+                    with lock:
+                        in_use.remove(conn)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertLessEqual(peak["value"], 3)
+        self.assertLessEqual(pool.stats()["open"], 3)
+        self.assertEqual(pool.stats()["in_use"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from util.DBConnUtil import DBConnUtil
+
+BASE = datetime(2099, 5, 1)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class DriverAvailabilityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connection_string = "sqlite:///:memory:?name=test_driver_availability"
+        DBConnUtil.create_tables(connection_string)
+        cls.service = TransportManagementServiceImpl(connection_string)
+
+        rng = random.Random(11)
+        cls.trips = {}
+        with cls.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO Routes (StartDestination, EndDestination, Distance) VALUES ('A', 'B', 10)")
+            route_id = cursor.lastrowid
+            for number in range(200):
+                # Status column deliberately stale: the window query must not rely on it
+                cursor.execute("INSERT INTO Drivers (Name, Status) VALUES (%s, %s)",
+                               (f"Driver {number}", rng.choice(["Available", "On Trip", "Resting"])))
+                driver_id = cursor.lastrowid
+                cls.trips[driver_id] = []
+                for _ in range(rng.randint(0, 4)):
+                    departure = BASE + timedelta(hours=rng.randint(0, 24 * 60))
+                    arrival = departure + timedelta(hours=rng.randint(1, 72))
+                    status = rng.choice(["Scheduled", "Scheduled", "CANCELLED"])
+                    cursor.execute("""
+                        INSERT INTO Trips (RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers, DriverID)
+                        VALUES (%s, %s, %s, %s, 10, %s)
+                    """, (route_id, departure.strftime(FMT), arrival.strftime(FMT), status, driver_id))
+                    if status == "Scheduled":
+                        cls.trips[driver_id].append((departure, arrival))
+            conn.commit()
+
+    def expected_free(self, departure, arrival):
+        return sorted(driver_id for driver_id, trips in self.trips.items()
+                      if not any(departure <= arr + timedelta(days=3) and arrival >= dep for dep, arr in trips))
+
+    def test_matches_per_driver_rule(self):
+        rng = random.Random(5)
+        for _ in range(25):
+            departure = BASE + timedelta(hours=rng.randint(-24 * 5, 24 * 70))
+            arrival = departure + timedelta(hours=rng.randint(1, 48))
+            drivers = self.service.get_drivers_available_for(departure, arrival)
+            self.assertEqual([driver.driver_id for driver in drivers], self.expected_free(departure, arrival))
+
+    def test_accepts_strings_and_rejects_inverted_window(self):
+        departure, arrival = BASE + timedelta(days=100), BASE + timedelta(days=101)
+        drivers = self.service.get_drivers_available_for(departure.strftime(FMT), arrival.strftime(FMT))
+        self.assertEqual(len(drivers), len(self.trips))
+        self.assertEqual(self.service.get_drivers_available_for(arrival, departure), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from dao.DriverRosterAllocator import DriverRosterAllocator
+from test_tm.service_test_case import ServiceTestCase
+
+BASE = datetime(2099, 7, 1)
+FMT = "%Y-%m-%d %H:%M:%S"
+REST = timedelta(days=3)
+
+
+class DriverRosterTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.allocator = DriverRosterAllocator(self.service)
+        self.route_id = self.add_route()
+
+    def add_trips(self, windows, driver_id=None):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO Trips (RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers, DriverID)
+                VALUES (%s, %s, %s, 'Scheduled', 10, %s)
+            """, [(self.route_id, dep.strftime(FMT), arr.strftime(FMT), driver_id) for dep, arr in windows])
+            conn.commit()
+
+    def driver_trips(self):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DriverID, DepartureDate, ArrivalDate FROM Trips
+                WHERE DriverID IS NOT NULL ORDER BY DriverID, DepartureDate
+            """)
+            by_driver = {}
+            for driver_id, dep, arr in cursor.fetchall():
+                by_driver.setdefault(driver_id, []).append((dep, arr))
+            return by_driver
+
+    def test_roster_respects_rest_rule_and_existing_trips(self):
+        rng = random.Random(21)
+        self.add_drivers(40)
+        self.add_trips([(BASE + timedelta(days=2), BASE + timedelta(days=3))], driver_id=1)
+        windows = []
+        for _ in range(600):
+            departure = BASE + timedelta(hours=rng.randint(0, 24 * 28))
+            windows.append((departure, departure + timedelta(hours=rng.randint(2, 30))))
+        self.add_trips(windows)
+
+        summary = self.allocator.allocate(BASE, BASE + timedelta(days=29))
+
+        self.assertTrue(summary["written"])
+        self.assertEqual(len(summary["assigned"]) + len(summary["unstaffed"]), 600)
+        for trips in self.driver_trips().values():
+            for (dep, arr), (next_dep, _) in zip(trips, trips[1:]):
+                self.assertGreater(next_dep, arr + REST)
+
+    def test_enough_drivers_staff_everything(self):
+        # Three overlapping trips a week apart need exactly three drivers
+        self.add_drivers(3)
+        windows = [(BASE + timedelta(days=7 * week, hours=hour), BASE + timedelta(days=7 * week, hours=hour + 5))
+                   for week in range(4) for hour in (0, 1, 2)]
+        self.add_trips(windows)
+
+        dry_run = self.allocator.allocate(BASE, BASE + timedelta(days=30), dry_run=True)
+        self.assertEqual((len(dry_run["assigned"]), dry_run["unstaffed"], dry_run["written"]), (12, [], False))
+        self.assertEqual(self.driver_trips(), {})
+
+        summary = self.allocator.allocate(BASE, BASE + timedelta(days=30), driver_ids=[1, 2])
+        self.assertEqual((len(summary["assigned"]), len(summary["unstaffed"])), (8, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
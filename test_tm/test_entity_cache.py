@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from dao.TransportManagementServiceImpl import BOOKED
+from test_tm.service_test_case import ServiceTestCase
+from util.EntityCache import EntityCache
+
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class EntityCacheTest(unittest.TestCase):
+    def test_lru_eviction_and_ttl(self):
+        now = {"t": 0.0}
+        cache = EntityCache(max_size=2, ttl=10, clock=lambda: now["t"])
+        cache.put("vehicle", 1, ("a",))
+        cache.put("vehicle", 2, ("b",))
+        self.assertEqual(cache.get("vehicle", 1, lambda: None), ("a",))  # 1 is now most recent
+        cache.put("vehicle", 3, ("c",))                                   # evicts 2
+
+        found, missing = cache.get_many("vehicle", [1, 2, 3])
+        self.assertEqual(sorted(found), [1, 3])
+        self.assertEqual(missing, [2])
+
+        now["t"] = 11
+        self.assertEqual(cache.get("vehicle", 1, lambda: ("reloaded",)), ("reloaded",))
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["expirations"], 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (3, 2))
+
+    def test_missing_rows_are_not_cached_and_invalidate_by_kind(self):
+        cache = EntityCache()
+        self.assertIsNone(cache.get("driver", 1, lambda: None))
+        self.assertEqual(cache.get("driver", 1, lambda: ("d",)), ("d",))
+        cache.put("vehicle", 1, ("v",))
+        cache.invalidate("driver")
+        self.assertEqual(cache.get_many("driver", [1])[1], [1])
+        self.assertEqual(cache.get_many("vehicle", [1])[1], [])
+
+
+class ServiceCacheTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        departure = datetime.now() + timedelta(days=10)
+        self.vehicle_id = self.add_vehicle(capacity=50)
+        route_id = self.add_route()
+        self.passenger_ids = self.add_passengers(10)
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            self.trip_ids = []
+            for offset in range(3):
+                cursor.execute("""
+                    INSERT INTO Trips (VehicleID, RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers)
+                    VALUES (%s, %s, %s, %s, 'Scheduled', 50)
+                """, (self.vehicle_id, route_id, (departure + timedelta(days=offset)).strftime(FMT),
+                      (departure + timedelta(days=offset, hours=2)).strftime(FMT)))
+                self.trip_ids.append(cursor.lastrowid)
+            conn.commit()
+
+    def test_repeated_bookings_read_passengers_once(self):
+        for trip_id in self.trip_ids:
+            results = self.service.book_trip_batch(trip_id, self.passenger_ids)
+            self.assertTrue(all(outcome == BOOKED for outcome in results.values()))
+        stats = self.service.cache_stats()
+        self.assertEqual(stats["misses"], len(self.passenger_ids))
+        self.assertEqual(stats["hits"], 2 * len(self.passenger_ids))
+
+    def test_vehicle_writes_invalidate(self):
+        self.assertEqual(self.service._get_vehicle_row(self.vehicle_id)[1], "M")
+        vehicle = type("V", (), {"vehicle_id": self.vehicle_id})()
+        with patch("builtins.input", side_effect=["M2", "", ""]):
+            self.assertTrue(self.service.update_vehicle(vehicle))
+        self.assertEqual(self.service._get_vehicle_row(self.vehicle_id)[1], "M2")
+
+    def test_status_updater_invalidates_changed_rows(self):
+        self.service._get_vehicle_row(self.vehicle_id)
+        with self.service.pool.connection() as conn:
+            conn.cursor().execute("UPDATE Vehicles SET Status = 'On Trip' WHERE VehicleID = %s", (self.vehicle_id,))
+            conn.commit()
+        self.assertEqual(self.service._get_vehicle_row(self.vehicle_id)[4], "Available")  # cached
+
+        self.service.auto_update_vehicle_statuses()
+        self.assertEqual(self.service.entity_cache.get_many("vehicle", [self.vehicle_id])[1], [self.vehicle_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import random
+import threading
+import unittest
+from datetime import datetime, timedelta
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from test_tm.service_test_case import ServiceTestCase
+from util.IntervalIndex import IntervalIndex, ScheduleIndex, REST_BUFFER
+
+BASE = datetime(2099, 1, 1)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def brute_force_conflict(trips, departure, arrival):
+    """The original per-trip scan used by schedule_trip and allocate_driver."""
+    return any(departure <= existing_arr + REST_BUFFER and arrival >= existing_dep
+               for existing_dep, existing_arr in trips)
+
+
+class IntervalIndexTest(unittest.TestCase):
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        index = IntervalIndex()
+        trips = {}
+        for trip_id in range(300):
+            departure = BASE + timedelta(hours=rng.randint(0, 24 * 365))
+            arrival = departure + timedelta(hours=rng.randint(1, 24 * 20))
+            index.add(trip_id, departure, arrival)
+            trips[trip_id] = (departure, arrival)
+        for trip_id in rng.sample(sorted(trips), 100):
+            self.assertTrue(index.remove(trip_id))
+            del trips[trip_id]
+
+        for _ in range(2000):
+            departure = BASE + timedelta(hours=rng.randint(-24 * 10, 24 * 380))
+            arrival = departure + timedelta(hours=rng.randint(1, 24 * 5))
+            conflict = index.find_conflict(departure, arrival)
+            self.assertEqual(conflict is not None, brute_force_conflict(trips.values(), departure, arrival))
+
+    def test_boundaries_and_exclusion(self):
+        index = IntervalIndex()
+        index.add(1, BASE, BASE + timedelta(days=1))
+        rest_end = BASE + timedelta(days=1) + REST_BUFFER
+
+        self.assertIsNotNone(index.find_conflict(rest_end, rest_end + timedelta(hours=1)))
+        self.assertIsNone(index.find_conflict(rest_end + timedelta(seconds=1), rest_end + timedelta(hours=1)))
+        self.assertIsNotNone(index.find_conflict(BASE - timedelta(hours=1), BASE))
+        self.assertIsNone(index.find_conflict(BASE - timedelta(hours=1), BASE, exclude_trip_id=1))
+
+
+class ScheduleIndexTest(unittest.TestCase):
+    def test_expired_indexes_are_reloaded(self):
+        now = [0.0]
+        rows = [(1, BASE, BASE + timedelta(days=1))]
+        loads = []
+
+        def loader(resource_id, cursor):
+            loads.append(resource_id)
+            return list(rows)
+
+        schedule = ScheduleIndex(loader, ttl=10.0, clock=lambda: now[0])
+        later = BASE + timedelta(days=20)
+        self.assertTrue(schedule.is_free(7, later, later + timedelta(days=1)))
+        rows.append((2, later, later + timedelta(days=1)))   # written by another process
+        now[0] = 9.0
+        self.assertTrue(schedule.is_free(7, later, later + timedelta(days=1)))
+        now[0] = 10.0
+        self.assertFalse(schedule.is_free(7, later, later + timedelta(days=1)))
+        self.assertEqual(loads, [7, 7])
+
+    def test_a_trip_added_during_a_load_is_not_lost(self):
+        late = BASE + timedelta(days=20)
+        committed = []
+
+        def loader(resource_id, cursor):
+            rows = list(committed)
+            if not committed:
+                # Another thread commits and records a trip while this read is running
+                committed.append((2, late, late + timedelta(days=1)))
+                schedule.add(resource_id, 2, late, late + timedelta(days=1))
+            return rows
+
+        schedule = ScheduleIndex(loader)
+        self.assertFalse(schedule.is_free(7, late, late + timedelta(hours=1)))
+
+    def test_loads_of_other_resources_do_not_wait(self):
+        started, release = threading.Event(), threading.Event()
+
+        def loader(resource_id, cursor):
+            if resource_id == 1:
+                started.set()
+                release.wait(5)
+            return []
+
+        schedule = ScheduleIndex(loader)
+        slow = threading.Thread(target=schedule.is_free, args=(1, BASE, BASE))
+        slow.start()
+        try:
+            self.assertTrue(started.wait(5))
+            self.assertTrue(schedule.is_free(2, BASE, BASE))   # would block behind a global lock
+        finally:
+            release.set()
+            slow.join()
+        self.assertEqual(schedule.loaded_count(), 2)
+
+
+class ScheduleIndexServiceTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.vehicle_id = self.add_vehicle()
+        self.route_id = self.add_route()
+
+    def schedule(self, day):
+        departure = BASE + timedelta(days=day)
+        return self.service.schedule_trip(self.vehicle_id, self.route_id, departure.strftime(FMT),
+                                          (departure + timedelta(days=1)).strftime(FMT))
+
+    def trip_id_on(self, day):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT TripID FROM Trips WHERE DepartureDate = %s",
+                           ((BASE + timedelta(days=day)).strftime(FMT),))
+            return cursor.fetchone()[0]
+
+    def test_schedule_and_cancel_keep_index_current(self):
+        self.assertTrue(self.schedule(0))
+        self.assertFalse(self.schedule(3))   # inside the rest buffer of the first trip
+        self.assertTrue(self.schedule(5))
+        self.assertEqual(self.service.vehicle_schedule.loaded_count(), 1)
+
+        self.service.cancel_trip(self.trip_id_on(0))
+        self.assertTrue(self.schedule(-2))   # freed by the cancellation
+
+    def test_trips_written_outside_the_service_are_seen_after_invalidate(self):
+        self.assertTrue(self.schedule(0))
+        with self.service.pool.connection() as conn:
+            conn.cursor().execute("""
+                INSERT INTO Trips (VehicleID, RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers)
+                VALUES (%s, %s, %s, %s, 'Scheduled', 10)
+            """, (self.vehicle_id, self.route_id, (BASE + timedelta(days=10)).strftime(FMT),
+                  (BASE + timedelta(days=11)).strftime(FMT)))
+            conn.commit()
+
+        self.service.vehicle_schedule.invalidate()
+        self.assertFalse(self.schedule(12))
+
+    def test_trips_scheduled_by_another_service_are_seen_after_the_ttl(self):
+        other = TransportManagementServiceImpl(self.connection_string)
+        self.assertTrue(self.schedule(0))       # loads this service's index
+        departure = BASE + timedelta(days=10)
+        self.assertTrue(other.schedule_trip(self.vehicle_id, self.route_id, departure.strftime(FMT),
+                                            (departure + timedelta(days=1)).strftime(FMT)))
+        self.service.vehicle_schedule.ttl = 0
+        self.assertFalse(self.schedule(12))
+
+
+if __name__ == "__main__":
+    unittest.main()
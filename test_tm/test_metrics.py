@@ -0,0 +1,114 @@
+import gc
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from datetime import datetime, timedelta
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from test_tm.service_test_case import ServiceTestCase
+from util.ConnectionPool import ConnectionPool
+from util.MetricsRegistry import MetricsRegistry
+
+BASE = datetime(2099, 9, 1, 9, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class MetricsTest(ServiceTestCase):
+    @property
+    def service_options(self):
+        return {"metrics": self.metrics}
+
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+        super().setUp()
+        self.add_vehicle(capacity=1, model="Van", vehicle_type="Van")
+        self.add_drivers()
+        self.add_route()
+        self.add_passengers(3)
+
+    def tearDown(self):
+        self.metrics.stop()
+
+    def schedule(self, days):
+        departure = BASE + timedelta(days=days)
+        return self.service.schedule_trip(1, 1, departure.strftime(FMT), (departure + timedelta(hours=5)).strftime(FMT))
+
+    def test_service_operations_are_counted(self):
+        self.assertTrue(self.schedule(0))
+        self.assertFalse(self.schedule(1))  # inside the first trip's rest buffer
+        self.assertTrue(self.service.book_trip(1, 1))
+        self.assertFalse(self.service.book_trip(1, 2))  # the van has one seat
+        self.assertFalse(self.service.book_trip(1, 1))
+        self.service.auto_update_vehicle_statuses()
+
+        self.assertEqual(self.metrics.get("tm_bookings_total").value(outcome="BOOKED"), 1)
+        self.assertEqual(self.metrics.get("tm_bookings_total").value(outcome="NO_SEATS"), 1)
+        self.assertEqual(self.metrics.get("tm_bookings_total").value(outcome="ALREADY_BOOKED"), 1)
+        self.assertEqual(self.metrics.get("tm_oversell_refusals_total").value(), 1)
+        self.assertEqual(self.metrics.get("tm_scheduling_conflicts_total").value(resource="vehicle"), 1)
+        self.assertEqual(self.metrics.get("tm_status_update_seconds").count(kind="vehicle"), 1)
+        self.assertEqual(self.metrics.get("tm_operation_seconds").count(operation="schedule_trip"), 2)
+
+    def test_prometheus_text_is_served_over_http(self):
+        self.schedule(0)
+        server = self.metrics.serve(port=0)
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+            text = response.read().decode()
+        self.assertIn("# TYPE tm_operation_seconds histogram", text)
+        self.assertIn('tm_operation_seconds_bucket{operation="schedule_trip",le="+Inf"} 1', text)
+        self.assertIn('tm_operation_seconds_count{operation="schedule_trip"} 1', text)
+        self.assertIn("tm_pool_open ", text)
+
+    def test_snapshot_file_is_rewritten_periodically(self):
+        self.schedule(0)
+        handle, path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        os.remove(path)
+        try:
+            self.metrics.start_snapshots(path, interval=0.05)
+            for _ in range(100):
+                if os.path.exists(path):
+                    break
+                threading.Event().wait(0.05)
+            with open(path, encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            self.assertEqual(snapshot["metrics"]["tm_operation_seconds"]["values"]["schedule_trip"]["count"], 1)
+        finally:
+            self.metrics.stop()
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_pool_waits_are_observed(self):
+        pool = ConnectionPool(lambda: object(), max_size=1)
+        waits = []
+        pool.add_wait_listener(waits.append)
+        pool.add_wait_listener(waits.append)
+        conn = pool.acquire()
+        threading.Timer(0.05, pool.release, (conn, True)).start()
+        pool.release(pool.acquire(timeout=5), discard=True)
+        self.assertEqual(len(waits), 1)
+        self.assertGreater(waits[0], 0)
+
+        pool.remove_wait_listener(waits.append)
+        conn = pool.acquire()
+        threading.Timer(0.05, pool.release, (conn, True)).start()
+        pool.release(pool.acquire(timeout=5), discard=True)
+        self.assertEqual(len(waits), 1)
+
+    def test_pool_wait_listener_is_registered_once_and_held_weakly(self):
+        pool = self.service.pool
+        TransportManagementServiceImpl(self.connection_string, metrics=self.metrics)
+        self.assertEqual(len(pool._live_wait_listeners()), 1)
+
+        other = MetricsRegistry()
+        TransportManagementServiceImpl(self.connection_string, metrics=other)
+        self.assertEqual(len(pool._live_wait_listeners()), 2)
+        del other
+        gc.collect()
+        self.assertEqual(len(pool._live_wait_listeners()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
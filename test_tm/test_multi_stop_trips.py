@@ -0,0 +1,144 @@
+import random
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from dao.TransportManagementServiceImpl import (TransportManagementServiceImpl, BOOKED, NO_SEATS,
+                                                INVALID_SEGMENT)
+from test_tm.service_test_case import ServiceTestCase
+from util.SegmentTree import LegInventory, SegmentTree
+
+BASE = datetime(2099, 9, 1, 6, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class SegmentTreeTest(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(19)
+        values = [rng.randint(0, 5) for _ in range(37)]
+        tree = SegmentTree(values)
+        for _ in range(2000):
+            start = rng.randrange(len(values))
+            end = rng.randint(start + 1, len(values))
+            if rng.random() < 0.5:
+                delta = rng.randint(-3, 3)
+                tree.range_add(start, end, delta)
+                for position in range(start, end):
+                    values[position] += delta
+            else:
+                self.assertEqual(tree.range_max(start, end), max(values[start:end]))
+        self.assertRaises(ValueError, tree.range_max, 3, 3)
+
+    def test_leg_inventory_is_bounded_and_rereads_trips_without_legs(self):
+        legs = {1: [1, 2], 2: [0, 1], 3: []}
+        loaded = []
+
+        def loader(trip_id, cursor):
+            loaded.append(trip_id)
+            return legs[trip_id]
+        inventory = LegInventory(loader, max_trips=1)
+        self.assertIsNone(inventory.get(3))
+        self.assertIsNone(inventory.get(3))
+        inventory.get(1)
+        inventory.get(1)
+        inventory.get(2)
+        inventory.get(1)
+        self.assertEqual(loaded, [3, 3, 1, 2, 1])
+        inventory.ttl = 0
+        inventory.get(1)
+        self.assertEqual(loaded[-1], 1)
+        self.assertEqual(len(loaded), 6)
+
+
+class MultiStopTripTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        vehicle_id = self.add_vehicle(capacity=2, model="Mini")
+        route_id = self.add_route("A", "D", 300)
+        self.add_passengers(6)
+        self.assertTrue(self.service.schedule_trip(vehicle_id, route_id, BASE.strftime(FMT),
+                                                   (BASE + timedelta(hours=9)).strftime(FMT)))
+        self.trip_id = 1
+        hours = lambda h: BASE + timedelta(hours=h)
+        self.assertTrue(self.service.add_trip_stops(self.trip_id, [
+            ("A", None, hours(0)), ("B", hours(3), hours(3)), ("C", hours(6), hours(6)), ("D", hours(9), None)]))
+
+    def book(self, passenger_id, from_stop, to_stop):
+        return self.service.book_trip_batch(self.trip_id, [passenger_id], BASE - timedelta(days=3),
+                                            from_stop, to_stop)[passenger_id]
+
+    def test_seats_are_resold_after_passengers_get_off(self):
+        # Two seats: A-B sells out, but both seats can be sold again from B
+        self.assertEqual(self.book(1, "A", "B"), BOOKED)
+        self.assertEqual(self.book(2, 0, 1), BOOKED)
+        self.assertEqual(self.book(3, "a", "c"), NO_SEATS)
+        self.assertEqual(self.book(3, "B", "D"), BOOKED)
+        self.assertEqual(self.book(4, "C", "D"), BOOKED)
+        self.assertEqual(self.book(5, "B", "D"), NO_SEATS)
+        self.assertEqual(self.service.seats_available(self.trip_id, "B", "C"), 1)
+        self.assertEqual(self.service.seats_available(self.trip_id), 0)
+        self.assertEqual([leg["seats_booked"] for leg in self.service.get_trip_legs(self.trip_id)], [2, 1, 2])
+
+        self.assertEqual(self.book(6, "C", "B"), INVALID_SEGMENT)
+        self.assertEqual(self.book(6, "A", "Z"), INVALID_SEGMENT)
+
+        self.service.cancel_booking(1)
+        self.assertEqual(self.service.seats_available(self.trip_id), 0)
+        self.assertEqual(self.service.seats_available(self.trip_id, "A", "C"), 1)
+        self.assertEqual(self.book(5, None, "C"), BOOKED)
+
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT SeatsBooked FROM Trips WHERE TripID = %s", (self.trip_id,))
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_rebuild_matches_live_counts(self):
+        rng = random.Random(3)
+        for passenger_id in range(1, 7):
+            first = rng.randint(0, 2)
+            self.book(passenger_id, first, rng.randint(first + 1, 3))
+        live = [leg["seats_booked"] for leg in self.service.get_trip_legs(self.trip_id)]
+
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE trip_legs SET SeatsBooked = 0")
+            conn.commit()
+        self.service.rebuild_seat_inventory()
+
+        self.assertEqual([leg["seats_booked"] for leg in self.service.get_trip_legs(self.trip_id)], live)
+        self.assertEqual(self.service.seats_available(self.trip_id), 2 - max(live))
+
+    def test_stops_added_by_another_service_are_seen(self):
+        departure = BASE + timedelta(days=10)
+        self.assertTrue(self.service.schedule_trip(1, 1, departure.strftime(FMT),
+                                                   (departure + timedelta(hours=9)).strftime(FMT)))
+        self.assertEqual(self.service.seats_available(2), 2)
+        # Another process turns the trip into a multi-stop one after this one looked at it
+        other = TransportManagementServiceImpl(self.connection_string)
+        self.assertTrue(other.add_trip_stops(2, [("A", None, departure), ("B", departure + timedelta(hours=3), None)]))
+
+        self.assertEqual(self.service.book_trip_batch(2, [1, 2], BASE, "A", "B"), {1: BOOKED, 2: BOOKED})
+        self.assertEqual(other.book_trip_batch(2, [3], BASE)[3], NO_SEATS)
+        self.assertEqual([leg["seats_booked"] for leg in other.get_trip_legs(2)], [2])
+
+    def test_committed_changes_survive_a_dropped_tree(self):
+        # Another thread drops the trip's tree between commit and the cache update
+        inventory, range_add = self.service.leg_inventory, self.service.leg_inventory.range_add
+
+        def dropped_then_add(*args):
+            inventory.invalidate(self.trip_id)
+            return range_add(*args)
+        with patch.object(inventory, "range_add", dropped_then_add):
+            self.assertEqual(self.book(1, "A", "C"), BOOKED)
+            self.assertTrue(self.service.cancel_booking(1))
+            self.assertEqual(self.book(2, "B", "D"), BOOKED)
+        inventory.invalidate(self.trip_id)
+        self.assertEqual(self.service.seats_available(self.trip_id, "B", "D"), 1)
+        self.assertEqual([leg["seats_booked"] for leg in self.service.get_trip_legs(self.trip_id)], [0, 1, 1])
+
+    def test_stops_rejected_once_booked(self):
+        self.assertEqual(self.book(1, "A", "B"), BOOKED)
+        self.assertFalse(self.service.add_trip_stops(self.trip_id, [("A", None, BASE), ("D", BASE, None)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
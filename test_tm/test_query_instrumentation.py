@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from exception.CustomExceptions import QueryBudgetExceededException
+from test_tm.service_test_case import ServiceTestCase
+from util.QueryInstrumentation import QueryInstrumentation
+
+BASE = datetime(2099, 8, 1, 9, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class QueryInstrumentationTest(ServiceTestCase):
+    @property
+    def service_options(self):
+        return {"instrumentation": self.instrumentation}
+
+    def setUp(self):
+        handle, self.log_path = tempfile.mkstemp(suffix=".log")
+        os.close(handle)
+        self.instrumentation = QueryInstrumentation(slow_query_ms=0, slow_query_log=self.log_path)
+        super().setUp()
+        for _ in range(50):
+            self.add_vehicle(capacity=40, model="Bus")
+        self.add_drivers(50)
+        self.add_route()
+        self.add_passengers(5)
+        self.instrumentation.reset()
+        open(self.log_path, "w").close()
+
+    def tearDown(self):
+        os.remove(self.log_path)
+
+    def test_statements_are_attributed_to_the_outermost_method(self):
+        departure = BASE + timedelta(days=10)
+        self.assertTrue(self.service.schedule_trip(1, 1, departure.strftime(FMT),
+                                                   (departure + timedelta(hours=5)).strftime(FMT)))
+        self.assertTrue(self.service.book_trip(1, 1, BASE))
+        self.assertEqual(len(self.service.get_bookings_by_trip(1)), 1)
+        self.assertEqual(len(list(self.service.iter_bookings_by_trip(1))), 1)
+
+        stats = self.instrumentation.stats()
+        self.assertNotIn("book_trip_batch", stats)
+        self.assertEqual(stats["book_trip"]["calls"], 1)
+        self.assertGreaterEqual(stats["book_trip"]["statements"], 3)
+        self.assertEqual(stats["get_bookings_by_trip"]["rows"], 1)
+        self.assertEqual((stats["iter_bookings_by_trip"]["calls"], stats["iter_bookings_by_trip"]["rows"]), (1, 1))
+        self.assertTrue(any(sql.startswith("INSERT INTO Bookings") for sql in stats["book_trip"]["queries"]))
+
+    def test_slow_query_log_redacts_parameters(self):
+        departure = BASE + timedelta(days=10)
+        self.service.schedule_trip(1, 1, departure.strftime(FMT), (departure + timedelta(hours=5)).strftime(FMT))
+        self.service.book_trip(1, 1, BASE)
+        with open(self.log_path, encoding="utf-8") as handle:
+            entries = [json.loads(line) for line in handle]
+        self.assertTrue(entries)
+        self.assertEqual(self.instrumentation.slow_queries, len(entries))
+        for entry in entries:
+            self.assertNotIn("2099-08-11", json.dumps(entry))
+        booking_lookup = [entry for entry in entries if entry["method"] == "book_trip"][0]
+        self.assertIn("int", booking_lookup["params"])
+        self.assertTrue(all(isinstance(kind, str) for kind in booking_lookup["params"]))
+
+    def test_status_updaters_stay_within_budget(self):
+        for vehicle_id in range(1, 51):
+            departure = BASE - timedelta(hours=vehicle_id)
+            self.service.schedule_trip(vehicle_id, 1, departure.strftime(FMT),
+                                       (departure + timedelta(hours=2 * vehicle_id)).strftime(FMT))
+        # Set-based updates: the statement count does not grow with the number of rows
+        with self.instrumentation.query_budget(3):
+            self.service.auto_update_vehicle_statuses(BASE)
+            self.service.auto_update_driver_statuses(BASE)
+
+        with self.assertRaises(QueryBudgetExceededException):
+            with self.instrumentation.query_budget(1):
+                self.service.book_trip_batch(2, [1, 2, 3], BASE - timedelta(days=100))
+
+
+if __name__ == "__main__":
+    unittest.main()
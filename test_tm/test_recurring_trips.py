@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime, timedelta
+from dao.RecurringTripPlanner import RecurringTripPlanner
+from exception.CustomExceptions import InvalidTripDataException
+from test_tm.service_test_case import ServiceTestCase
+
+NOW = datetime(2099, 3, 2, 6, 0, 0)  # a Monday
+
+
+class RecurringTripPlannerTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.planner = RecurringTripPlanner(self.service, batch_size=4, clock=lambda: NOW)
+        self.vehicle_id = self.add_vehicle(capacity=40)
+        self.route_id = self.add_route()
+
+    def departures(self):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DepartureDate FROM Trips WHERE Status = 'Scheduled' ORDER BY DepartureDate")
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_expands_only_up_to_the_rolling_horizon(self):
+        self.planner.add_template(self.vehicle_id, self.route_id, "09:30", 120, "WEEKLY:MON,THU",
+                                  "2099-01-01", horizon_days=14)
+        summary = self.planner.expand()
+
+        # Mondays and Thursdays in [NOW, NOW + 14 days): 2, 5, 9, 12 March. Thursdays sit
+        # within the 3-day rest buffer of the Monday run, so the conflict check keeps Mondays.
+        self.assertEqual(self.departures(), [datetime(2099, 3, 2, 9, 30), datetime(2099, 3, 9, 9, 30)])
+        self.assertEqual(summary["created"], 2)
+        self.assertEqual(len(summary["rejected"]), 2)
+        self.assertTrue(all(rejection["template_id"] == 1 for rejection in summary["rejected"]))
+
+        # Running again the same day creates nothing; a week later the window rolls forward
+        self.assertEqual(self.planner.expand()["created"], 0)
+        self.assertEqual(self.planner.expand(NOW + timedelta(days=7))["created"], 1)
+        self.assertEqual(self.departures()[-1], datetime(2099, 3, 16, 9, 30))
+
+    def test_end_date_and_weekly_spacing(self):
+        self.planner.add_template(self.vehicle_id, self.route_id, "07:00:00", 60, "WEEKLY:WED",
+                                  "2099-03-01", end_date="2099-03-20", horizon_days=60)
+        self.assertEqual(self.planner.expand()["created"], 3)  # 4, 11, 18 March
+        self.assertEqual(self.planner.expand(NOW + timedelta(days=30))["created"], 0)
+
+    def test_end_date_on_a_run_day_is_included(self):
+        self.planner.add_template(self.vehicle_id, self.route_id, "07:00:00", 60, "WEEKLY:WED",
+                                  "2099-03-01", end_date="2099-03-18", horizon_days=60)
+        self.assertEqual(self.planner.expand()["created"], 3)  # 4, 11 and 18 March
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DepartureDate FROM Trips ORDER BY DepartureDate DESC LIMIT 1")
+            self.assertEqual(cursor.fetchone()[0], datetime(2099, 3, 18, 7, 0, 0))
+
+    def test_invalid_templates_are_rejected(self):
+        for args in (("25:00", 60, "DAILY"), ("08:00", 0, "DAILY"), ("08:00", 60, "FORTNIGHTLY"),
+                     ("08:00", 60, "WEEKLY:FUNDAY")):
+            with self.assertRaises(InvalidTripDataException):
+                self.planner.add_template(self.vehicle_id, self.route_id, *args, "2099-03-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
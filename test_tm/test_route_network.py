@@ -0,0 +1,80 @@
+import unittest
+from datetime import datetime, timedelta
+from dao.RouteNetwork import RouteNetwork
+from test_tm.service_test_case import ServiceTestCase
+
+BASE = datetime(2099, 11, 1, 6, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class RouteNetworkTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.network = RouteNetwork(self.service)
+        self.routes = {}
+        for start, end, distance in (("Chennai", "Vellore", 140), ("Vellore", "Bangalore", 210),
+                                     ("Chennai", "Bangalore", 400), ("Bangalore", "Mysore", 145),
+                                     ("Chennai", "Pondicherry", 150)):
+            self.routes[(start, end)] = self.add_route(start, end, distance)
+        self.vehicles = []
+
+    def add_trip(self, route, depart_hours, duration_hours):
+        # A fresh vehicle per trip keeps the rest-buffer rule out of these tests
+        vehicle_id = self.add_vehicle(capacity=40)
+        departure = BASE + timedelta(hours=depart_hours)
+        self.assertTrue(self.service.schedule_trip(vehicle_id, self.routes[route], departure.strftime(FMT),
+                                                   (departure + timedelta(hours=duration_hours)).strftime(FMT)))
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(TripID) FROM Trips")
+            return cursor.fetchone()[0]
+
+    def test_shortest_path_and_rebuild_on_route_change(self):
+        path = self.network.shortest_path(" chennai", "MYSORE")
+        self.assertEqual(path["stops"], ["Chennai", "Vellore", "Bangalore", "Mysore"])
+        self.assertEqual(path["distance"], 495)
+        self.assertIsNone(self.network.shortest_path("Mysore", "Chennai"))
+        self.assertIsNone(self.network.shortest_path("Chennai", "Nowhere"))
+
+        # A new shortcut is only seen once the service reports a route change
+        self.add_route("Chennai", "Mysore", 300)
+        self.assertEqual(self.network.shortest_path("Chennai", "Mysore")["distance"], 495)
+        self.service.invalidate_routes()
+        path = self.network.shortest_path("Chennai", "Mysore")
+        self.assertEqual((path["distance"], path["stops"]), (300, ["Chennai", "Mysore"]))
+
+    def test_plan_journey_uses_connections(self):
+        direct = self.add_trip(("Chennai", "Bangalore"), 0, 9)
+        first = self.add_trip(("Chennai", "Vellore"), 0, 3)
+        too_tight = self.add_trip(("Vellore", "Bangalore"), 3, 4)
+        second = self.add_trip(("Vellore", "Bangalore"), 4, 4)
+
+        journey = self.network.plan_journey("Chennai", "Bangalore", BASE)
+        self.assertEqual([leg["trip_id"] for leg in journey["legs"]], [first, second])
+        self.assertEqual(journey["arrival_date"], BASE + timedelta(hours=8))
+        self.assertNotIn(too_tight, [leg["trip_id"] for leg in journey["legs"]])
+
+        self.assertEqual([leg["trip_id"] for leg in
+                          self.network.plan_journey("Chennai", "Bangalore", BASE, max_legs=1)["legs"]], [direct])
+
+        # Cancelling a leg invalidates the cached timetable
+        self.service.cancel_trip(second)
+        journey = self.network.plan_journey("Chennai", "Bangalore", BASE)
+        self.assertEqual([leg["trip_id"] for leg in journey["legs"]], [direct])
+        self.assertIsNone(self.network.plan_journey("Chennai", "Mysore", BASE))
+
+    def test_plan_journey_with_tied_parallel_trips(self):
+        # Two routes between the same stops whose trips arrive at the same minute
+        self.routes[("Chennai", "Vellore", "bypass")] = self.add_route("Chennai", "Vellore", 160)
+        self.service.invalidate_routes()
+        self.add_trip(("Chennai", "Vellore"), 0, 3)
+        self.add_trip(("Chennai", "Vellore", "bypass"), 0, 3)
+        onward = self.add_trip(("Vellore", "Bangalore"), 4, 4)
+
+        journey = self.network.plan_journey("Chennai", "Bangalore", BASE)
+        self.assertEqual(journey["legs"][-1]["trip_id"], onward)
+        self.assertEqual(journey["arrival_date"], BASE + timedelta(hours=8))
+
+
+if __name__ == "__main__":
+    unittest.main()
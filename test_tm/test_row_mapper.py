@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime, timedelta
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from entity.Booking import Booking
+from entity.Trip import Trip
+from entity.Vehicle import Vehicle
+from util.DBConnUtil import DBConnUtil
+from util.RowMapper import RowMapper
+
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class FakeCursor:
+    def __init__(self, *columns):
+        self.description = [(column, None, None, None, None, None, None) for column in columns]
+
+
+class RowMapperTest(unittest.TestCase):
+    def test_maps_by_column_name(self):
+        cursor = FakeCursor("BookingID", "PassengerID", "TripID", "BookingDate", "Status")
+        booking = RowMapper.map_one(cursor, Booking, (1, 20, 300, None, "BOOKED"))
+        self.assertEqual((booking.booking_id, booking.passenger_id, booking.trip_id), (1, 20, 300))
+
+        cursor = FakeCursor("tripid", "status")
+        trip = RowMapper.map_rows(cursor, Trip, [(7, "Scheduled")])[0]
+        self.assertEqual((trip.trip_id, trip.status, trip.vehicle_id), (7, "Scheduled", None))
+
+    def test_entities_are_slotted(self):
+        vehicle = Vehicle(1, "M", 10, "Bus", "Available")
+        vehicle.status = "On Trip"
+        self.assertEqual(vehicle.status, "On Trip")
+        self.assertFalse(hasattr(vehicle, "__dict__"))
+        with self.assertRaises(AttributeError):
+            vehicle.colour = "red"
+
+
+class BookingColumnOrderTest(unittest.TestCase):
+    def test_bookings_by_passenger_keep_trip_and_passenger_apart(self):
+        connection_string = "sqlite:///:memory:?name=test_row_mapper"
+        DBConnUtil.create_tables(connection_string)
+        service = TransportManagementServiceImpl(connection_string)
+        departure = (datetime.now() + timedelta(days=5)).strftime(FMT)
+        with service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO Routes (StartDestination, EndDestination, Distance) VALUES ('A', 'B', 1)")
+            route_id = cursor.lastrowid
+            for _ in range(3):  # make TripID and PassengerID differ
+                cursor.execute("""
+                    INSERT INTO Trips (RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers)
+                    VALUES (%s, %s, %s, 'Scheduled', 5)
+                """, (route_id, departure, departure))
+            trip_id = cursor.lastrowid
+            cursor.execute("INSERT INTO Passengers (FirstName, Email) VALUES ('P', 'p@example.com')")
+            passenger_id = cursor.lastrowid
+            conn.commit()
+
+        service.book_trip(trip_id, passenger_id)
+        for bookings in (service.get_bookings_by_passenger(passenger_id), service.get_bookings_by_trip(trip_id)):
+            self.assertEqual([(b.trip_id, b.passenger_id) for b in bookings], [(trip_id, passenger_id)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from dao.ScriptRunner import ScriptRunner
+from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from test_tm.service_test_case import ServiceTestCase
+from util.MetricsRegistry import MetricsRegistry
+
+
+class ScriptRunnerTest(ServiceTestCase):
+    service_options = {"interactive": False}
+
+    def setUp(self):
+        super().setUp()
+        self.add_drivers(2)
+        self.add_route()
+        self.add_passengers(500)
+        self.paths = []
+
+    def tearDown(self):
+        for path in self.paths:
+            os.remove(path)
+
+    def write_script(self, suffix, records):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        os.close(handle)
+        self.paths.append(path)
+        with open(path, "w", newline="", encoding="utf-8") as script:
+            if suffix == ".csv":
+                writer = csv.DictWriter(script, fieldnames=sorted({key for record in records for key in record}))
+                writer.writeheader()
+                writer.writerows(records)
+            else:
+                script.writelines(json.dumps(record) + "\n" for record in records)
+        return path
+
+    def run_script(self, path, workers=4):
+        output, log = io.StringIO(), io.StringIO()
+        with patch("builtins.input", side_effect=AssertionError("prompted")):
+            summary = ScriptRunner(self.service, workers=workers).run(path, output, log=log)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(lines[-1], {"summary": summary})
+        return lines[:-1], summary
+
+    def test_jsonl_script_runs_without_prompts(self):
+        path = self.write_script(".jsonl", [
+            {"op": "add_vehicle", "model": "Bus", "capacity": 2, "type": "Bus", "status": "Available"},
+            {"op": "add_vehicle", "model": "Van", "capacity": 9, "type": "Van", "status": "Parked"},
+            {"op": "schedule_trip", "vehicle_id": 1, "route_id": 1,
+             "departure_date": "2099-05-01 08:00:00", "arrival_date": "2099-05-01 12:00:00"},
+            {"op": "schedule_trip", "vehicle_id": 1, "route_id": 1,
+             "departure_date": "2099-05-02 08:00:00", "arrival_date": "2099-05-02 12:00:00"},
+            {"op": "book_trip", "trip_id": 1, "passenger_id": 1},
+            {"op": "book_trip", "trip_id": 1, "passenger_id": 1},
+            {"op": "book_trip", "trip_id": 1, "passenger_id": 2},
+            {"op": "book_trip", "trip_id": 1, "passenger_id": 3},
+            {"op": "teleport", "trip_id": 1},
+            {"op": "allocate_driver", "trip_id": 1, "driver_id": 1},
+            {"op": "allocate_driver", "trip_id": 1, "driver_id": 2},
+            {"op": "update_vehicle", "vehicle_id": 1, "model": "Coach"},
+            {"op": "cancel_booking", "booking_id": 1},
+            {"op": "deallocate_driver", "trip_id": 1},
+            {"op": "delete_vehicle", "vehicle_id": 7},
+        ])
+        results, summary = self.run_script(path)
+
+        self.assertEqual([result["line"] for result in results], list(range(1, 16)))
+        self.assertEqual([result["ok"] for result in results],
+                         [True, False, True, False, True, False, True, False, False, True, True, True, True, True, False])
+        self.assertEqual(results[0]["vehicle_id"], 1)
+        self.assertIn("status", results[1]["error"].lower())
+        self.assertEqual(results[2]["trip_id"], 1)
+        self.assertEqual([result.get("outcome") for result in results[4:8]],
+                         ["BOOKED", "ALREADY_BOOKED", "BOOKED", "NO_SEATS"])
+        self.assertIn("Unknown operation", results[8]["error"])
+        self.assertEqual((summary["operations"], summary["succeeded"], summary["failed"]), (15, 9, 6))
+
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT Model FROM Vehicles WHERE VehicleID = 1")
+            self.assertEqual(cursor.fetchone()[0], "Coach")
+            cursor.execute("SELECT DriverID, SeatsBooked FROM Trips WHERE TripID = 1")
+            self.assertEqual(cursor.fetchone(), (None, 1))
+
+    def test_csv_bookings_are_batched_per_trip(self):
+        records = [{"op": "add_vehicle", "model": "Bus", "capacity": 60, "type": "Bus", "status": "Available"}
+                   for _ in range(8)]
+        records += [{"op": "schedule_trip", "vehicle_id": vehicle_id, "route_id": 1,
+                     "departure_date": "2099-06-01 08:00:00", "arrival_date": "2099-06-01 18:00:00"}
+                    for vehicle_id in range(1, 9)]
+        records += [{"op": "book_trip", "trip_id": 1 + n % 8, "passenger_id": 1 + n % 500} for n in range(1200)]
+        results, summary = self.run_script(self.write_script(".csv", records), workers=8)
+
+        outcomes = [result.get("outcome") for result in results[16:]]
+        self.assertEqual(outcomes.count("BOOKED"), 8 * 60)
+        # Passenger n % 500 comes back to the same trip 1000 bookings later
+        self.assertEqual(outcomes.count("ALREADY_BOOKED"), 200)
+        self.assertEqual(outcomes.count("NO_SEATS"), 1200 - 200 - 8 * 60)
+        self.assertLessEqual(summary["groups"], 5)
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM Bookings")
+            self.assertEqual(cursor.fetchone()[0], 8 * 60)
+
+    def test_vehicle_adds_go_through_the_service(self):
+        metrics = MetricsRegistry()
+        self.service = TransportManagementServiceImpl(self.connection_string, metrics=metrics, interactive=False)
+        path = self.write_script(".jsonl", [
+            {"op": "add_vehicle", "model": "Bus", "capacity": 30, "type": "Bus", "status": "Available"},
+            {"op": "add_vehicle", "model": "", "capacity": 30, "type": "Bus", "status": "Available"},
+            {"op": "add_vehicle", "model": "Van", "capacity": "8", "type": "Van", "status": "Available"},
+        ])
+        results, _ = self.run_script(path)
+        self.assertEqual([result.get("vehicle_id") for result in results], [1, None, 2])
+        operations = metrics.snapshot()["metrics"]["tm_operation_seconds"]["values"]
+        self.assertEqual(operations["add_vehicles_bulk"]["count"], 1)
+
+    def test_a_failing_group_does_not_stop_the_script(self):
+        path = self.write_script(".jsonl", [
+            {"op": "add_vehicle", "model": "Bus", "capacity": 30, "type": "Bus", "status": "Available"},
+            {"op": "schedule_trip", "vehicle_id": 1, "route_id": 1,
+             "departure_date": "2099-05-01 08:00:00", "arrival_date": "2099-05-01 12:00:00"},
+            {"op": "book_trip", "trip_id": 1, "passenger_id": 1},
+        ])
+        with patch.object(self.service, "schedule_trips_bulk", side_effect=RuntimeError("database went away")):
+            results, summary = self.run_script(path)
+        self.assertEqual([result["ok"] for result in results], [True, False, False])
+        self.assertEqual(results[1]["error"], "database went away")
+        self.assertEqual(summary["operations"], 3)
+
+    def test_interactive_service_is_refused(self):
+        with self.assertRaises(ValueError):
+            ScriptRunner(TransportManagementServiceImpl(self.connection_string))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from util.DBConnUtil import DBConnUtil
+from util.SQLiteBackend import SQLiteBackend
+
+
+class SQLiteBackendTest(unittest.TestCase):
+    def test_connection_string_selects_backend(self):
+        backend = DBConnUtil.get_backend("sqlite:///:memory:?name=backend_select")
+        self.assertIsInstance(backend, SQLiteBackend)
+        self.assertTrue(backend.in_memory)
+        self.assertIs(backend, DBConnUtil.get_backend("sqlite:///:memory:?name=backend_select"))
+
+    def test_pooled_connections_share_in_memory_database(self):
+        backend = SQLiteBackend(":memory:")
+        first, second = backend.connect(), backend.connect()
+        backend.create_tables(first)
+        first.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES (%s, %s, %s)",
+                      ("A", "B", 10))
+        first.commit()
+        self.assertEqual(second.execute("SELECT COUNT(*) FROM routes").fetchone()[0], 1)
+        self.assertEqual(SQLiteBackend(":memory:").connect()
+                         .execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0], 0)
+        backend.close()
+
+    def test_file_database_round_trips_datetimes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "transport.db")
+            backend = SQLiteBackend(path)
+            conn = backend.connect()
+            backend.create_tables(conn)
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO vehicles (Model, Capacity, Type, Status) VALUES (%s, %s, %s, %s)",
+                           ("Bus", 40, "Bus", "Available"))
+            cursor.execute("""
+                INSERT INTO trips (VehicleID, RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers)
+                VALUES (%s, NULL, %s, %s, 'Scheduled', 40)
+            """, (cursor.lastrowid, "2099-01-01 10:00:00", datetime(2099, 1, 1, 12, 30)))
+            conn.commit()
+            conn.close()
+
+            reopened = backend.connect()
+            dep, arr = reopened.execute("SELECT DepartureDate, ArrivalDate FROM trips").fetchone()
+            reopened.close()
+            self.assertEqual(dep, datetime(2099, 1, 1, 10, 0))
+            self.assertEqual(arr, datetime(2099, 1, 1, 12, 30))
+
+
+if __name__ == "__main__":
+    unittest.main()
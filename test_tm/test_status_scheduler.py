@@ -0,0 +1,90 @@
+import unittest
+from datetime import datetime, timedelta
+from dao.StatusTransitionScheduler import StatusTransitionScheduler, VEHICLE
+from test_tm.service_test_case import ServiceTestCase
+
+NOW = datetime(2099, 3, 1, 8, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class StatusTransitionSchedulerTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.clock = {"now": NOW}
+        self.scheduler = StatusTransitionScheduler(self.service, clock=lambda: self.clock["now"])
+        self.service.status_scheduler = self.scheduler
+
+        self.vehicle_id = self.add_vehicle()
+        self.driver_id = self.add_drivers()[0]
+        self.route_id = self.add_route()
+
+    def status(self, table, key_column, key):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT Status FROM {table} WHERE {key_column} = %s", (key,))
+            return cursor.fetchone()[0]
+
+    def schedule(self, departure, arrival):
+        self.assertTrue(self.service.schedule_trip(self.vehicle_id, self.route_id,
+                                                   departure.strftime(FMT), arrival.strftime(FMT)))
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(TripID) FROM Trips")
+            return cursor.fetchone()[0]
+
+    def advance_to(self, instant):
+        self.clock["now"] = instant
+        return self.scheduler.run_due(instant)
+
+    def test_transitions_fire_at_departure_arrival_and_buffer_end(self):
+        departure, arrival = NOW + timedelta(hours=2), NOW + timedelta(hours=5)
+        trip_id = self.schedule(departure, arrival)
+        self.assertTrue(self.service.allocate_driver(trip_id, self.driver_id))
+        self.scheduler.run_due(NOW)
+        self.assertEqual(self.scheduler.next_instant(), departure)
+
+        self.assertEqual(self.advance_to(departure - timedelta(seconds=1)), 0)
+        self.advance_to(departure)
+        self.assertEqual(self.status("Vehicles", "VehicleID", self.vehicle_id), "On Trip")
+        self.assertEqual(self.status("Drivers", "DriverID", self.driver_id), "On Trip")
+
+        self.advance_to(arrival + timedelta(seconds=1))
+        self.assertEqual(self.status("Vehicles", "VehicleID", self.vehicle_id), "Maintenance")
+        self.assertEqual(self.status("Drivers", "DriverID", self.driver_id), "Resting")
+
+        self.advance_to(arrival + timedelta(days=3, seconds=1))
+        self.assertEqual(self.status("Vehicles", "VehicleID", self.vehicle_id), "Available")
+        self.assertEqual(self.status("Drivers", "DriverID", self.driver_id), "Available")
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertEqual(self.scheduler._pending, {})
+
+    def test_refresh_entries_leave_no_bookkeeping(self):
+        for _ in range(5):
+            self.scheduler.refresh(VEHICLE, self.vehicle_id)
+        self.scheduler.run_due(NOW)
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertEqual(self.scheduler._pending, {})
+
+    def test_cancelled_trip_entries_are_skipped(self):
+        departure, arrival = NOW + timedelta(hours=2), NOW + timedelta(hours=5)
+        trip_id = self.schedule(departure, arrival)
+        self.assertTrue(self.service.cancel_trip(trip_id))
+
+        self.advance_to(departure)
+        self.assertEqual(self.status("Vehicles", "VehicleID", self.vehicle_id), "Available")
+        self.advance_to(arrival + timedelta(days=4))
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_load_seeds_heap_from_existing_trips(self):
+        self.schedule(NOW - timedelta(hours=1), NOW + timedelta(hours=1))
+        self.service.status_scheduler = None
+        scheduler = StatusTransitionScheduler(self.service, clock=lambda: NOW)
+        scheduler.load(NOW)
+        self.assertEqual(self.status("Vehicles", "VehicleID", self.vehicle_id), "On Trip")
+        # departure already passed, arrival and buffer end are still pending
+        self.assertEqual(len(scheduler), 2)
+        self.assertEqual(scheduler.next_instant(), NOW + timedelta(hours=1, seconds=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
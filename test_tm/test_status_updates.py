@@ -0,0 +1,75 @@
+import unittest
+from datetime import datetime, timedelta
+from test_tm.service_test_case import ServiceTestCase
+
+NOW = datetime(2099, 6, 15, 12, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class StatusUpdateTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.route_id = self.add_route()
+
+    def add_resource_with_trip(self, departure_offset, arrival_offset, status="Available"):
+        """Create a vehicle and a driver sharing one trip placed relative to NOW."""
+        vehicle_id = self.add_vehicle(status=status)
+        driver_id = self.add_drivers(status=status)[0]
+        if departure_offset is not None:
+            with self.service.pool.connection() as conn:
+                conn.cursor().execute("""
+                    INSERT INTO Trips (VehicleID, RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers, DriverID)
+                    VALUES (%s, %s, %s, %s, 'Scheduled', 10, %s)
+                """, (vehicle_id, self.route_id, (NOW + departure_offset).strftime(FMT),
+                      (NOW + arrival_offset).strftime(FMT), driver_id))
+                conn.commit()
+        return vehicle_id, driver_id
+
+    def status_of(self, table, key_column, key):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT Status FROM {table} WHERE {key_column} = %s", (key,))
+            return cursor.fetchone()[0]
+
+    def test_statuses_follow_trip_windows(self):
+        on_trip = self.add_resource_with_trip(timedelta(hours=-1), timedelta(hours=1))
+        resting = self.add_resource_with_trip(timedelta(days=-2), timedelta(days=-1))
+        idle = self.add_resource_with_trip(timedelta(days=-10), timedelta(days=-9), status="On Trip")
+        no_trips = self.add_resource_with_trip(None, None)
+
+        vehicle_report = self.service.auto_update_vehicle_statuses(NOW)
+        driver_report = self.service.auto_update_driver_statuses(NOW)
+
+        self.assertEqual(self.status_of("Vehicles", "VehicleID", on_trip[0]), "On Trip")
+        self.assertEqual(self.status_of("Vehicles", "VehicleID", resting[0]), "Maintenance")
+        self.assertEqual(self.status_of("Vehicles", "VehicleID", idle[0]), "Available")
+        self.assertEqual(self.status_of("Vehicles", "VehicleID", no_trips[0]), "Available")
+        self.assertEqual(self.status_of("Drivers", "DriverID", on_trip[1]), "On Trip")
+        self.assertEqual(self.status_of("Drivers", "DriverID", resting[1]), "Resting")
+        self.assertEqual(self.status_of("Drivers", "DriverID", idle[1]), "Available")
+
+        # Only rows whose status changed are touched
+        self.assertEqual(vehicle_report["rows_updated"], 3)
+        self.assertEqual(driver_report["rows_updated"], 3)
+        self.assertEqual(self.service.auto_update_vehicle_statuses(NOW)["rows_updated"], 0)
+        self.assertEqual(self.service.auto_update_driver_statuses(NOW)["rows_updated"], 0)
+
+    def test_active_trip_outranks_rest_buffer(self):
+        vehicle_id, driver_id = self.add_resource_with_trip(timedelta(days=-2), timedelta(days=-1))
+        with self.service.pool.connection() as conn:
+            conn.cursor().execute("""
+                INSERT INTO Trips (VehicleID, RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers, DriverID)
+                VALUES (%s, %s, %s, %s, 'Scheduled', 10, %s)
+            """, (vehicle_id, self.route_id, (NOW - timedelta(hours=1)).strftime(FMT),
+                  (NOW + timedelta(hours=1)).strftime(FMT), driver_id))
+            conn.commit()
+
+        self.service.auto_update_vehicle_statuses(NOW)
+        self.service.auto_update_driver_statuses(NOW)
+
+        self.assertEqual(self.status_of("Vehicles", "VehicleID", vehicle_id), "On Trip")
+        self.assertEqual(self.status_of("Drivers", "DriverID", driver_id), "On Trip")
+
+
+if __name__ == "__main__":
+    unittest.main()
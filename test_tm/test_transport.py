@@ -1,7 +1,9 @@
+import os
 import unittest
 import uuid
 from openpyxl import Workbook
 from dao.TransportManagementServiceImpl import TransportManagementServiceImpl
+from util.DBConnUtil import DBConnUtil
 from entity.Vehicle import Vehicle
 from exception.CustomExceptions import (
     VehicleNotFoundException,
@@ -17,7 +19,15 @@ class TransportManagementSystemTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.service = TransportManagementServiceImpl()
+        # Runs on the embedded SQLite backend unless TM_TEST_DB_URL points at another database
+        connection_string = os.environ.get("TM_TEST_DB_URL", "sqlite:///:memory:?name=test_transport")
+        DBConnUtil.create_tables(connection_string)
+        cls.service = TransportManagementServiceImpl(connection_string)
+        # The fixtures below use their own pooled connection; autocommit keeps its reads
+        # in step with the writes the service commits on other connections.
+        cls.conn = cls.service.pool.acquire()
+        DBConnUtil.get_backend(connection_string).set_autocommit(cls.conn, True)
+        cls.cursor = cls.conn.cursor()
         cls.results = []
         
     def log_result(self, test_id, functionality, description, input_data, expected, actual):
@@ -68,8 +78,8 @@ class TransportManagementSystemTest(unittest.TestCase):
         vehicle = Vehicle(None, "UpdateModel", 30, "Van", "Available")
         self.service.add_vehicle(vehicle)
         # Fetch the last inserted vehicle (you may need to adjust this logic)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
         updated_vehicle = Vehicle(vehicle_id, "UpdatedModel", 35, "Van", "Available")
         try:
             result = self.service.update_vehicle(updated_vehicle)
@@ -96,8 +106,8 @@ class TransportManagementSystemTest(unittest.TestCase):
         # Add a vehicle to delete
         vehicle = Vehicle(None, "DeleteModel", 25, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
         try:
             result = self.service.delete_vehicle(vehicle_id)
             self.log_result("TC_05", "Delete Vehicle", "Delete an existing vehicle",
@@ -122,12 +132,12 @@ class TransportManagementSystemTest(unittest.TestCase):
         # Add vehicle and route first
         vehicle = Vehicle(None, "TripModel", 20, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
-        self.service.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('A', 'B', 100)")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(RouteID) FROM routes")
-        route_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('A', 'B', 100)")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(RouteID) FROM routes")
+        route_id = self.cursor.fetchone()[0]
         dep_date = "2099-01-01 10:00:00"
         arr_date = "2099-01-01 12:00:00"
         try:
@@ -144,12 +154,12 @@ class TransportManagementSystemTest(unittest.TestCase):
         # Try to schedule overlapping trip for same vehicle
         vehicle = Vehicle(None, "BusyModel", 20, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
-        self.service.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('C', 'D', 100)")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(RouteID) FROM routes")
-        route_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('C', 'D', 100)")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(RouteID) FROM routes")
+        route_id = self.cursor.fetchone()[0]
         dep_date1 = "2099-01-02 10:00:00"
         arr_date1 = "2099-01-02 12:00:00"
         self.service.schedule_trip(vehicle_id, route_id, dep_date1, arr_date1)
@@ -173,35 +183,35 @@ class TransportManagementSystemTest(unittest.TestCase):
         # Setup: Add vehicle, route, trip, passenger
         vehicle = Vehicle(None, "BookModel", 10, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
-        self.service.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('E', 'F', 100)")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(RouteID) FROM routes")
-        route_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('E', 'F', 100)")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(RouteID) FROM routes")
+        route_id = self.cursor.fetchone()[0]
         dep_date = "2099-01-03 10:00:00"
         arr_date = "2099-01-03 12:00:00"
         self.service.schedule_trip(vehicle_id, route_id, dep_date, arr_date)
-        self.service.cursor.execute("SELECT MAX(TripID) FROM Trips")
-        trip_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(TripID) FROM Trips")
+        trip_id = self.cursor.fetchone()[0]
         email = self.generate_random_email("john_tc9")
-        self.service.cursor.execute(
+        self.cursor.execute(
             "INSERT INTO passengers (FirstName, Gender, Age, Email, PhoneNumber) VALUES (%s, %s, %s, %s, %s)",
             ('John', 'M', 30, email, '1234567890')
         )
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
-        passenger_id = self.service.cursor.fetchone()[0]
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
+        passenger_id = self.cursor.fetchone()[0]
         try:
             # Book trip (simulate user input if needed)
             # You may need to adapt this if your book_trip() expects input()
             # Instead, directly insert booking for test
             booking_date = "2099-01-01 09:00:00"
-            self.service.cursor.execute(
+            self.cursor.execute(
                 "INSERT INTO Bookings (PassengerID, TripID, BookingDate, Status) VALUES (%s, %s, %s, %s)",
                 (passenger_id, trip_id, booking_date, "BOOKED")
             )
-            self.service.conn.commit()
+            self.conn.commit()
             self.log_result("TC_09", "Book Trip", "Book a trip with available seats",
                             "Valid Trip ID, Passenger ID", "Booking successful", "Booking successful")
             self.assertTrue(True)
@@ -213,54 +223,54 @@ class TransportManagementSystemTest(unittest.TestCase):
         # Setup: Add vehicle, route, trip, passenger
         vehicle = Vehicle(None, "FullModel", 1, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
-        self.service.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('G', 'H', 100)")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(RouteID) FROM routes")
-        route_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('G', 'H', 100)")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(RouteID) FROM routes")
+        route_id = self.cursor.fetchone()[0]
         dep_date = "2099-01-04 10:00:00"
         arr_date = "2099-01-04 12:00:00"
         self.service.schedule_trip(vehicle_id, route_id, dep_date, arr_date)
-        self.service.cursor.execute("SELECT MAX(TripID) FROM Trips")
-        trip_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(TripID) FROM Trips")
+        trip_id = self.cursor.fetchone()[0]
         # Add two passengers
         email1 = self.generate_random_email("alice_tc10")
-        self.service.cursor.execute(
+        self.cursor.execute(
             "INSERT INTO passengers (FirstName, Gender, Age, Email, PhoneNumber) VALUES (%s, %s, %s, %s, %s)",
             ('Alice', 'F', 25, email1, '1111111111')
         )
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
-        passenger1_id = self.service.cursor.fetchone()[0]
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
+        passenger1_id = self.cursor.fetchone()[0]
 
         email2 = self.generate_random_email("bob_tc10")
-        self.service.cursor.execute(
+        self.cursor.execute(
             "INSERT INTO passengers (FirstName, Gender, Age, Email, PhoneNumber) VALUES (%s, %s, %s, %s, %s)",
             ('Bob', 'M', 28, email2, '2222222222')
         )
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
-        passenger2_id = self.service.cursor.fetchone()[0]
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
+        passenger2_id = self.cursor.fetchone()[0]
 
         # Book the only seat
         booking_date = "2099-01-01 09:00:00"
-        self.service.cursor.execute(
+        self.cursor.execute(
             "INSERT INTO Bookings (PassengerID, TripID, BookingDate, Status) VALUES (%s, %s, %s, %s)",
             (passenger1_id, trip_id, booking_date, "BOOKED")
         )
-        self.service.conn.commit()
+        self.conn.commit()
         try:
             # Try to book for second passenger (should fail)
             # Simulate booking logic or directly check seat logic
-            self.service.cursor.execute(
+            self.cursor.execute(
                 "SELECT COUNT(*) FROM Bookings WHERE TripID = %s AND Status = 'BOOKED'", (trip_id,)
             )
-            booked_seats = self.service.cursor.fetchone()[0]
-            self.service.cursor.execute(
+            booked_seats = self.cursor.fetchone()[0]
+            self.cursor.execute(
                 "SELECT Capacity FROM Vehicles WHERE VehicleID = %s", (vehicle_id,)
             )
-            capacity = self.service.cursor.fetchone()[0]
+            capacity = self.cursor.fetchone()[0]
             if booked_seats >= capacity:
                 actual = "Booking failed"
             else:
@@ -276,34 +286,34 @@ class TransportManagementSystemTest(unittest.TestCase):
         # Setup: Add vehicle, route, trip, passenger, booking
         vehicle = Vehicle(None, "CancelModel", 10, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
-        self.service.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('I', 'J', 100)")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(RouteID) FROM routes")
-        route_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('I', 'J', 100)")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(RouteID) FROM routes")
+        route_id = self.cursor.fetchone()[0]
         dep_date = "2099-01-05 10:00:00"
         arr_date = "2099-01-05 12:00:00"
         self.service.schedule_trip(vehicle_id, route_id, dep_date, arr_date)
-        self.service.cursor.execute("SELECT MAX(TripID) FROM Trips")
-        trip_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(TripID) FROM Trips")
+        trip_id = self.cursor.fetchone()[0]
         email = self.generate_random_email("eve_tc11")
-        self.service.cursor.execute(
+        self.cursor.execute(
             "INSERT INTO passengers (FirstName, Gender, Age, Email, PhoneNumber) VALUES (%s, %s, %s, %s, %s)",
             ('Eve', 'F', 22, email, '3333333333')
         )
 
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
-        passenger_id = self.service.cursor.fetchone()[0]
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
+        passenger_id = self.cursor.fetchone()[0]
         booking_date = "2099-01-01 09:00:00"
-        self.service.cursor.execute(
+        self.cursor.execute(
             "INSERT INTO Bookings (PassengerID, TripID, BookingDate, Status) VALUES (%s, %s, %s, %s)",
             (passenger_id, trip_id, booking_date, "BOOKED")
         )
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(BookingID) FROM Bookings")
-        booking_id = self.service.cursor.fetchone()[0]
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(BookingID) FROM Bookings")
+        booking_id = self.cursor.fetchone()[0]
         try:
             result = self.service.cancel_booking(booking_id)
             self.log_result("TC_11", "Cancel Booking", "Cancel an existing booking",
@@ -326,23 +336,23 @@ class TransportManagementSystemTest(unittest.TestCase):
 
     def test_TC_13_allocate_driver(self):
         # Setup: Add driver, vehicle, route, trip
-        self.service.cursor.execute("INSERT INTO drivers (Name, Age, Gender, LicenseNumber, ContactNumber, Address, Status) VALUES ('DriverA', 35, 'M', 'LIC123', '9999999999', 'Addr', 'Available')")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(DriverID) FROM drivers")
-        driver_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO drivers (Name, Age, Gender, LicenseNumber, ContactNumber, Address, Status) VALUES ('DriverA', 35, 'M', 'LIC123', '9999999999', 'Addr', 'Available')")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(DriverID) FROM drivers")
+        driver_id = self.cursor.fetchone()[0]
         vehicle = Vehicle(None, "DriverModel", 10, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
-        self.service.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('K', 'L', 100)")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(RouteID) FROM routes")
-        route_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('K', 'L', 100)")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(RouteID) FROM routes")
+        route_id = self.cursor.fetchone()[0]
         dep_date = "2099-01-06 10:00:00"
         arr_date = "2099-01-06 12:00:00"
         self.service.schedule_trip(vehicle_id, route_id, dep_date, arr_date)
-        self.service.cursor.execute("SELECT MAX(TripID) FROM Trips")
-        trip_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(TripID) FROM Trips")
+        trip_id = self.cursor.fetchone()[0]
         try:
             result = self.service.allocate_driver(trip_id, driver_id)
             self.log_result("TC_13", "Allocate Driver", "Allocate a driver to a trip",
@@ -355,30 +365,30 @@ class TransportManagementSystemTest(unittest.TestCase):
 
     def test_TC_14_allocate_driver_unavailable(self):
         # Setup: Add driver, vehicle, route, two trips
-        self.service.cursor.execute("INSERT INTO drivers (Name, Age, Gender, LicenseNumber, ContactNumber, Address, Status) VALUES ('DriverB', 40, 'M', 'LIC456', '8888888888', 'Addr', 'Available')")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(DriverID) FROM drivers")
-        driver_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO drivers (Name, Age, Gender, LicenseNumber, ContactNumber, Address, Status) VALUES ('DriverB', 40, 'M', 'LIC456', '8888888888', 'Addr', 'Available')")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(DriverID) FROM drivers")
+        driver_id = self.cursor.fetchone()[0]
         vehicle = Vehicle(None, "DriverBusyModel", 10, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
-        self.service.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('M', 'N', 100)")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(RouteID) FROM routes")
-        route_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('M', 'N', 100)")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(RouteID) FROM routes")
+        route_id = self.cursor.fetchone()[0]
         dep_date1 = "2099-01-07 10:00:00"
         arr_date1 = "2099-01-07 12:00:00"
         self.service.schedule_trip(vehicle_id, route_id, dep_date1, arr_date1)
-        self.service.cursor.execute("SELECT MAX(TripID) FROM Trips")
-        trip1_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(TripID) FROM Trips")
+        trip1_id = self.cursor.fetchone()[0]
         self.service.allocate_driver(trip1_id, driver_id)
         # Overlapping trip
         dep_date2 = "2099-01-07 11:00:00"
         arr_date2 = "2099-01-07 13:00:00"
         self.service.schedule_trip(vehicle_id, route_id, dep_date2, arr_date2)
-        self.service.cursor.execute("SELECT MAX(TripID) FROM Trips")
-        trip2_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(TripID) FROM Trips")
+        trip2_id = self.cursor.fetchone()[0]
         try:
             result = self.service.allocate_driver(trip2_id, driver_id)
             actual = "Driver allocated successfully" if result else "Driver not available"
@@ -392,33 +402,33 @@ class TransportManagementSystemTest(unittest.TestCase):
     def test_TC_15_get_bookings_by_passenger(self):
         # Setup: Add passenger, vehicle, route, trip, booking
         email = self.generate_random_email("frank_tc15")
-        self.service.cursor.execute(
+        self.cursor.execute(
             "INSERT INTO passengers (FirstName, Gender, Age, Email, PhoneNumber) VALUES (%s, %s, %s, %s, %s)",
             ('Frank', 'M', 31, email, '4444444444')
         )
 
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
-        passenger_id = self.service.cursor.fetchone()[0]
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(PassengerID) FROM passengers")
+        passenger_id = self.cursor.fetchone()[0]
         vehicle = Vehicle(None, "BookListModel", 10, "Bus", "Available")
         self.service.add_vehicle(vehicle)
-        self.service.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
-        vehicle_id = self.service.cursor.fetchone()[0]
-        self.service.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('O', 'P', 100)")
-        self.service.conn.commit()
-        self.service.cursor.execute("SELECT MAX(RouteID) FROM routes")
-        route_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(VehicleID) FROM Vehicles")
+        vehicle_id = self.cursor.fetchone()[0]
+        self.cursor.execute("INSERT INTO routes (StartDestination, EndDestination, Distance) VALUES ('O', 'P', 100)")
+        self.conn.commit()
+        self.cursor.execute("SELECT MAX(RouteID) FROM routes")
+        route_id = self.cursor.fetchone()[0]
         dep_date = "2099-01-08 10:00:00"
         arr_date = "2099-01-08 12:00:00"
         self.service.schedule_trip(vehicle_id, route_id, dep_date, arr_date)
-        self.service.cursor.execute("SELECT MAX(TripID) FROM Trips")
-        trip_id = self.service.cursor.fetchone()[0]
+        self.cursor.execute("SELECT MAX(TripID) FROM Trips")
+        trip_id = self.cursor.fetchone()[0]
         booking_date = "2099-01-01 09:00:00"
-        self.service.cursor.execute(
+        self.cursor.execute(
             "INSERT INTO Bookings (PassengerID, TripID, BookingDate, Status) VALUES (%s, %s, %s, %s)",
             (passenger_id, trip_id, booking_date, "BOOKED")
         )
-        self.service.conn.commit()
+        self.conn.commit()
         try:
             bookings = self.service.get_bookings_by_passenger(passenger_id)
             actual = "List of bookings" if bookings else "No bookings"
@@ -442,6 +452,7 @@ class TransportManagementSystemTest(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
+        cls.service.pool.release(cls.conn, discard=True)
         wb = Workbook()
         ws = wb.active
         ws.title = "Test Results"
@@ -0,0 +1,79 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from test_tm.service_test_case import ServiceTestCase
+from util.TripSearchIndex import DestinationTrie
+
+BASE = datetime(2099, 12, 1, 6, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class TripSearchTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.routes = [self.add_route(start, end, 100)
+                       for start, end in (("Chennai", "Madurai"), ("chennai ", "MADURAI"), ("Chennai", "Mumbai"),
+                                          ("Madurai", "Chennai"), ("Coimbatore", "Chennai"))]
+        self.passenger_id = self.add_passengers()[0]
+
+    def add_trips(self, trips):
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO Trips (RouteID, DepartureDate, ArrivalDate, Status, MaxPassengers, SeatsBooked)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, [(route_id, dep.strftime(FMT), (dep + timedelta(hours=8)).strftime(FMT), status, seats, booked)
+                  for route_id, dep, status, seats, booked in trips])
+            conn.commit()
+        self.service.invalidate_trips()
+
+    def test_matches_brute_force_over_random_trips(self):
+        rng = random.Random(18)
+        trips = [(rng.choice(self.routes), BASE + timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+                  rng.choice(["Scheduled", "Scheduled", "Cancelled"]), 40, rng.randint(0, 40))
+                 for _ in range(5000)]
+        self.add_trips(trips)
+
+        depart_from, depart_to = BASE + timedelta(days=10), BASE + timedelta(days=20)
+        found = self.service.find_trips("CHENNAI", "madurai", depart_from, depart_to, min_free_seats=5, limit=1000)
+
+        expected = sorted(dep for route_id, dep, status, seats, booked in trips
+                          if route_id in self.routes[:2] and status == "Scheduled"
+                          and depart_from <= dep <= depart_to and seats - booked >= 5)
+        self.assertEqual([trip["departure_date"] for trip in found], expected)
+        self.assertTrue(all(trip["free_seats"] >= 5 for trip in found))
+        self.assertEqual(len(self.service.find_trips("Chennai", "Madurai", depart_from, depart_to, 5, limit=3)), 3)
+        self.assertEqual(self.service.find_trips("Mumbai", "Chennai"), [])
+
+    def test_seat_counts_follow_bookings(self):
+        self.add_trips([(self.routes[0], BASE, "Scheduled", 1, 0)])
+        trip = self.service.find_trips("Chennai", "Madurai")[0]
+        self.assertEqual(trip["free_seats"], 1)
+
+        self.assertTrue(self.service.book_trip(trip["trip_id"], self.passenger_id, BASE - timedelta(days=5)))
+        self.assertEqual(self.service.find_trips("Chennai", "Madurai"), [])
+        self.assertEqual(self.service.find_trips("Chennai", "Madurai", min_free_seats=0)[0]["free_seats"], 0)
+
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT BookingID FROM Bookings")
+            booking_id = cursor.fetchone()[0]
+        self.service.cancel_booking(booking_id)
+        self.assertEqual(self.service.find_trips("Chennai", "Madurai")[0]["free_seats"], 1)
+
+    def test_autocomplete(self):
+        self.add_trips([(route_id, BASE, "Scheduled", 10, 0) for route_id in self.routes])
+        self.assertEqual(self.service.autocomplete_destinations("m"), ["Madurai", "Mumbai"])
+        self.assertEqual(self.service.autocomplete_destinations("CH"), ["Chennai"])
+        self.assertEqual(self.service.autocomplete_destinations("x"), [])
+
+        trie = DestinationTrie()
+        for name in ("Salem", "Sal Lake", "salem", "Sangli", "Erode"):
+            trie.add(name)
+        self.assertEqual(len(trie), 4)
+        self.assertEqual(trie.complete("sa"), ["Sal Lake", "Salem", "Sangli"])
+        self.assertEqual(trie.complete("sa", limit=1), ["Sal Lake"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from dao.VehicleAssignmentOptimizer import VehicleAssignmentOptimizer
+from test_tm.service_test_case import ServiceTestCase
+
+BASE = datetime(2099, 10, 1, 8, 0, 0)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class VehicleAssignmentTest(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.optimizer = VehicleAssignmentOptimizer(self.service)
+        self.vehicles = {model: self.add_vehicle(capacity, model, vehicle_type)
+                         for model, capacity, vehicle_type in (("Van", 10, "Van"), ("Mini", 30, "Bus"),
+                                                               ("Coach", 50, "Bus"))}
+        self.route_id = self.add_route()
+
+    def request(self, day, seats, **extra):
+        departure = BASE + timedelta(days=day)
+        return dict(route_id=self.route_id, departure_date=departure.strftime(FMT),
+                    arrival_date=(departure + timedelta(hours=4)).strftime(FMT), seats=seats, **extra)
+
+    def test_best_fit_respects_availability(self):
+        # Day 0 has an existing trip on the 30-seater, so a 25-seat request on day 1 gets the coach
+        self.service.schedule_trip(self.vehicles["Mini"], self.route_id,
+                                   BASE.strftime(FMT), (BASE + timedelta(hours=2)).strftime(FMT))
+        plan = self.optimizer.optimize([
+            self.request(1, 25),
+            self.request(10, 25),
+            self.request(10, 8),
+            self.request(20, 60),
+            self.request(30, 5, vehicle_type="bus"),
+        ])
+
+        chosen = {assignment["index"]: assignment["vehicle_id"] for assignment in plan["assignments"]}
+        self.assertEqual(chosen, {0: self.vehicles["Coach"], 1: self.vehicles["Mini"],
+                                  2: self.vehicles["Van"], 4: self.vehicles["Mini"]})
+        self.assertEqual([rejection["index"] for rejection in plan["unassigned"]], [3])
+        self.assertEqual(plan["wasted_seats"], 25 + 5 + 2 + 25)
+
+        result = self.optimizer.commit(plan)
+        self.assertEqual((result["scheduled"], result["rejected"]), (4, []))
+
+    def test_random_plans_commit_without_rejections(self):
+        rng = random.Random(8)
+        with self.service.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("INSERT INTO Vehicles (Model, Capacity, Type, Status) VALUES ('V', %s, 'Bus', 'Available')",
+                               [(rng.choice([10, 20, 40, 60]),) for _ in range(30)])
+            conn.commit()
+        requests = [self.request(rng.uniform(0, 60), rng.randint(1, 70)) for _ in range(300)]
+
+        plan = self.optimizer.optimize(requests)
+        result = self.optimizer.commit(plan)
+
+        self.assertEqual(len(plan["assignments"]) + len(plan["unassigned"]), 300)
+        self.assertEqual(result["rejected"], [])
+        for assignment in plan["assignments"]:
+            self.assertGreaterEqual(assignment["capacity"], assignment["seats"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+'''
+This file defines the ConnectionPool class, a bounded thread-safe pool of database
+connections. Service methods borrow a connection for the duration of one call and
+return it afterwards, so several worker threads can talk to the database in parallel
+instead of sharing a single connection and cursor.
+'''
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from exception.CustomExceptions import ConnectionPoolExhaustedException, DatabaseConnectionException
+
+
+class ConnectionPool:
+    def __init__(self, connect, validate=None, max_size=10, timeout=30.0, health_check_interval=30.0):
+        """
+        connect: zero-argument callable that opens a new connection (returns None on failure).
+        validate: callable(conn) -> bool used as health check before handing out an idle connection.
+        max_size: upper bound on open connections.
+        timeout: seconds to wait for a free connection before giving up.
+        health_check_interval: idle connections older than this are validated on checkout.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self._connect = connect
+        self._validate = validate
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = []              # stack of (connection, last_used_monotonic)
+        self._open = 0               # connections currently open (idle + borrowed)
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        # Counters for monitoring
+        self.checkouts = 0
+        self.reconnects = 0
+        self.waits = 0
+        self.total_wait_time = 0.0
+        # callables(seconds) told about every checkout that had to wait; see add_wait_listener()
+        self._wait_listeners = []
+
+    def _new_connection(self):
+        conn = self._connect()
+        if conn is None:
+            raise DatabaseConnectionException()
+        return conn
+
+    def _is_healthy(self, conn):
+        if self._validate is None:
+            return True
+        try:
+            return bool(self._validate(conn))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def add_wait_listener(self, listener):
+        """
+        Call listener(seconds) for every checkout that had to wait, e.g. a metrics
+        histogram's observe. Adding the same listener again is a no-op. Bound methods are
+        held weakly, so a pool shared by many services does not keep their registries alive.
+        """
+        ref = weakref.WeakMethod(listener) if hasattr(listener, "__func__") else (lambda: listener)
+        with self._cond:
+            if listener not in self._live_wait_listeners_locked():
+                self._wait_listeners.append(ref)
+
+    def remove_wait_listener(self, listener):
+        with self._cond:
+            self._wait_listeners = [ref for ref in self._wait_listeners if ref() not in (None, listener)]
+
+    def _live_wait_listeners_locked(self):
+        listeners = [ref() for ref in self._wait_listeners]
+        if None in listeners:
+            self._wait_listeners = [ref for ref, listener in zip(self._wait_listeners, listeners)
+                                    if listener is not None]
+        return [listener for listener in listeners if listener is not None]
+
+    def _live_wait_listeners(self):
+        with self._cond:
+            return self._live_wait_listeners_locked()
+
+    def acquire(self, timeout=None):
+        """Check out a connection, opening or reconnecting one if necessary."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        started = time.monotonic()
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise DatabaseConnectionException("Connection pool has been closed.")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._open < self.max_size:
+                    # Reserve the slot before connecting outside the lock
+                    self._open += 1
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ConnectionPoolExhaustedException(
+                        f"No database connection became available within {timeout} seconds.")
+                waited = True
+                self._cond.wait(remaining)
+
+            self.checkouts += 1
+            wait_time = time.monotonic() - started if waited else None
+            if waited:
+                self.waits += 1
+                self.total_wait_time += wait_time
+
+        for listener in self._live_wait_listeners() if waited else ():
+            listener(wait_time)
+
+        try:
+            if conn is None:
+                return self._new_connection()
+            if time.monotonic() - last_used >= self.health_check_interval and not self._is_healthy(conn):
+                self._close_quietly(conn)
+                conn = self._new_connection()
+                with self._cond:
+                    self.reconnects += 1
+            return conn
+        except Exception:
+            # Give the reserved slot back so other threads are not starved
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn, discard=False):
+        """Return a borrowed connection. Broken connections should be discarded."""
+        if not discard:
+            try:
+                close_cursors = getattr(conn, "close_cursors", None)
+                if close_cursors is not None:
+                    close_cursors()
+                # Never hand the next borrower a half-finished transaction or a stale snapshot
+                if getattr(conn, "in_transaction", True):
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard or self._closed or self._open > self.max_size:
+                self._open -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Borrow a connection for the duration of a with-block."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except BaseException:
+            # BaseException too: a generator holding a connection is closed via GeneratorExit
+            try:
+                conn.rollback()
+                healthy = True
+            except Exception:
+                healthy = False
+            self.release(conn, discard=not healthy)
+            raise
+        else:
+            self.release(conn)
+
+    def resize(self, delta):
+        """
+        Raise max_size by delta (lower it if negative) and return the new bound, e.g. for
+        a caller that brings its own worker threads to a shared pool. Connections beyond a
+        lowered bound are closed as they come back.
+        """
+        with self._cond:
+            if self.max_size + delta < 1:
+                raise ValueError("max_size must be at least 1.")
+            self.max_size += delta
+            surplus = []
+            while self._open > self.max_size and self._idle:
+                surplus.append(self._idle.pop(0)[0])
+                self._open -= 1
+            self._cond.notify_all()
+            max_size = self.max_size
+        for conn in surplus:
+            self._close_quietly(conn)
+        return max_size
+
+    def close(self):
+        """Close idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+                "checkouts": self.checkouts,
+                "reconnects": self.reconnects,
+                "waits": self.waits,
+                "total_wait_time": self.total_wait_time,
+            }
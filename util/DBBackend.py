@@ -0,0 +1,40 @@
+'''
+This file defines the DBBackend base class. A backend knows how to open a connection
+for one storage engine, how to health-check it and how to create the schema, so that
+DBConnUtil and the connection pool can work with MySQL or the embedded SQLite engine
+without the service layer caring which one is in use.
+'''
+
+from abc import ABC, abstractmethod
+
+
+class DBBackend(ABC):
+    name = None
+
+    # DB-API exception base class(es) raised by the driver
+    error_types = (Exception,)
+
+    @abstractmethod
+    def connect(self):
+        """Open and return a new DB-API connection."""
+        pass
+
+    @abstractmethod
+    def is_alive(self, connection) -> bool:
+        pass
+
+    @abstractmethod
+    def create_tables(self, connection) -> None:
+        pass
+
+    @abstractmethod
+    def set_autocommit(self, connection, enabled: bool) -> None:
+        pass
+
+    def streaming_cursor(self, connection):
+        """A cursor whose fetchmany() pulls rows from the server as they are consumed."""
+        return connection.cursor()
+
+    def close(self) -> None:
+        """Release any resources held by the backend itself."""
+        pass
@@ -1,108 +1,90 @@
-import mysql.connector
+import threading
+from urllib.parse import urlsplit, parse_qs, unquote
 from .DBPropertyUtil import DBPropertyUtil
+from .ConnectionPool import ConnectionPool
 
 class DBConnUtil:
+    _pools = {}
+    _backends = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def resolve_connection_string(connection_string):
+        """Accept either a connection URL or the name of a property file holding one."""
+        if connection_string and "://" in connection_string:
+            return connection_string
+        return DBPropertyUtil.get_connection_string(connection_string or "db.properties")
+
+    @staticmethod
+    def create_backend(connection_string):
+        parts = urlsplit(connection_string)
+        if parts.scheme == "mysql":
+            # Imported lazily so the embedded backend works without the MySQL driver installed
+            from .MySQLBackend import MySQLBackend
+            return MySQLBackend(
+                host=parts.hostname or "localhost",
+                user=unquote(parts.username or "root"),
+                password=unquote(parts.password or ""),
+                database=parts.path.lstrip("/") or "transport_management",
+                port=parts.port or 3306
+            )
+        if parts.scheme == "sqlite":
+            from .SQLiteBackend import SQLiteBackend
+            options = parse_qs(parts.query)
+            database = unquote(parts.path[1:]) or ":memory:"
+            return SQLiteBackend(database, name=options.get("name", [None])[0])
+        raise ValueError(f"Unsupported database backend in connection string: {connection_string}")
+
+    @staticmethod
+    def get_backend(connection_string):
+        """Return the shared backend for this connection string, creating it on first use."""
+        connection_string = DBConnUtil.resolve_connection_string(connection_string)
+        with DBConnUtil._lock:
+            backend = DBConnUtil._backends.get(connection_string)
+            if backend is None:
+                backend = DBConnUtil.create_backend(connection_string)
+                DBConnUtil._backends[connection_string] = backend
+            return backend
+
     @staticmethod
     def get_connection(connection_string):
+        backend = DBConnUtil.get_backend(connection_string)
         try:
-            connection = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="root",
-                database="transport_management"
-            )
-            return connection
-        except mysql.connector.Error as err:
+            return backend.connect()
+        except backend.error_types as err:
             print(f"Error: {err}")
             return None
 
     @staticmethod
-    def create_tables():
-        table_queries = [
-            """
-            CREATE TABLE IF NOT EXISTS vehicles (
-                VehicleID int NOT NULL AUTO_INCREMENT,
-                Model varchar(255) DEFAULT NULL,
-                Capacity decimal(10,2) DEFAULT NULL,
-                Type varchar(50) DEFAULT NULL,
-                Status varchar(50) DEFAULT NULL,
-                PRIMARY KEY (VehicleID)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS drivers (
-                DriverID int NOT NULL AUTO_INCREMENT,
-                Name varchar(100) DEFAULT NULL,
-                Age int DEFAULT NULL,
-                Gender varchar(10) DEFAULT NULL,
-                LicenseNumber varchar(50) DEFAULT NULL,
-                ContactNumber varchar(20) DEFAULT NULL,
-                Address text,
-                Status varchar(20) DEFAULT 'Available',
-                PRIMARY KEY (DriverID)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS routes (
-                RouteID int NOT NULL AUTO_INCREMENT,
-                StartDestination varchar(255) DEFAULT NULL,
-                EndDestination varchar(255) DEFAULT NULL,
-                Distance decimal(10,2) DEFAULT NULL,
-                PRIMARY KEY (RouteID)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS passengers (
-                PassengerID int NOT NULL AUTO_INCREMENT,
-                FirstName varchar(255) DEFAULT NULL,
-                Gender varchar(255) DEFAULT NULL,
-                Age int DEFAULT NULL,
-                Email varchar(255) DEFAULT NULL,
-                PhoneNumber varchar(50) DEFAULT NULL,
-                PRIMARY KEY (PassengerID),
-                UNIQUE KEY Email (Email)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS trips (
-                TripID int NOT NULL AUTO_INCREMENT,
-                VehicleID int DEFAULT NULL,
-                RouteID int DEFAULT NULL,
-                DepartureDate datetime DEFAULT NULL,
-                ArrivalDate datetime DEFAULT NULL,
-                Status varchar(50) DEFAULT NULL,
-                TripType varchar(50) DEFAULT 'Freight',
-                MaxPassengers int DEFAULT NULL,
-                DriverID int DEFAULT NULL,
-                PRIMARY KEY (TripID),
-                KEY VehicleID (VehicleID),
-                KEY RouteID (RouteID),
-                KEY FK_Trips_Driver (DriverID),
-                CONSTRAINT FK_Trips_Driver FOREIGN KEY (DriverID) REFERENCES drivers (DriverID) ON DELETE SET NULL,
-                CONSTRAINT trips_ibfk_1 FOREIGN KEY (VehicleID) REFERENCES vehicles (VehicleID),
-                CONSTRAINT trips_ibfk_2 FOREIGN KEY (RouteID) REFERENCES routes (RouteID)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS bookings (
-                BookingID int NOT NULL AUTO_INCREMENT,
-                TripID int DEFAULT NULL,
-                PassengerID int DEFAULT NULL,
-                BookingDate datetime DEFAULT NULL,
-                Status varchar(50) DEFAULT NULL,
-                PRIMARY KEY (BookingID),
-                KEY TripID (TripID),
-                KEY PassengerID (PassengerID),
-                CONSTRAINT bookings_ibfk_1 FOREIGN KEY (TripID) REFERENCES trips (TripID),
-                CONSTRAINT bookings_ibfk_2 FOREIGN KEY (PassengerID) REFERENCES passengers (PassengerID)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-            """
-        ]
-        conn = DBConnUtil.get_connection(None)
+    def get_pool(connection_string, max_size=10):
+        """Return the shared connection pool for this connection string, creating it on first use."""
+        connection_string = DBConnUtil.resolve_connection_string(connection_string)
+        backend = DBConnUtil.get_backend(connection_string)
+        with DBConnUtil._lock:
+            pool = DBConnUtil._pools.get(connection_string)
+            if pool is None:
+                pool = ConnectionPool(
+                    connect=lambda: DBConnUtil.get_connection(connection_string),
+                    validate=backend.is_alive,
+                    max_size=max_size
+                )
+                DBConnUtil._pools[connection_string] = pool
+            return pool
+
+    @staticmethod
+    def close_pools():
+        with DBConnUtil._lock:
+            pools, DBConnUtil._pools = DBConnUtil._pools, {}
+            backends, DBConnUtil._backends = DBConnUtil._backends, {}
+        for pool in pools.values():
+            pool.close()
+        for backend in backends.values():
+            backend.close()
+
+    @staticmethod
+    def create_tables(connection_string=None):
+        backend = DBConnUtil.get_backend(connection_string)
+        conn = DBConnUtil.get_connection(connection_string)
         if conn:
-            cursor = conn.cursor()
-            for query in table_queries:
-                cursor.execute(query)
-            conn.commit()
-            cursor.close()
-            conn.close()
\ No newline at end of file
+            backend.create_tables(conn)
+            conn.close()
@@ -0,0 +1,112 @@
+'''
+This file defines the EntityCache class, a bounded read-through cache for reference
+rows (vehicles, routes, drivers, passengers) that the service reads on every booking
+or scheduling call.
+
+Entries are keyed by (kind, id), evicted least-recently-used once max_size is reached
+and expire after ttl seconds so rows changed outside this process are eventually
+re-read. Rows that are not found are never cached. Writers invalidate what they touch.
+'''
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class EntityCache:
+    def __init__(self, max_size=2048, ttl=60.0, clock=time.monotonic):
+        """
+        max_size: number of rows kept before the least recently used one is evicted.
+        ttl: seconds a row may be served before it is re-read; None disables expiry.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # (kind, id) -> (expires_at, row)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _lookup(self, key):
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, row = entry
+        if expires_at is not None and expires_at <= self.clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return row
+
+    def _store(self, key, row):
+        # Caller holds the lock
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        self._entries[key] = (expires_at, row)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, kind, entity_id, loader):
+        """Return the cached row, or call loader() and cache its result if it is not None."""
+        key = (kind, entity_id)
+        with self._lock:
+            row = self._lookup(key)
+        if row is not None:
+            return row
+        row = loader()
+        if row is not None:
+            self.put(kind, entity_id, row)
+        return row
+
+    def get_many(self, kind, entity_ids):
+        """Return ({id: row} for cached ids, [ids that must be loaded])."""
+        found, missing = {}, []
+        with self._lock:
+            for entity_id in entity_ids:
+                row = self._lookup((kind, entity_id))
+                if row is None:
+                    missing.append(entity_id)
+                else:
+                    found[entity_id] = row
+        return found, missing
+
+    def put(self, kind, entity_id, row):
+        with self._lock:
+            self._store((kind, entity_id), row)
+
+    def invalidate(self, kind, entity_id=None):
+        """Drop one row, or every row of a kind when entity_id is None."""
+        with self._lock:
+            if entity_id is not None:
+                keys = [(kind, entity_id)] if (kind, entity_id) in self._entries else []
+            else:
+                keys = [key for key in self._entries if key[0] == kind]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,81 @@
+'''
+This file defines the EntityValidator class, which holds the field rules for vehicles,
+routes, drivers and passengers in one place so that the interactive service methods
+and the bulk importer accept and reject exactly the same data.
+
+Each validate_* method raises the matching Invalid*DataException on the first rule
+that fails and returns nothing otherwise.
+'''
+
+from exception.CustomExceptions import (
+    InvalidVehicleDataException,
+    InvalidVehicleStatusException,
+    InvalidRouteDataException,
+    InvalidDriverDataException,
+    InvalidPassengerDataException
+)
+
+VEHICLE_STATUSES = ("Available", "On Trip", "Maintenance")
+DRIVER_STATUSES = ("Available", "On Trip", "Resting")
+
+
+def _blank(value):
+    return value is None or str(value).strip() == ""
+
+
+def _positive_number(value):
+    try:
+        return not _blank(value) and float(value) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def _optional_int(value, minimum):
+    if _blank(value):
+        return True
+    try:
+        return int(value) >= minimum
+    except (TypeError, ValueError):
+        return False
+
+
+class EntityValidator:
+    @staticmethod
+    def validate_vehicle(vehicle, check_status=True):
+        if _blank(vehicle.model):
+            raise InvalidVehicleDataException("Model is required and cannot be empty.")
+        if not _positive_number(vehicle.capacity):
+            raise InvalidVehicleDataException("Capacity is required and must be greater than 0.")
+        if _blank(vehicle.type):
+            raise InvalidVehicleDataException("Type is required and cannot be empty.")
+        if check_status and vehicle.status not in VEHICLE_STATUSES:
+            raise InvalidVehicleStatusException()
+
+    @staticmethod
+    def validate_route(route):
+        if _blank(route.start_destination) or _blank(route.end_destination):
+            raise InvalidRouteDataException("Start and end destinations are required.")
+        if str(route.start_destination).strip().lower() == str(route.end_destination).strip().lower():
+            raise InvalidRouteDataException("Start and end destinations must differ.")
+        if not _positive_number(route.distance):
+            raise InvalidRouteDataException("Distance is required and must be greater than 0.")
+
+    @staticmethod
+    def validate_driver(driver):
+        if _blank(driver.name):
+            raise InvalidDriverDataException("Name is required and cannot be empty.")
+        if _blank(driver.license_number):
+            raise InvalidDriverDataException("License number is required and cannot be empty.")
+        if not _optional_int(driver.age, 18):
+            raise InvalidDriverDataException("Age must be a whole number of at least 18.")
+        if not _blank(driver.status) and driver.status not in DRIVER_STATUSES:
+            raise InvalidDriverDataException("Status must be one of: Available, On Trip, Resting.")
+
+    @staticmethod
+    def validate_passenger(passenger):
+        if _blank(passenger.first_name):
+            raise InvalidPassengerDataException("First name is required and cannot be empty.")
+        if _blank(passenger.email) or "@" not in str(passenger.email):
+            raise InvalidPassengerDataException("A valid email address is required.")
+        if not _optional_int(passenger.age, 0):
+            raise InvalidPassengerDataException("Age must be a non-negative whole number.")
@@ -0,0 +1,182 @@
+'''
+This file defines the IntervalIndex and ScheduleIndex classes used to answer "is this
+vehicle/driver free for this window, including the 3-day rest buffer?" without
+fetching and scanning every scheduled trip of the resource.
+
+IntervalIndex keeps one resource's trips sorted by departure. Any trip that can clash
+with a new window must depart between (new departure - longest trip span) and the new
+arrival, so a conflict query is two bisects plus a look at the few trips in that range.
+
+ScheduleIndex holds one IntervalIndex per vehicle or driver, loads each lazily from the
+Trips table on first use and is kept current by the service's write methods. Like
+LegInventory, an index is reloaded after ttl seconds so trips scheduled by other
+processes (script runner, API server, another app) are seen; the default is short
+because the index is what stops a vehicle or driver being booked twice.
+'''
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+REST_BUFFER = timedelta(days=3)
+SCHEDULE_CACHE_TTL = 5.0
+
+
+class IntervalIndex:
+    def __init__(self, rest_buffer=REST_BUFFER):
+        self.rest_buffer = rest_buffer
+        self._starts = []      # sorted departure instants
+        self._entries = []     # (departure, arrival, trip_id), parallel to _starts
+        self._departures = {}  # trip_id -> departure, to locate entries on removal
+        self._max_span = timedelta(0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, trip_id, departure, arrival):
+        if trip_id in self._departures:
+            self.remove(trip_id)
+        position = bisect_right(self._starts, departure)
+        self._starts.insert(position, departure)
+        self._entries.insert(position, (departure, arrival, trip_id))
+        self._departures[trip_id] = departure
+        # Never shrunk on removal: a stale, larger span only widens the scan window
+        self._max_span = max(self._max_span, arrival + self.rest_buffer - departure)
+
+    def remove(self, trip_id):
+        departure = self._departures.pop(trip_id, None)
+        if departure is None:
+            return False
+        position = bisect_left(self._starts, departure)
+        while self._entries[position][2] != trip_id:
+            position += 1
+        del self._starts[position]
+        del self._entries[position]
+        return True
+
+    def find_conflict(self, departure, arrival, exclude_trip_id=None):
+        """
+        Return the first (departure, arrival, trip_id) that clashes with the window, or None.
+        A trip clashes when the window starts before its rest buffer ends and ends after it departs.
+        """
+        low = bisect_left(self._starts, departure - self._max_span)
+        high = bisect_right(self._starts, arrival)
+        for position in range(low, high):
+            entry = self._entries[position]
+            if entry[2] != exclude_trip_id and departure <= entry[1] + self.rest_buffer:
+                return entry
+        return None
+
+    def entries(self):
+        return list(self._entries)
+
+
+class ScheduleIndex:
+    def __init__(self, loader, rest_buffer=REST_BUFFER, ttl=SCHEDULE_CACHE_TTL, clock=time.monotonic):
+        """
+        loader: callable(resource_id, cursor) returning (trip_id, departure, arrival) rows for
+                the resource's scheduled trips; called on first use and again once the
+                resource's index is older than ttl seconds. cursor is the caller's open
+                cursor (or None), so a caller already holding a pooled connection does not
+                need to borrow a second one.
+        ttl: seconds an index is trusted before it is reloaded, so trips written by other
+             processes are seen; None disables expiry.
+        """
+        self._loader = loader
+        self.rest_buffer = rest_buffer
+        self.ttl = ttl
+        self.clock = clock
+        self._indexes = {}    # resource_id -> (IntervalIndex, loaded_at)
+        self._versions = {}   # resource_id -> changes seen while its index was being loaded
+        self._loading = {}    # resource_id -> lock held by the thread loading it
+        self._lock = threading.Lock()
+
+    def _fresh(self, resource_id):
+        # Caller holds the lock
+        entry = self._indexes.get(resource_id)
+        if entry is not None and (self.ttl is None or self.clock() - entry[1] < self.ttl):
+            return entry[0]
+        return None
+
+    def _changed(self, resource_id):
+        # Caller holds the lock; only a load in progress needs to hear about the change
+        if resource_id in self._loading:
+            self._versions[resource_id] = self._versions.get(resource_id, 0) + 1
+
+    def _get(self, resource_id, cursor=None):
+        while True:
+            with self._lock:
+                index = self._fresh(resource_id)
+                if index is not None:
+                    return index
+                load_lock = self._loading.setdefault(resource_id, threading.Lock())
+            # The database read runs outside the shared lock; only loads of the same
+            # resource wait for each other
+            with load_lock:
+                with self._lock:
+                    index = self._fresh(resource_id)
+                    if index is not None:
+                        return index
+                    # The thread that held load_lock may have finished and dropped it
+                    self._loading.setdefault(resource_id, load_lock)
+                    version = self._versions.get(resource_id, 0)
+                loaded_at = self.clock()
+                index = IntervalIndex(self.rest_buffer)
+                try:
+                    for trip_id, departure, arrival in self._loader(resource_id, cursor):
+                        index.add(trip_id, departure, arrival)
+                except Exception:
+                    with self._lock:
+                        self._versions.pop(resource_id, None)
+                        self._loading.pop(resource_id, None)
+                    raise
+                with self._lock:
+                    # A trip added or removed during the read may be missing; read again
+                    if self._versions.get(resource_id, 0) == version:
+                        self._indexes[resource_id] = (index, loaded_at)
+                        self._versions.pop(resource_id, None)
+                        self._loading.pop(resource_id, None)
+                        return index
+
+    def find_conflict(self, resource_id, departure, arrival, exclude_trip_id=None, cursor=None):
+        index = self._get(resource_id, cursor)
+        with self._lock:
+            return index.find_conflict(departure, arrival, exclude_trip_id)
+
+    def is_free(self, resource_id, departure, arrival, exclude_trip_id=None, cursor=None):
+        return self.find_conflict(resource_id, departure, arrival, exclude_trip_id, cursor) is None
+
+    def add(self, resource_id, trip_id, departure, arrival):
+        if resource_id is None:
+            return
+        with self._lock:
+            # Unloaded resources pick the trip up from the database when first used
+            self._changed(resource_id)
+            entry = self._indexes.get(resource_id)
+            if entry is not None:
+                entry[0].add(trip_id, departure, arrival)
+
+    def remove(self, resource_id, trip_id):
+        if resource_id is None:
+            return
+        with self._lock:
+            self._changed(resource_id)
+            entry = self._indexes.get(resource_id)
+            if entry is not None:
+                entry[0].remove(trip_id)
+
+    def invalidate(self, resource_id=None):
+        """Forget one resource (or all) so it is reloaded from the database on next use."""
+        with self._lock:
+            if resource_id is None:
+                for loading_id in list(self._loading):
+                    self._changed(loading_id)
+                self._indexes.clear()
+            else:
+                self._changed(resource_id)
+                self._indexes.pop(resource_id, None)
+
+    def loaded_count(self):
+        with self._lock:
+            return len(self._indexes)
@@ -0,0 +1,247 @@
+'''
+This file defines the MetricsRegistry class, an in-process registry of counters,
+latency histograms and gauges, and the ways to read it without a profiler:
+
+- render_prometheus(): the Prometheus text exposition format.
+- serve(port): a local http.server thread answering GET /metrics with that text
+  (and GET /metrics.json with snapshot()).
+- start_snapshots(path, interval): a thread that rewrites a JSON snapshot file every
+  interval seconds (written to a temporary file and renamed, so readers never see a
+  half-written one).
+
+instrument(obj) wraps an object's public methods so each call is timed into the
+tm_operation_seconds histogram and failures counted in tm_operation_errors_total.
+Recording is a dictionary update under a lock, cheap enough to leave on.
+'''
+
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; suits calls from well under a millisecond to several seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_text(names, values):
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+    def snapshot(self):
+        with self._lock:
+            return {",".join(key) or "": value for key, value in sorted(self._values.items())}
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count], sum
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    def count(self, **labels):
+        series = self._series.get(tuple(str(labels.get(name, "")) for name in self.labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    samples.append((self.name + "_bucket", key + ("+Inf" if bound == float("inf") else repr(bound),),
+                                    cumulative))
+                samples.append((self.name + "_sum", key, total))
+                samples.append((self.name + "_count", key, cumulative))
+        return samples
+
+    def snapshot(self):
+        with self._lock:
+            return {",".join(key) or "": {"count": sum(counts), "sum": round(total, 6),
+                                          "buckets": dict(zip([repr(b) for b in self.buckets] + ["+Inf"], counts))}
+                    for key, (counts, total) in sorted(self._series.items())}
+
+
+class Gauge:
+    """A value read from a callback when the registry is collected."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, read):
+        self.name, self.help, self.labels = name, help_text, ()
+        self._read = read
+
+    def samples(self):
+        try:
+            return [(self.name, (), self._read())]
+        except Exception:
+            return []
+
+    def snapshot(self):
+        samples = self.samples()
+        return samples[0][2] if samples else None
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._snapshot_thread = None
+        self._snapshot_stop = threading.Event()
+        self._server = None
+
+    # ---- declaring metrics ------------------------------------------------
+
+    def _register(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name, help_text="", labels=()) -> Counter:
+        return self._register(name, lambda: Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text="", labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, read) -> Gauge:
+        return self._register(name, lambda: Gauge(name, help_text, read))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def instrument(self, obj, prefix=""):
+        """Time every public method of obj into tm_operation_seconds{operation=prefix + name}."""
+        latency = self.histogram("tm_operation_seconds", "Service operation latency in seconds", ("operation",))
+        errors = self.counter("tm_operation_errors_total", "Service operations that raised", ("operation",))
+        for name, _ in inspect.getmembers(type(obj), inspect.isfunction):
+            if name.startswith("_"):
+                continue
+            method, operation = getattr(obj, name), prefix + name
+
+            def timed(*args, _method=method, _operation=operation, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return _method(*args, **kwargs)
+                except BaseException:
+                    errors.inc(operation=_operation)
+                    raise
+                finally:
+                    latency.observe(time.perf_counter() - started, operation=_operation)
+            setattr(obj, name, functools.wraps(method)(timed))
+        return obj
+
+    # ---- reading ----------------------------------------------------------
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for metric in metrics:
+            samples = metric.samples()
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample_name, label_values, value in samples:
+                names = metric.labels + (("le",) if sample_name.endswith("_bucket") else ())
+                lines.append(f"{sample_name}{_label_text(names, label_values)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {"time": time.time(), "metrics": {name: {"type": metric.kind, "labels": list(metric.labels),
+                                                        "values": metric.snapshot()}
+                                                 for name, metric in sorted(metrics.items())}}
+
+    def write_snapshot(self, path):
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(self.snapshot(), handle, indent=2)
+        os.replace(temporary, path)
+
+    def start_snapshots(self, path, interval=60.0):
+        """Rewrite the snapshot file every interval seconds on a daemon thread."""
+        def run():
+            while not self._snapshot_stop.wait(interval):
+                try:
+                    self.write_snapshot(path)
+                except OSError as e:
+                    print(f"[Metrics] Could not write snapshot to {path}: {e}")
+        self._snapshot_stop.clear()
+        self._snapshot_thread = threading.Thread(target=run, name="metrics-snapshots", daemon=True)
+        self._snapshot_thread.start()
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serve /metrics (Prometheus text) and /metrics.json on a daemon thread; returns the server."""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] == "/metrics":
+                    body, content_type = registry.render_prometheus().encode(), "text/plain; version=0.0.4"
+                elif self.path.split("?")[0] == "/metrics.json":
+                    body, content_type = json.dumps(registry.snapshot()).encode(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes every few seconds would flood the console
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
+
+    def stop(self):
+        self._snapshot_stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
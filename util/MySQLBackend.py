@@ -0,0 +1,163 @@
+'''
+This file defines the MySQLBackend class, the default storage backend used against
+the transport_management MySQL database.
+'''
+
+import mysql.connector
+from .DBBackend import DBBackend
+
+
+class MySQLBackend(DBBackend):
+    name = "mysql"
+    error_types = (mysql.connector.Error,)
+
+    TABLE_QUERIES = [
+        """
+        CREATE TABLE IF NOT EXISTS vehicles (
+            VehicleID int NOT NULL AUTO_INCREMENT,
+            Model varchar(255) DEFAULT NULL,
+            Capacity decimal(10,2) DEFAULT NULL,
+            Type varchar(50) DEFAULT NULL,
+            Status varchar(50) DEFAULT NULL,
+            PRIMARY KEY (VehicleID)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS drivers (
+            DriverID int NOT NULL AUTO_INCREMENT,
+            Name varchar(100) DEFAULT NULL,
+            Age int DEFAULT NULL,
+            Gender varchar(10) DEFAULT NULL,
+            LicenseNumber varchar(50) DEFAULT NULL,
+            ContactNumber varchar(20) DEFAULT NULL,
+            Address text,
+            Status varchar(20) DEFAULT 'Available',
+            PRIMARY KEY (DriverID)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS routes (
+            RouteID int NOT NULL AUTO_INCREMENT,
+            StartDestination varchar(255) DEFAULT NULL,
+            EndDestination varchar(255) DEFAULT NULL,
+            Distance decimal(10,2) DEFAULT NULL,
+            PRIMARY KEY (RouteID)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS passengers (
+            PassengerID int NOT NULL AUTO_INCREMENT,
+            FirstName varchar(255) DEFAULT NULL,
+            Gender varchar(255) DEFAULT NULL,
+            Age int DEFAULT NULL,
+            Email varchar(255) DEFAULT NULL,
+            PhoneNumber varchar(50) DEFAULT NULL,
+            PRIMARY KEY (PassengerID),
+            UNIQUE KEY Email (Email)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS trips (
+            TripID int NOT NULL AUTO_INCREMENT,
+            VehicleID int DEFAULT NULL,
+            RouteID int DEFAULT NULL,
+            DepartureDate datetime DEFAULT NULL,
+            ArrivalDate datetime DEFAULT NULL,
+            Status varchar(50) DEFAULT NULL,
+            TripType varchar(50) DEFAULT 'Freight',
+            MaxPassengers int DEFAULT NULL,
+            DriverID int DEFAULT NULL,
+            SeatsBooked int NOT NULL DEFAULT 0,
+            PRIMARY KEY (TripID),
+            KEY VehicleID (VehicleID),
+            KEY RouteID (RouteID),
+            KEY FK_Trips_Driver (DriverID),
+            KEY Driver_Schedule (DriverID, Status, DepartureDate),
+            CONSTRAINT FK_Trips_Driver FOREIGN KEY (DriverID) REFERENCES drivers (DriverID) ON DELETE SET NULL,
+            CONSTRAINT trips_ibfk_1 FOREIGN KEY (VehicleID) REFERENCES vehicles (VehicleID),
+            CONSTRAINT trips_ibfk_2 FOREIGN KEY (RouteID) REFERENCES routes (RouteID)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS bookings (
+            BookingID int NOT NULL AUTO_INCREMENT,
+            TripID int DEFAULT NULL,
+            PassengerID int DEFAULT NULL,
+            BookingDate datetime DEFAULT NULL,
+            Status varchar(50) DEFAULT NULL,
+            FromStop int DEFAULT NULL,
+            ToStop int DEFAULT NULL,
+            PRIMARY KEY (BookingID),
+            KEY TripID (TripID),
+            KEY PassengerID (PassengerID),
+            CONSTRAINT bookings_ibfk_1 FOREIGN KEY (TripID) REFERENCES trips (TripID),
+            CONSTRAINT bookings_ibfk_2 FOREIGN KEY (PassengerID) REFERENCES passengers (PassengerID)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS trip_legs (
+            TripID int NOT NULL,
+            LegIndex int NOT NULL,
+            FromStop varchar(255) NOT NULL,
+            ToStop varchar(255) NOT NULL,
+            DepartureDate datetime NOT NULL,
+            ArrivalDate datetime NOT NULL,
+            SeatsBooked int NOT NULL DEFAULT 0,
+            PRIMARY KEY (TripID, LegIndex),
+            CONSTRAINT trip_legs_ibfk_1 FOREIGN KEY (TripID) REFERENCES trips (TripID)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS trip_templates (
+            TemplateID int NOT NULL AUTO_INCREMENT,
+            VehicleID int DEFAULT NULL,
+            RouteID int DEFAULT NULL,
+            DepartureTime varchar(8) NOT NULL,
+            DurationMinutes int NOT NULL,
+            Recurrence varchar(50) NOT NULL,
+            StartDate datetime NOT NULL,
+            EndDate datetime DEFAULT NULL,
+            HorizonDays int NOT NULL DEFAULT 14,
+            ExpandedUntil datetime DEFAULT NULL,
+            Status varchar(20) DEFAULT 'Active',
+            PRIMARY KEY (TemplateID),
+            CONSTRAINT trip_templates_ibfk_1 FOREIGN KEY (VehicleID) REFERENCES vehicles (VehicleID),
+            CONSTRAINT trip_templates_ibfk_2 FOREIGN KEY (RouteID) REFERENCES routes (RouteID)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+        """
+    ]
+
+    def __init__(self, host="localhost", user="root", password="root",
+                 database="transport_management", port=3306):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.port = port
+
+    def connect(self):
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            port=self.port,
+            buffered=True  # pooled connections must not carry unread results between borrowers
+        )
+
+    def streaming_cursor(self, connection):
+        # Pooled connections are buffered by default, which would read the whole result set
+        return connection.cursor(buffered=False)
+
+    def is_alive(self, connection) -> bool:
+        return connection.is_connected()
+
+    def create_tables(self, connection) -> None:
+        cursor = connection.cursor()
+        for query in self.TABLE_QUERIES:
+            cursor.execute(query)
+        connection.commit()
+        cursor.close()
+
+    def set_autocommit(self, connection, enabled: bool) -> None:
+        connection.autocommit = enabled
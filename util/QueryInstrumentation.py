@@ -0,0 +1,330 @@
+'''
+This file defines the QueryInstrumentation class, which records what every service
+method does to the database.
+
+attach(service) puts a thin wrapper around the service's connection pool (and the
+connections and cursors it hands out) and around the service's public methods. Each
+statement is timed and attributed to the outermost service method running on the
+calling thread, so stats() can report, per method: calls, statements, rows, database
+and wall time, and the distinct SQL statements issued with their own counts.
+
+Statements slower than slow_query_ms are appended to a slow-query log as JSON lines.
+Parameters are never written: the log keeps only how many there were and their types.
+
+query_budget(limit) is a context manager for tests and benchmarks: every service call
+made on the current thread inside the block must issue at most limit statements, or
+QueryBudgetExceededException is raised when the block ends. It catches N+1 regressions
+such as per-row loops creeping back into the status updaters.
+'''
+
+import functools
+import inspect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from exception.CustomExceptions import QueryBudgetExceededException
+
+UNATTRIBUTED = "(outside service methods)"
+
+
+def normalize_sql(sql):
+    return " ".join(str(sql).split())
+
+
+def redact(params, many=False):
+    """Describe parameters without their values: type names only (of the first row, for executemany)."""
+    if many:
+        rows = list(params or ())
+        return {"rows": len(rows), "params": redact(rows[0]) if rows else []}
+    if params is None:
+        return []
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+
+class _Call:
+    """Statements issued by one outermost service call."""
+    __slots__ = ("method", "statements", "rows", "db_time")
+
+    def __init__(self, method):
+        self.method = method
+        self.statements = 0
+        self.rows = 0
+        self.db_time = 0.0
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor, instrumentation):
+        self._cursor = cursor
+        self._instrumentation = instrumentation
+
+    def _run(self, run, args, kwargs, many=False):
+        sql = args[0] if args else kwargs.get("operation", kwargs.get("sql"))
+        params = args[1] if len(args) > 1 else kwargs.get("params", kwargs.get("parameters"))
+        started = time.perf_counter()
+        try:
+            return run(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            # Reads are counted as they are fetched; writes report their affected rows here
+            affected = self._cursor.rowcount if self._cursor.description is None else 0
+            self._instrumentation.record(sql, params, elapsed, max(affected or 0, 0), many)
+
+    def execute(self, *args, **kwargs):
+        return self._run(self._cursor.execute, args, kwargs)
+
+    def executemany(self, *args, **kwargs):
+        if len(args) > 1 and not isinstance(args[1], (list, tuple)):
+            # Materialize one-shot iterables so the slow-query log can count them too
+            args = (args[0], list(args[1])) + args[2:]
+        return self._run(self._cursor.executemany, args, kwargs, many=True)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._instrumentation.record_rows(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._instrumentation.record_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._instrumentation.record_rows(len(rows))
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._instrumentation.record_rows(1)
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    def __init__(self, conn, instrumentation):
+        self._conn = conn
+        self._instrumentation = instrumentation
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._instrumentation)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class InstrumentedPool:
+    """Hands out instrumented connections from the wrapped ConnectionPool."""
+
+    def __init__(self, pool, instrumentation):
+        self._pool = pool
+        self._instrumentation = instrumentation
+
+    @contextmanager
+    def connection(self, timeout=None):
+        with self._pool.connection(timeout) as conn:
+            yield InstrumentedConnection(conn, self._instrumentation)
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+
+class QueryInstrumentation:
+    def __init__(self, slow_query_ms=None, slow_query_log="slow_queries.log"):
+        """
+        slow_query_ms: statements taking at least this long are logged; None disables the log.
+        slow_query_log: file the slow statements are appended to.
+        """
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_log = slow_query_log
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._methods = {}
+        self.slow_queries = 0
+
+    # ---- wiring -----------------------------------------------------------
+
+    def attach(self, service):
+        """Instrument service.pool and every public method of the service instance."""
+        service.pool = InstrumentedPool(service.pool, self)
+        for name, function in inspect.getmembers(type(service), inspect.isfunction):
+            if not name.startswith("_"):
+                setattr(service, name, self.wrap(name, getattr(service, name)))
+        return service
+
+    def wrap(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if getattr(self._local, "call", None) is not None:
+                return method(*args, **kwargs)
+            call = self._local.call = _Call(name)
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                self._local.call = None
+                self._finish(call, time.perf_counter() - started)
+                raise
+            self._local.call = None
+            if inspect.isgenerator(result):
+                # Streaming listings run their statements while the caller iterates
+                return self._iterate(call, started, result)
+            self._finish(call, time.perf_counter() - started)
+            return result
+        return wrapper
+
+    def _iterate(self, call, started, generator):
+        try:
+            while True:
+                outer = getattr(self._local, "call", None)
+                self._local.call = call if outer is None else outer
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    self._local.call = outer
+                yield item
+        finally:
+            generator.close()
+            self._finish(call, time.perf_counter() - started)
+
+    @contextmanager
+    def operation(self, name):
+        """Attribute statements run inside the block to name, unless an outer operation is running."""
+        if getattr(self._local, "call", None) is not None:
+            yield
+            return
+        call = self._local.call = _Call(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.call = None
+            self._finish(call, time.perf_counter() - started)
+
+    # ---- recording --------------------------------------------------------
+
+    def _stats_for(self, method):
+        stats = self._methods.get(method)
+        if stats is None:
+            stats = self._methods[method] = {"calls": 0, "statements": 0, "rows": 0, "db_time_ms": 0.0,
+                                             "wall_time_ms": 0.0, "max_statements_per_call": 0, "queries": {}}
+        return stats
+
+    def record(self, sql, params, elapsed, rows=0, many=False):
+        call = getattr(self._local, "call", None)
+        method = call.method if call is not None else UNATTRIBUTED
+        text = normalize_sql(sql)
+        if call is not None:
+            call.statements += 1
+            call.rows += rows
+            call.db_time += elapsed
+        self._local.last_query = (method, text)
+        with self._lock:
+            stats = self._stats_for(method)
+            if call is None:
+                stats["statements"] += 1
+                stats["rows"] += rows
+                stats["db_time_ms"] += elapsed * 1000
+            query = stats["queries"].setdefault(text, {"count": 0, "rows": 0, "time_ms": 0.0})
+            query["count"] += 1
+            query["rows"] += rows
+            query["time_ms"] += elapsed * 1000
+        self._record_budget()
+        if self.slow_query_ms is not None and elapsed * 1000 >= self.slow_query_ms:
+            self._log_slow(method, text, redact(params, many), elapsed)
+
+    def record_rows(self, count):
+        if not count:
+            return
+        call = getattr(self._local, "call", None)
+        if call is not None:
+            call.rows += count
+        last = getattr(self._local, "last_query", None)
+        with self._lock:
+            if call is None:
+                self._stats_for(UNATTRIBUTED)["rows"] += count
+            if last is not None:
+                query = self._methods.get(last[0], {}).get("queries", {}).get(last[1])
+                if query is not None:
+                    query["rows"] += count
+
+    def _finish(self, call, wall_time):
+        with self._lock:
+            stats = self._stats_for(call.method)
+            stats["calls"] += 1
+            stats["statements"] += call.statements
+            stats["rows"] += call.rows
+            stats["db_time_ms"] += call.db_time * 1000
+            stats["wall_time_ms"] += wall_time * 1000
+            stats["max_statements_per_call"] = max(stats["max_statements_per_call"], call.statements)
+        budget = getattr(self._local, "budget", None)
+        if budget is not None and call.statements > budget["limit"]:
+            budget["violations"].append((call.method, call.statements))
+
+    def _log_slow(self, method, sql, params, elapsed):
+        entry = {"time": datetime.now().isoformat(" ", "seconds"), "method": method,
+                 "elapsed_ms": round(elapsed * 1000, 3), "sql": sql, "params": params}
+        with self._log_lock:
+            self.slow_queries += 1
+            try:
+                with open(self.slow_query_log, "a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"[Instrumentation] Could not write the slow-query log: {e}")
+
+    # ---- query budgets ----------------------------------------------------
+
+    def _record_budget(self):
+        budget = getattr(self._local, "budget", None)
+        if budget is not None and getattr(self._local, "call", None) is None:
+            # A statement outside any service method is a call of its own
+            budget["loose"] += 1
+            if budget["loose"] > budget["limit"]:
+                budget["violations"].append((UNATTRIBUTED, budget["loose"]))
+
+    @contextmanager
+    def query_budget(self, limit):
+        """Raise QueryBudgetExceededException if a service call in the block issues more than limit statements."""
+        outer = getattr(self._local, "budget", None)
+        budget = self._local.budget = {"limit": limit, "violations": [], "loose": 0}
+        try:
+            yield budget
+        finally:
+            self._local.budget = outer
+        if budget["violations"]:
+            worst = {}
+            for method, statements in budget["violations"]:
+                worst[method] = max(worst.get(method, 0), statements)
+            details = ", ".join(f"{method} issued {statements}" for method, statements in worst.items())
+            raise QueryBudgetExceededException(f"Query budget of {limit} statements per call exceeded: {details}.")
+
+    # ---- reporting --------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Per-method totals; each also has statements_per_call and its distinct queries."""
+        with self._lock:
+            report = {}
+            for method, stats in self._methods.items():
+                entry = {key: (round(value, 3) if isinstance(value, float) else value)
+                         for key, value in stats.items() if key != "queries"}
+                entry["statements_per_call"] = round(stats["statements"] / stats["calls"], 2) if stats["calls"] else None
+                entry["queries"] = {sql: {"count": query["count"], "rows": query["rows"],
+                                          "time_ms": round(query["time_ms"], 3)}
+                                    for sql, query in stats["queries"].items()}
+                report[method] = entry
+            return report
+
+    def reset(self):
+        with self._lock:
+            self._methods = {}
+        with self._log_lock:
+            self.slow_queries = 0
@@ -0,0 +1,55 @@
+'''
+This file defines the RowMapper class, which turns cursor rows into entity objects by
+column name instead of by position, so a query may select columns in any order (or
+leave some out) without silently filling the wrong attributes.
+
+Each entity lists its database columns in constructor order in COLUMNS. For a given
+entity and cursor.description the mapper works out once which row position feeds each
+constructor argument and caches that plan; mapping a row is then a single itemgetter
+call, or a direct cls(*row) when the query already selects the columns in order.
+'''
+
+import threading
+from operator import itemgetter
+
+
+class RowMapper:
+    _plans = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def plan(entity_cls, description):
+        """Return a callable row -> entity for rows described by cursor.description."""
+        names = tuple(column[0].lower() for column in description)
+        key = (entity_cls, names)
+        factory = RowMapper._plans.get(key)
+        if factory is not None:
+            return factory
+
+        positions = {name: index for index, name in enumerate(names)}
+        # Constructor arguments without a selected column are passed as None
+        indices = [positions.get(column.lower()) for column in entity_cls.COLUMNS]
+
+        if indices == list(range(len(names))):
+            factory = lambda row: entity_cls(*row)
+        elif None not in indices and len(indices) > 1:
+            getter = itemgetter(*indices)
+            factory = lambda row: entity_cls(*getter(row))
+        else:
+            factory = lambda row: entity_cls(*[None if index is None else row[index] for index in indices])
+
+        with RowMapper._lock:
+            RowMapper._plans[key] = factory
+        return factory
+
+    @staticmethod
+    def map_rows(cursor, entity_cls, rows):
+        """Map rows fetched from cursor (fetchall/fetchmany) to a list of entity_cls."""
+        factory = RowMapper.plan(entity_cls, cursor.description)
+        return [factory(row) for row in rows]
+
+    @staticmethod
+    def map_one(cursor, entity_cls, row):
+        if row is None:
+            return None
+        return RowMapper.plan(entity_cls, cursor.description)(row)
@@ -0,0 +1,117 @@
+'''
+This file defines the SQLiteBackend class, an embedded storage backend that runs the
+service without a database server. It supports file-backed databases and private
+in-memory databases that are shared by every connection of the same backend.
+
+The service layer writes MySQL-style "%s" placeholders and expects DATETIME columns
+to come back as datetime objects; the connection and cursor classes below take care
+of both so the same SQL runs unchanged on either engine.
+'''
+
+import os
+import sqlite3
+import uuid
+import weakref
+from datetime import date, datetime
+from functools import lru_cache
+from .DBBackend import DBBackend
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "db_schema_sqlite.sql")
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+
+
+@lru_cache(maxsize=1024)
+def _to_qmark(sql):
+    return sql.replace("%s", "?")
+
+
+class SQLiteCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        return super().execute(_to_qmark(sql), parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return super().executemany(_to_qmark(sql), seq_of_parameters)
+
+
+class SQLiteConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cursors = weakref.WeakSet()
+
+    def cursor(self, factory=SQLiteCursor):
+        cursor = super().cursor(factory)
+        self._cursors.add(cursor)
+        return cursor
+
+    def close_cursors(self):
+        """
+        Close the cursors handed out so far. Called by the pool before the connection goes
+        to another thread: a cursor garbage-collected later would reset a cached statement
+        the next borrower may be stepping (sqlite3 shares statements per connection).
+        """
+        for cursor in list(self._cursors):
+            cursor.close()
+        self._cursors.clear()
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class SQLiteBackend(DBBackend):
+    name = "sqlite"
+    error_types = (sqlite3.Error,)
+
+    def __init__(self, database=":memory:", name=None, timeout=30.0):
+        self.database = database
+        self.timeout = timeout
+        self.in_memory = database == ":memory:"
+        self._keeper = None
+
+        if self.in_memory:
+            # The memdb VFS shares one in-memory database between all connections that
+            # open the same name, which is what lets a pool of connections see one database.
+            self._target = f"file:/{name or 'tm-' + uuid.uuid4().hex}?vfs=memdb"
+            # An in-memory database disappears with its last connection; keep one open.
+            self._keeper = self.connect()
+        else:
+            self._target = database
+
+    def connect(self):
+        connection = sqlite3.connect(
+            self._target,
+            uri=self.in_memory,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,  # pooled connections move between threads, one at a time
+            factory=SQLiteConnection
+        )
+        connection.execute("PRAGMA foreign_keys = ON")
+        if not self.in_memory:
+            connection.execute("PRAGMA journal_mode = WAL")
+        return connection
+
+    def is_alive(self, connection) -> bool:
+        try:
+            connection.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def create_tables(self, connection) -> None:
+        with open(SCHEMA_FILE, encoding="utf-8") as schema:
+            connection.executescript(schema.read())
+        connection.commit()
+
+    def set_autocommit(self, connection, enabled: bool) -> None:
+        connection.isolation_level = None if enabled else ""
+
+    def close(self) -> None:
+        if self._keeper is not None:
+            self._keeper.close()
+            self._keeper = None
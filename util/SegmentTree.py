@@ -0,0 +1,134 @@
+'''
+This file defines the SegmentTree and LegInventory classes used for the seat inventory
+of multi-stop trips.
+
+A multi-stop trip with n legs keeps one booked-seat count per leg. A booking from stop i
+to stop j occupies legs i..j-1, so "is a seat free from i to j" is "is the largest count
+over legs i..j-1 below capacity" and booking it adds one to every leg in that range. The
+segment tree answers both (range max, range add with lazy propagation) in O(log n).
+
+LegInventory holds one tree per trip, loads each lazily from the trip_legs table and is
+kept current by the service's booking methods, like ScheduleIndex does for trip
+schedules. Only trips that have legs are cached: a trip seen without legs is looked up
+again on every booking, so stops added later by another process are never missed. Trees
+are reloaded after ttl seconds, to pick up bookings made by other processes, and the
+least recently used are dropped beyond max_trips.
+'''
+
+import threading
+import time
+from collections import OrderedDict
+
+MAX_CACHED_TRIPS = 4096
+LEG_CACHE_TTL = 60.0
+
+
+class SegmentTree:
+    def __init__(self, values):
+        self.size = len(values)
+        self._max = [0] * (4 * max(self.size, 1))
+        self._pending = [0] * (4 * max(self.size, 1))
+        if self.size:
+            self._build(1, 0, self.size, values)
+
+    def __len__(self):
+        return self.size
+
+    def _build(self, node, low, high, values):
+        if high - low == 1:
+            self._max[node] = values[low]
+            return
+        middle = (low + high) // 2
+        self._build(2 * node, low, middle, values)
+        self._build(2 * node + 1, middle, high, values)
+        self._max[node] = max(self._max[2 * node], self._max[2 * node + 1])
+
+    def _add(self, node, low, high, start, end, delta):
+        if end <= low or high <= start:
+            return
+        if start <= low and high <= end:
+            self._max[node] += delta
+            self._pending[node] += delta
+            return
+        middle = (low + high) // 2
+        self._add(2 * node, low, middle, start, end, delta)
+        self._add(2 * node + 1, middle, high, start, end, delta)
+        self._max[node] = max(self._max[2 * node], self._max[2 * node + 1]) + self._pending[node]
+
+    def _query(self, node, low, high, start, end):
+        if end <= low or high <= start:
+            return None
+        if start <= low and high <= end:
+            return self._max[node]
+        middle = (low + high) // 2
+        left = self._query(2 * node, low, middle, start, end)
+        right = self._query(2 * node + 1, middle, high, start, end)
+        best = left if right is None else right if left is None else max(left, right)
+        return best + self._pending[node]
+
+    def range_add(self, start, end, delta):
+        """Add delta to every value in [start, end)."""
+        if 0 <= start < end <= self.size:
+            self._add(1, 0, self.size, start, end, delta)
+
+    def range_max(self, start=0, end=None):
+        """Largest value in [start, end); end defaults to the last position."""
+        end = self.size if end is None else end
+        if not 0 <= start < end <= self.size:
+            raise ValueError(f"Invalid range [{start}, {end}) for {self.size} values.")
+        return self._query(1, 0, self.size, start, end)
+
+
+class LegInventory:
+    def __init__(self, loader, max_trips=MAX_CACHED_TRIPS, ttl=LEG_CACHE_TTL):
+        """
+        loader(trip_id, cursor) returns the booked-seat count of each leg in order, or an
+        empty list for a trip without legs.
+        """
+        self._loader = loader
+        self.max_trips = max_trips
+        self.ttl = ttl
+        self._trees = OrderedDict()  # trip_id -> (SegmentTree, loaded_at), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, trip_id, cursor=None):
+        """The trip's SegmentTree, or None if the trip has no legs (read from the database each time)."""
+        with self._lock:
+            entry = self._trees.get(trip_id)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                self._trees.move_to_end(trip_id)
+                return entry[0]
+        loads = self._loader(trip_id, cursor)
+        with self._lock:
+            if not loads:
+                self._trees.pop(trip_id, None)
+                return None
+            tree = SegmentTree(loads)
+            self._trees[trip_id] = (tree, time.monotonic())
+            self._trees.move_to_end(trip_id)
+            while len(self._trees) > self.max_trips:
+                self._trees.popitem(last=False)
+            return tree
+
+    def range_max(self, trip_id, start=0, end=None):
+        """
+        Most seats booked on any leg in [start, end), or None if the trip is not loaded
+        (never loaded, invalidated by another thread, expired or evicted).
+        """
+        with self._lock:
+            entry = self._trees.get(trip_id)
+            return None if entry is None else entry[0].range_max(start, end)
+
+    def range_add(self, trip_id, start, end, delta):
+        """Apply a committed booking change; trips not loaded yet are left to load fresh."""
+        with self._lock:
+            entry = self._trees.get(trip_id)
+            if entry is not None:
+                entry[0].range_add(start, end, delta)
+
+    def invalidate(self, trip_id=None):
+        with self._lock:
+            if trip_id is None:
+                self._trees.clear()
+            else:
+                self._trees.pop(trip_id, None)
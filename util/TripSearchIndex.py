@@ -0,0 +1,115 @@
+'''
+This file defines the DestinationTrie and TripSearchIndex classes behind the service's
+find_trips() and autocomplete_destinations().
+
+Destination names are normalized (trimmed, lower-case) and kept in a hash map from
+(start, end) to the routes that connect them, plus a trie for prefix autocomplete.
+Each route holds its upcoming trips sorted by departure, so a search is a dictionary
+lookup, one bisect per matching route and a walk over the trips in the window. Seat
+counts are kept per trip and adjusted in place as bookings are made or cancelled, so
+the index does not have to be rebuilt for every booking.
+'''
+
+import heapq
+from bisect import bisect_left, bisect_right
+
+
+def normalize(name):
+    return " ".join(str(name or "").split()).lower()
+
+
+def _window(departures, trip_ids, low, high):
+    for position in range(low, high):
+        yield departures[position], trip_ids[position]
+
+
+class DestinationTrie:
+    def __init__(self):
+        self._root = {}
+        self._names = {}  # normalized name -> display name
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name):
+        key = normalize(name)
+        if not key or key in self._names:
+            return
+        self._names[key] = " ".join(str(name).split())
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[None] = key  # end-of-name marker
+
+    def complete(self, prefix, limit=10):
+        """Display names starting with prefix (case-insensitive), in alphabetical order."""
+        node = self._root
+        for char in normalize(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        matches, stack = [], [node]
+        # Depth-first, visiting children in reverse so names come out sorted
+        while stack and len(matches) < limit:
+            node = stack.pop()
+            if None in node:
+                matches.append(self._names[node[None]])
+            stack.extend(node[char] for char in sorted((c for c in node if c is not None), reverse=True))
+        return matches
+
+
+class TripSearchIndex:
+    def __init__(self, rows, version=None):
+        """
+        rows: (trip_id, route_id, start, end, departure, arrival, max_passengers, seats_booked)
+        for the trips that should be searchable. version is stored for the owner's staleness check.
+        """
+        self.version = version
+        self.destinations = DestinationTrie()
+        self._routes_between = {}  # (start, end) -> [route_id]
+        self._timetable = {}       # route_id -> ([departures], [trip_ids]) sorted by departure
+        self._trips = {}           # trip_id -> [route_id, start, end, departure, arrival, free_seats]
+        for trip_id, route_id, start, end, departure, arrival, capacity, booked in sorted(rows, key=lambda r: (r[4], r[0])):
+            self.destinations.add(start)
+            self.destinations.add(end)
+            pair = (normalize(start), normalize(end))
+            routes = self._routes_between.setdefault(pair, [])
+            if route_id not in routes:
+                routes.append(route_id)
+            departures, trip_ids = self._timetable.setdefault(route_id, ([], []))
+            departures.append(departure)
+            trip_ids.append(trip_id)
+            free = int(capacity or 0) - int(booked or 0)
+            self._trips[trip_id] = [route_id, start, end, departure, arrival, free]
+
+    def __len__(self):
+        return len(self._trips)
+
+    def adjust_seats(self, trip_id, booked_delta):
+        """Record booked_delta more (or, if negative, fewer) booked seats on trip_id."""
+        trip = self._trips.get(trip_id)
+        if trip is not None:
+            trip[5] -= booked_delta
+
+    def find(self, start, end, depart_from=None, depart_to=None, min_free_seats=1, limit=50):
+        """Up to limit trips from start to end departing in [depart_from, depart_to], earliest first."""
+        routes = self._routes_between.get((normalize(start), normalize(end)), ())
+        windows = []
+        for route_id in routes:
+            departures, trip_ids = self._timetable[route_id]
+            low = 0 if depart_from is None else bisect_left(departures, depart_from)
+            high = len(departures) if depart_to is None else bisect_right(departures, depart_to)
+            if low < high:
+                windows.append(_window(departures, trip_ids, low, high))
+
+        matches = []
+        # A single route needs no merge; several are merged lazily by departure
+        for _, trip_id in (windows[0] if len(windows) == 1 else heapq.merge(*windows)):
+            route_id, trip_start, trip_end, departure, arrival, free = self._trips[trip_id]
+            if free < min_free_seats:
+                continue
+            matches.append({"trip_id": trip_id, "route_id": route_id, "start": trip_start, "end": trip_end,
+                            "departure_date": departure, "arrival_date": arrival, "free_seats": free})
+            if len(matches) >= limit:
+                break
+        return matches
@@ -0,0 +1,90 @@
+-- SQLite version of db_schema_utils.sql, used by the embedded backend (util/SQLiteBackend.py)
+
+CREATE TABLE IF NOT EXISTS vehicles (
+  VehicleID INTEGER PRIMARY KEY AUTOINCREMENT,
+  Model VARCHAR(255) DEFAULT NULL,
+  Capacity DECIMAL(10,2) DEFAULT NULL,
+  Type VARCHAR(50) DEFAULT NULL,
+  Status VARCHAR(50) DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS drivers (
+  DriverID INTEGER PRIMARY KEY AUTOINCREMENT,
+  Name VARCHAR(100) DEFAULT NULL,
+  Age INT DEFAULT NULL,
+  Gender VARCHAR(10) DEFAULT NULL,
+  LicenseNumber VARCHAR(50) DEFAULT NULL,
+  ContactNumber VARCHAR(20) DEFAULT NULL,
+  Address TEXT,
+  Status VARCHAR(20) DEFAULT 'Available'
+);
+
+CREATE TABLE IF NOT EXISTS routes (
+  RouteID INTEGER PRIMARY KEY AUTOINCREMENT,
+  StartDestination VARCHAR(255) DEFAULT NULL,
+  EndDestination VARCHAR(255) DEFAULT NULL,
+  Distance DECIMAL(10,2) DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS passengers (
+  PassengerID INTEGER PRIMARY KEY AUTOINCREMENT,
+  FirstName VARCHAR(255) DEFAULT NULL,
+  Gender VARCHAR(255) DEFAULT NULL,
+  Age INT DEFAULT NULL,
+  Email VARCHAR(255) DEFAULT NULL UNIQUE,
+  PhoneNumber VARCHAR(50) DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS trips (
+  TripID INTEGER PRIMARY KEY AUTOINCREMENT,
+  VehicleID INT DEFAULT NULL REFERENCES vehicles (VehicleID),
+  RouteID INT DEFAULT NULL REFERENCES routes (RouteID),
+  DepartureDate DATETIME DEFAULT NULL,
+  ArrivalDate DATETIME DEFAULT NULL,
+  Status VARCHAR(50) DEFAULT NULL,
+  TripType VARCHAR(50) DEFAULT 'Freight',
+  MaxPassengers INT DEFAULT NULL,
+  DriverID INT DEFAULT NULL REFERENCES drivers (DriverID) ON DELETE SET NULL,
+  SeatsBooked INT NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS trips_VehicleID ON trips (VehicleID);
+CREATE INDEX IF NOT EXISTS trips_RouteID ON trips (RouteID);
+CREATE INDEX IF NOT EXISTS trips_DriverID ON trips (DriverID);
+CREATE INDEX IF NOT EXISTS trips_Driver_Schedule ON trips (DriverID, Status, DepartureDate);
+
+CREATE TABLE IF NOT EXISTS bookings (
+  BookingID INTEGER PRIMARY KEY AUTOINCREMENT,
+  TripID INT DEFAULT NULL REFERENCES trips (TripID),
+  PassengerID INT DEFAULT NULL REFERENCES passengers (PassengerID),
+  BookingDate DATETIME DEFAULT NULL,
+  Status VARCHAR(50) DEFAULT NULL,
+  FromStop INT DEFAULT NULL,
+  ToStop INT DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS bookings_TripID ON bookings (TripID);
+CREATE INDEX IF NOT EXISTS bookings_PassengerID ON bookings (PassengerID);
+
+CREATE TABLE IF NOT EXISTS trip_legs (
+  TripID INT NOT NULL REFERENCES trips (TripID),
+  LegIndex INT NOT NULL,
+  FromStop VARCHAR(255) NOT NULL,
+  ToStop VARCHAR(255) NOT NULL,
+  DepartureDate DATETIME NOT NULL,
+  ArrivalDate DATETIME NOT NULL,
+  SeatsBooked INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (TripID, LegIndex)
+);
+
+CREATE TABLE IF NOT EXISTS trip_templates (
+  TemplateID INTEGER PRIMARY KEY AUTOINCREMENT,
+  VehicleID INT DEFAULT NULL REFERENCES vehicles (VehicleID),
+  RouteID INT DEFAULT NULL REFERENCES routes (RouteID),
+  DepartureTime VARCHAR(8) NOT NULL,
+  DurationMinutes INT NOT NULL,
+  Recurrence VARCHAR(50) NOT NULL,
+  StartDate DATETIME NOT NULL,
+  EndDate DATETIME DEFAULT NULL,
+  HorizonDays INT NOT NULL DEFAULT 14,
+  ExpandedUntil DATETIME DEFAULT NULL,
+  Status VARCHAR(20) DEFAULT 'Active'
+);
@@ -6,6 +6,8 @@ CREATE TABLE `bookings` (
   `PassengerID` int DEFAULT NULL,
   `BookingDate` datetime DEFAULT NULL,
   `Status` varchar(50) DEFAULT NULL,
+  `FromStop` int DEFAULT NULL,
+  `ToStop` int DEFAULT NULL,
   PRIMARY KEY (`BookingID`),
   KEY `TripID` (`TripID`),
   KEY `PassengerID` (`PassengerID`),
@@ -54,10 +56,12 @@ CREATE TABLE `trips` (
   `TripType` varchar(50) DEFAULT 'Freight',
   `MaxPassengers` int DEFAULT NULL,
   `DriverID` int DEFAULT NULL,
+  `SeatsBooked` int NOT NULL DEFAULT 0,
   PRIMARY KEY (`TripID`),
   KEY `VehicleID` (`VehicleID`),
   KEY `RouteID` (`RouteID`),
   KEY `FK_Trips_Driver` (`DriverID`),
+  KEY `Driver_Schedule` (`DriverID`,`Status`,`DepartureDate`),
   CONSTRAINT `FK_Trips_Driver` FOREIGN KEY (`DriverID`) REFERENCES `drivers` (`DriverID`) ON DELETE SET NULL,
   CONSTRAINT `trips_ibfk_1` FOREIGN KEY (`VehicleID`) REFERENCES `vehicles` (`VehicleID`),
   CONSTRAINT `trips_ibfk_2` FOREIGN KEY (`RouteID`) REFERENCES `routes` (`RouteID`)
@@ -71,3 +75,43 @@ CREATE TABLE `vehicles` (
   `Status` varchar(50) DEFAULT NULL,
   PRIMARY KEY (`VehicleID`)
 ) ENGINE=InnoDB AUTO_INCREMENT=7 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE `trip_legs` (
+  `TripID` int NOT NULL,
+  `LegIndex` int NOT NULL,
+  `FromStop` varchar(255) NOT NULL,
+  `ToStop` varchar(255) NOT NULL,
+  `DepartureDate` datetime NOT NULL,
+  `ArrivalDate` datetime NOT NULL,
+  `SeatsBooked` int NOT NULL DEFAULT 0,
+  PRIMARY KEY (`TripID`,`LegIndex`),
+  CONSTRAINT `trip_legs_ibfk_1` FOREIGN KEY (`TripID`) REFERENCES `trips` (`TripID`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE `trip_templates` (
+  `TemplateID` int NOT NULL AUTO_INCREMENT,
+  `VehicleID` int DEFAULT NULL,
+  `RouteID` int DEFAULT NULL,
+  `DepartureTime` varchar(8) NOT NULL,
+  `DurationMinutes` int NOT NULL,
+  `Recurrence` varchar(50) NOT NULL,
+  `StartDate` datetime NOT NULL,
+  `EndDate` datetime DEFAULT NULL,
+  `HorizonDays` int NOT NULL DEFAULT 14,
+  `ExpandedUntil` datetime DEFAULT NULL,
+  `Status` varchar(20) DEFAULT 'Active',
+  PRIMARY KEY (`TemplateID`),
+  CONSTRAINT `trip_templates_ibfk_1` FOREIGN KEY (`VehicleID`) REFERENCES `vehicles` (`VehicleID`),
+  CONSTRAINT `trip_templates_ibfk_2` FOREIGN KEY (`RouteID`) REFERENCES `routes` (`RouteID`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- Upgrading an existing database to the per-trip seat inventory:
+-- ALTER TABLE `trips` ADD COLUMN `SeatsBooked` int NOT NULL DEFAULT 0 AFTER `DriverID`;
+-- then call TransportManagementServiceImpl.rebuild_seat_inventory() once to backfill it.
+
+-- Index used by get_drivers_available_for():
+-- ALTER TABLE `trips` ADD KEY `Driver_Schedule` (`DriverID`,`Status`,`DepartureDate`);
+
+-- Upgrading an existing database to multi-stop trips (trip_legs above):
+-- ALTER TABLE `bookings` ADD COLUMN `FromStop` int DEFAULT NULL AFTER `Status`,
+--                        ADD COLUMN `ToStop` int DEFAULT NULL AFTER `FromStop`;